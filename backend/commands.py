@@ -0,0 +1,167 @@
+import click
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def register_commands(app):
+    @app.cli.command('check-query-plans')
+    def check_query_plans_command():
+        """Fail when a dashboard/report hot query stops using an index."""
+        from services.query_plans import check_query_plans
+
+        results = check_query_plans()
+        failed = [name for name, (ok, _) in results.items() if not ok]
+        for name, (ok, plan) in results.items():
+            click.echo(f"{'OK  ' if ok else 'SCAN'} {name}")
+            if not ok:
+                for line in plan:
+                    click.echo(f"       {line}")
+        if failed:
+            raise click.ClickException(f"{len(failed)} hot queries fall back to a table scan")
+
+    @app.cli.command('bench-json')
+    @click.option('--sizes', default='1000,10000,100000', help='Comma-separated row counts.')
+    @click.option('--repeat', default=3, help='Runs per measurement; the best is reported.')
+    def bench_json_command(sizes, repeat):
+        """Time JSON encoding of transaction payloads with each available encoder."""
+        from services.json_provider import benchmark_encoding
+
+        sizes = [int(size) for size in sizes.split(',')]
+        for size, timings in benchmark_encoding(sizes, repeat).items():
+            baseline = timings['to_dict + json']
+            for name, seconds in timings.items():
+                click.echo(f"{size:>7} rows  {name:<20} {seconds * 1000:9.1f} ms  {baseline / seconds:5.1f}x")
+
+    @app.cli.command('bench-analytics')
+    @click.option('--months', default='12,120,1200', help='Comma-separated series lengths in months.')
+    @click.option('--categories', default=20, help='Expense categories per month.')
+    def bench_analytics_command(months, categories):
+        """Time the vectorized report metrics against the previous per-row loops."""
+        from services.analytics import benchmark_reports
+
+        counts = [int(count) for count in months.split(',')]
+        for count, timings in benchmark_reports(counts, categories).items():
+            for name, seconds in timings.items():
+                click.echo(f"{count:>6} months  {name:<10} {seconds * 1000:9.2f} ms  {timings['loops'] / seconds:6.1f}x")
+
+    @app.cli.command('bench-export')
+    @click.option('--sizes', default='10000,100000', help='Comma-separated row counts.')
+    @click.option('--formats', default='csv,xlsx,parquet', help='Comma-separated export formats.')
+    def bench_export_command(sizes, formats):
+        """Time each export writer on synthetic transaction rows."""
+        from services.exporters import benchmark_exports
+
+        sizes = [int(size) for size in sizes.split(',')]
+        formats = formats.split(',')
+        with app.test_request_context():
+            results = benchmark_exports(sizes, formats)
+        for size, timings in results.items():
+            for fmt in formats:
+                if fmt not in timings:
+                    click.echo(f"{size:>7} rows  {fmt:<8} unavailable (missing optional package)")
+                    continue
+                seconds, written = timings[fmt]
+                click.echo(f"{size:>7} rows  {fmt:<8} {seconds * 1000:9.1f} ms  {size / seconds:10.0f} rows/s  {written / 1024:9.0f} KiB")
+
+    @app.cli.command('bench-dashboard')
+    @click.option('--user-id', type=int, required=True, help='User whose data the dashboard is built from.')
+    @click.option('--timeframes', default='all,month,year', help='Comma-separated dashboard timeframes.')
+    @click.option('--repeat', default=5, help='Runs per measurement; the best is reported.')
+    def bench_dashboard_command(user_id, timeframes, repeat):
+        """Time the dashboard payload and count its queries (read-only)."""
+        from routes.dashboard import benchmark_dashboard
+
+        for timeframe, (seconds, queries) in benchmark_dashboard(user_id, timeframes.split(','), repeat).items():
+            click.echo(f"{timeframe:<8} {seconds * 1000:9.2f} ms  {queries} queries")
+
+    @app.cli.group('rollups')
+    def rollups_group():
+        """Maintain the monthly_rollup aggregate table."""
+
+    @rollups_group.command('rebuild')
+    @click.option('--user-id', type=int, default=None, help='Only rebuild this user.')
+    def rebuild_rollups_command(user_id):
+        """Recompute monthly rollups from the transaction ledger."""
+        from services.rollups import rebuild_rollups
+
+        rows = rebuild_rollups(user_id)
+        click.echo(f"Rebuilt {rows} rollup rows")
+
+    @rollups_group.command('verify')
+    @click.option('--user-id', type=int, default=None, help='Only verify this user.')
+    def verify_rollups_command(user_id):
+        """Compare monthly rollups with the ledger and report drift."""
+        from services.rollups import verify_rollups
+
+        mismatches = verify_rollups(user_id)
+        for mismatch in mismatches:
+            click.echo(f"{mismatch['key']}: expected {mismatch['expected']}, found {mismatch['actual']}")
+        if mismatches:
+            raise click.ClickException(f"{len(mismatches)} rollup rows differ from the ledger; run 'flask rollups rebuild'")
+        click.echo("Monthly rollups match the ledger")
+
+    @app.cli.group('retention')
+    def retention_group():
+        """Purge expired notifications and verification codes."""
+
+    @retention_group.command('status')
+    def retention_status_command():
+        """Show how many rows each retention policy would delete."""
+        from services.retention import default_policies, eligible_rows
+
+        for policy in default_policies():
+            click.echo(f"{policy.name}: {eligible_rows(policy)} rows older than {policy.max_age.days} days")
+
+    @retention_group.command('run')
+    @click.option('--policy', 'names', multiple=True, help='Only apply these policies.')
+    @click.option('--max-batches', type=int, default=None, help='Stop each policy after this many batches.')
+    def retention_run_command(names, max_batches):
+        """Delete expired rows in batches, reporting progress."""
+        from services.retention import default_policies, run_retention
+
+        policies = [policy for policy in default_policies() if not names or policy.name in names]
+        if max_batches is not None:
+            policies = [policy._replace(max_batches=max_batches) for policy in policies]
+
+        def progress(policy, batches, deleted):
+            click.echo(f"{policy.name}: batch {batches}, {deleted} rows deleted")
+
+        for name, rows in run_retention(policies, progress=progress).items():
+            click.echo(f"{name}: {rows} rows reclaimed")
+
+    @app.cli.group('scheduler')
+    def scheduler_group():
+        """Inspect and run scheduled jobs."""
+
+    @scheduler_group.command('status')
+    def scheduler_status_command():
+        """Show the scheduler leader and each job's last run."""
+        from services.jobs import job_states
+
+        for state in job_states():
+            last_run = f"last run {state['last_run_at']:%Y-%m-%d %H:%M:%S} ({state['last_duration']}s)" if state['last_run_at'] else "never run"
+            lease = f", held by {state['owner']} until {state['lease_expires_at']:%H:%M:%S}" if state['owner'] else ""
+            click.echo(f"{state['name']}: {last_run}{lease}")
+
+    @scheduler_group.command('run')
+    @click.argument('name')
+    def scheduler_run_command(name):
+        """Run one job now, under its lease, and publish the run."""
+        import scheduler
+
+        if name not in {task for task, _ in scheduler.JOBS.values()}:
+            raise click.ClickException(f"Unknown job {name}")
+        scheduler.run_job(name, app)
+
+    @app.cli.group('budgets')
+    def budgets_group():
+        """Maintain derived budget data."""
+
+    @budgets_group.command('reconcile')
+    def reconcile_budgets_command():
+        """Recompute Budget.spent where it has drifted from the ledger."""
+        from services.budget_spend import reconcile_budget_spend
+
+        repaired = reconcile_budget_spend()
+        click.echo(f"Repaired {repaired} budgets")
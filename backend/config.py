@@ -66,14 +66,62 @@ class Config:
     JWT_REFRESH_JSON_KEY = 'refresh_token'
     JWT_ACCESS_CSRF_HEADER_NAME = 'X-CSRF-TOKEN'
     JWT_REFRESH_CSRF_HEADER_NAME = 'X-CSRF-REFRESH-TOKEN'
+    # Seconds a resolved identity is reused before the user row is read again
+    IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL', 60))
     
+    # Shared state. With REDIS_URL set, cached responses, rate-limit counters and
+    # invalidation broadcasts are shared by every worker; without it each process
+    # keeps its own in-memory copy.
+    REDIS_URL = os.environ.get('REDIS_URL')
+
     # Cache
-    CACHE_TYPE = 'simple'
+    CACHE_TYPE = 'RedisCache' if REDIS_URL else 'SimpleCache'
+    CACHE_REDIS_URL = REDIS_URL
+    CACHE_KEY_PREFIX = 'expense-tracker:'
     CACHE_DEFAULT_TIMEOUT = 300
+    # Per-user data versions key cached responses and ETags, and a write bumps
+    # the version only in the cache it can reach. Without REDIS_URL that is the
+    # handling worker's own SimpleCache, so other workers would serve stale
+    # bodies and 304s for good; versions then expire after CACHE_VERSION_TTL
+    # seconds, which bounds that staleness (0 = never, only safe with a shared
+    # cache or a single worker). Run several workers with REDIS_URL set.
+    CACHE_VERSION_TTL = int(os.environ.get('CACHE_VERSION_TTL', 0 if REDIS_URL else 30))
+    # Seconds a worker reuses a version read from the shared cache; only useful
+    # when that cache is remote
+    CACHE_VERSION_LOCAL_TTL = int(os.environ.get('CACHE_VERSION_LOCAL_TTL', 30 if REDIS_URL else 0))
+    INVALIDATION_BUS_URL = REDIS_URL
     
     # Rate Limiting
     RATELIMIT_DEFAULT = "1000000 per day;100000 per hour;1000 per second"
-    RATELIMIT_STORAGE_URL = "memory://"
+    RATELIMIT_STORAGE_URI = REDIS_URL or "memory://"
+    
+    # Retention: old rows are deleted in batches of RETENTION_BATCH_SIZE with a
+    # pause between batches so OLTP writes never queue behind a long DELETE
+    NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', 30))
+    EMAIL_VERIFICATION_RETENTION_DAYS = int(os.environ.get('EMAIL_VERIFICATION_RETENTION_DAYS', 1))
+    RETENTION_BATCH_SIZE = int(os.environ.get('RETENTION_BATCH_SIZE', 1000))
+    RETENTION_PAUSE_SECONDS = float(os.environ.get('RETENTION_PAUSE_SECONDS', 0.1))
+    
+    # Scheduler: every worker may call init_scheduler(); a lease row elects one
+    # to run the jobs. SCHEDULER_ENABLED starts it from create_app().
+    SCHEDULER_ENABLED = os.environ.get('SCHEDULER_ENABLED', 'false').lower() == 'true'
+    SCHEDULER_LEASE_SECONDS = int(os.environ.get('SCHEDULER_LEASE_SECONDS', 60))
+    # Upper bound on one job run; a crashed run blocks that job this long at most
+    SCHEDULER_JOB_LEASE_SECONDS = int(os.environ.get('SCHEDULER_JOB_LEASE_SECONDS', 6 * 3600))
+    # Runs missed by more than this (no leader up) are skipped, not replayed
+    SCHEDULER_MISFIRE_GRACE_SECONDS = int(os.environ.get('SCHEDULER_MISFIRE_GRACE_SECONDS', 3600))
+    
+    # Background tasks (services/task_queue.py): 'local' runs them on an
+    # in-process thread pool, 'celery' sends them to Celery workers
+    TASK_QUEUE_BACKEND = os.environ.get('TASK_QUEUE_BACKEND', 'local')
+    TASK_QUEUE_BROKER_URL = os.environ.get('TASK_QUEUE_BROKER_URL') or REDIS_URL
+    TASK_QUEUE_WORKERS = int(os.environ.get('TASK_QUEUE_WORKERS', 4))
+    
+    # Accounts allowed to read operational endpoints (/api/cache/stats,
+    # /api/scheduler/jobs); comma-separated emails, none by default
+    ADMIN_EMAILS = {
+        email.strip().lower() for email in os.environ.get('ADMIN_EMAILS', '').split(',') if email.strip()
+    }
     
     # CORS settings
     CORS_HEADERS = 'Content-Type'
@@ -96,6 +144,11 @@ class Config:
     UPLOAD_FOLDER = 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
 
+    # Bulk transaction import
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 1000))
+    IMPORT_MAX_BATCH_SIZE = 10000
+    IMPORT_MAX_REPORTED_ERRORS = 500
+
     # Email
     MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
     MAIL_PORT = int(os.environ.get('MAIL_PORT', 587))
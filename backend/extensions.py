@@ -13,25 +13,23 @@ jwt = JWTManager()
 cors = CORS()
 migrate = Migrate()
 mail = Mail()
-cache = Cache(config={
-    'CACHE_TYPE': 'simple',
-    'CACHE_DEFAULT_TIMEOUT': 300  # 5 minutes
-})
-limiter = Limiter(
-    key_func=get_remote_address,
-    default_limits=["200 per day", "50 per hour"]
-)
+# Backends (CACHE_TYPE, RATELIMIT_STORAGE_URI, ...) come from Config so every
+# worker can point at the same shared store.
+cache = Cache()
+limiter = Limiter(key_func=get_remote_address)
 
 def configure_jwt(app):
     @jwt.user_identity_loader
     def user_identity_lookup(user):
-        return str(user.id) if user else None
+        # Tokens are issued with either a User or a bare user id.
+        if user is None:
+            return None
+        return str(getattr(user, 'id', user))
 
     @jwt.user_lookup_loader
     def user_lookup_callback(_jwt_header, jwt_data):
-        from models.user import User
-        identity = jwt_data["sub"]
-        return User.query.filter_by(id=identity).one_or_none()
+        from services.identity import load_user
+        return load_user(jwt_data["sub"])
 
     @jwt.invalid_token_loader
     def invalid_token_callback(error_string):
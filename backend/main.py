@@ -1,17 +1,23 @@
 from flask import Flask
 from flask_cors import CORS
-from extensions import db, jwt, cache, migrate, mail
+from extensions import db, jwt, cache, limiter, migrate, mail, configure_jwt
 from config import Config
 import logging
 from middleware.cors import handle_options_request
 from routes import register_routes
 from routes.auth import auth_bp, init_email_service
+from commands import register_commands
+from services.invalidation import init_invalidation_bus
+from services.response_cache import init_response_cache
+from services.identity import init_identity_cache
+from services.forecasting import init_forecasting
+from services.task_queue import init_task_queue
+from services.json_provider import FastJSONProvider
 # from routes.settings import settings_bp
 # from routes.transactions import transactions_bp
 # from routes.categories import categories_bp
 # from routes.budgets import budgets_bp
 # from routes.reports import reports_bp
-# from routes.export import export_bp
 # from routes.notifications import notifications_bp
 # from routes.currency import currency_bp
 # from routes.reminders import reminders_bp
@@ -29,6 +35,7 @@ logging.basicConfig(level=logging.INFO)
 def create_app():
     app = Flask(__name__, instance_relative_config=True)
     app.config.from_object(Config)
+    app.json = FastJSONProvider(app)
 
     # Ensure instance folder exists
     try:
@@ -49,9 +56,16 @@ def create_app():
          }})
     db.init_app(app)
     jwt.init_app(app)
+    configure_jwt(app)
     cache.init_app(app)
+    limiter.init_app(app)
+    init_invalidation_bus(app)
+    init_response_cache(app)
+    init_identity_cache(app)
+    init_forecasting(app)
     migrate.init_app(app, db)
     mail.init_app(app)
+    init_task_queue(app)
 
     # Initialize email service
     init_email_service(app)
@@ -66,6 +80,9 @@ def create_app():
     # Register all routes
     register_routes(app)
 
+    # Register CLI commands
+    register_commands(app)
+
     # Register blueprints
     # app.register_blueprint(auth_bp, url_prefix='/api/auth')
     # app.register_blueprint(settings_bp, url_prefix='/api/settings')
@@ -73,7 +90,6 @@ def create_app():
     # app.register_blueprint(categories_bp, url_prefix='/api/categories')
     # app.register_blueprint(budgets_bp, url_prefix='/api/budgets')
     # app.register_blueprint(reports_bp, url_prefix='/api/reports')
-    # app.register_blueprint(export_bp, url_prefix='/api/export')
     # app.register_blueprint(notifications_bp, url_prefix='/api/notifications')
     # app.register_blueprint(currency_bp, url_prefix='/api/currency')
     # app.register_blueprint(reminders_bp, url_prefix='/api/reminders')
@@ -87,6 +103,10 @@ def create_app():
     with app.app_context():
         db.create_all()
 
+    if app.config['SCHEDULER_ENABLED']:
+        from scheduler import init_scheduler
+        init_scheduler(app)
+
     # Setup logging
     if not app.debug and not app.testing:
         if not os.path.exists('logs'):
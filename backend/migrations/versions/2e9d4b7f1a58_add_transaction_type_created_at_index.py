@@ -0,0 +1,31 @@
+"""Index transaction (type, created_at) for anomaly detection
+
+Revision ID: 2e9d4b7f1a58
+Revises: 7b3e5c9a2d60
+Create Date: 2026-10-18 23:41:09.318452
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2e9d4b7f1a58'
+down_revision = '7b3e5c9a2d60'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_transaction_type_created_at'
+
+
+def upgrade():
+    # The anomaly job selects every user's expenses created since its last run
+    inspector = sa.inspect(op.get_bind())
+    if INDEX_NAME not in {index['name'] for index in inspector.get_indexes('transaction')}:
+        op.create_index(INDEX_NAME, 'transaction', ['type', 'created_at'], unique=False)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if INDEX_NAME in {index['name'] for index in inspector.get_indexes('transaction')}:
+        op.drop_index(INDEX_NAME, table_name='transaction')
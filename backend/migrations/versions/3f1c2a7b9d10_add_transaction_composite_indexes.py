@@ -0,0 +1,30 @@
+"""Add composite indexes for transaction hot paths
+
+Revision ID: 3f1c2a7b9d10
+Revises: 
+Create Date: 2026-10-18 09:12:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a7b9d10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tables are created by db.create_all() in create_app, which also creates
+    # these indexes on a fresh database, so only add the ones that are missing.
+    op.create_index('ix_transaction_user_date', 'transaction', ['user_id', 'date'], unique=False, if_not_exists=True)
+    op.create_index('ix_transaction_user_type_date', 'transaction', ['user_id', 'type', 'date'], unique=False, if_not_exists=True)
+    op.create_index('ix_transaction_user_category_type_date', 'transaction', ['user_id', 'category_id', 'type', 'date'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_transaction_user_category_type_date', table_name='transaction')
+    op.drop_index('ix_transaction_user_type_date', table_name='transaction')
+    op.drop_index('ix_transaction_user_date', table_name='transaction')
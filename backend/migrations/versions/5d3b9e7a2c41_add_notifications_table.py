@@ -0,0 +1,41 @@
+"""Add notifications table
+
+Revision ID: 5d3b9e7a2c41
+Revises: e2b5f8a61c94
+Create Date: 2026-10-18 17:05:12.448201
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d3b9e7a2c41'
+down_revision = 'e2b5f8a61c94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('notifications'):
+        op.create_table('notifications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('title', sa.String(length=100), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('is_read', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('notification_data', sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    existing = {index['name'] for index in sa.inspect(bind).get_indexes('notifications')}
+    if 'ix_notifications_type_created_at' not in existing:
+        op.create_index('ix_notifications_type_created_at', 'notifications', ['type', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_notifications_type_created_at', table_name='notifications')
+    op.drop_table('notifications')
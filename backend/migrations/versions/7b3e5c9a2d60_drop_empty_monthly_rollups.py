@@ -0,0 +1,27 @@
+"""Delete monthly_rollup rows left at zero transactions
+
+Revision ID: 7b3e5c9a2d60
+Revises: a6e2f9c4d173
+Create Date: 2026-10-18 22:14:37.402915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b3e5c9a2d60'
+down_revision = 'a6e2f9c4d173'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rollup maintenance now deletes rows whose count reaches zero; clear the
+    # ones kept until now, which block deleting their (otherwise unused) category.
+    op.execute('DELETE FROM monthly_rollup WHERE count <= 0')
+
+
+def downgrade():
+    # Empty rows carry no data, so there is nothing to restore
+    pass
@@ -0,0 +1,52 @@
+"""Add monthly_rollup table
+
+Revision ID: 8a4e6d2c1b57
+Revises: 3f1c2a7b9d10
+Create Date: 2026-10-18 11:40:03.512977
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e6d2c1b57'
+down_revision = '3f1c2a7b9d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('monthly_rollup'):
+        op.create_table('monthly_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(length=10), nullable=False),
+        sa.Column('year_month', sa.String(length=7), nullable=False),
+        sa.Column('total', sa.Float(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['category.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'category_id', 'type', 'year_month', name='uq_monthly_rollup_key')
+        )
+        op.create_index('ix_monthly_rollup_user_type_month', 'monthly_rollup', ['user_id', 'type', 'year_month'], unique=False)
+
+    # Backfill from the ledger
+    if bind.dialect.name == 'postgresql':
+        month_expr = "to_char(date, 'YYYY-MM')"
+    else:
+        month_expr = "strftime('%Y-%m', date)"
+    op.execute('DELETE FROM monthly_rollup')
+    op.execute(
+        'INSERT INTO monthly_rollup (user_id, category_id, type, year_month, total, count) '
+        f'SELECT user_id, category_id, type, {month_expr}, SUM(amount), COUNT(id) '
+        f'FROM "transaction" GROUP BY user_id, category_id, type, {month_expr}'
+    )
+
+
+def downgrade():
+    op.drop_index('ix_monthly_rollup_user_type_month', table_name='monthly_rollup')
+    op.drop_table('monthly_rollup')
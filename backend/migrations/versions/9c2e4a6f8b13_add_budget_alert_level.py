@@ -0,0 +1,28 @@
+"""Add budget.alert_level for deduplicated alerts
+
+Revision ID: 9c2e4a6f8b13
+Revises: 5d3b9e7a2c41
+Create Date: 2026-10-18 17:48:36.201774
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c2e4a6f8b13'
+down_revision = '5d3b9e7a2c41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('budget')}
+    if 'alert_level' not in columns:
+        with op.batch_alter_table('budget', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('alert_level', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('budget', schema=None) as batch_op:
+        batch_op.drop_column('alert_level')
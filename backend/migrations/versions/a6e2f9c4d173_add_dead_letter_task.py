@@ -0,0 +1,34 @@
+"""Add dead_letter_task table for background tasks that exhausted their retries
+
+Revision ID: a6e2f9c4d173
+Revises: f3a8d2b6c914
+Create Date: 2026-10-18 20:47:55.106428
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6e2f9c4d173'
+down_revision = 'f3a8d2b6c914'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table('dead_letter_task'):
+        op.create_table('dead_letter_task',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_name', sa.String(length=100), nullable=False),
+        sa.Column('args', sa.JSON(), nullable=True),
+        sa.Column('kwargs', sa.JSON(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('dead_letter_task')
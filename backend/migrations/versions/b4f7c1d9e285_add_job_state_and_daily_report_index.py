@@ -0,0 +1,35 @@
+"""Add job_state table and the (date, user_id) transaction index for batch jobs
+
+Revision ID: b4f7c1d9e285
+Revises: 9c2e4a6f8b13
+Create Date: 2026-10-18 18:31:09.517342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4f7c1d9e285'
+down_revision = '9c2e4a6f8b13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('job_state'):
+        op.create_table('job_state',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('checkpoint', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+        )
+    existing = {index['name'] for index in sa.inspect(bind).get_indexes('transaction')}
+    if 'ix_transaction_date_user' not in existing:
+        op.create_index('ix_transaction_date_user', 'transaction', ['date', 'user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_transaction_date_user', table_name='transaction')
+    op.drop_table('job_state')
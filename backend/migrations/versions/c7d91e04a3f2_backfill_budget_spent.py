@@ -0,0 +1,30 @@
+"""Backfill budget.spent from the ledger
+
+Revision ID: c7d91e04a3f2
+Revises: 8a4e6d2c1b57
+Create Date: 2026-10-18 13:05:27.640118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d91e04a3f2'
+down_revision = '8a4e6d2c1b57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # spent was never written before it became maintained on transaction writes
+    op.execute(
+        'UPDATE budget SET spent = ('
+        'SELECT COALESCE(SUM(t.amount), 0) FROM "transaction" t '
+        'WHERE t.user_id = budget.user_id AND t.category_id = budget.category_id '
+        "AND t.type = 'expense' AND t.date >= budget.start_date AND t.date <= budget.end_date)"
+    )
+
+
+def downgrade():
+    pass
@@ -0,0 +1,37 @@
+"""Index the timestamp columns retention deletes walk
+
+Revision ID: d81a6f3c5e07
+Revises: b4f7c1d9e285
+Create Date: 2026-10-18 19:12:44.870215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81a6f3c5e07'
+down_revision = 'b4f7c1d9e285'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_notifications_created_at', 'notifications', ['created_at']),
+    ('ix_email_verification_expires_at', 'email_verification', ['expires_at']),
+)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if not inspector.has_table(table):
+            continue
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, _ in INDEXES:
+        if inspector.has_table(table) and name in {index['name'] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,29 @@
+"""Extend the (user_id, date) transaction index with id for keyset pagination
+
+Revision ID: e2b5f8a61c94
+Revises: c7d91e04a3f2
+Create Date: 2026-10-18 14:22:51.093316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b5f8a61c94'
+down_revision = 'c7d91e04a3f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('transaction')}
+    if 'ix_transaction_user_date_id' not in existing:
+        op.create_index('ix_transaction_user_date_id', 'transaction', ['user_id', 'date', 'id'], unique=False)
+    if 'ix_transaction_user_date' in existing:
+        op.drop_index('ix_transaction_user_date', table_name='transaction')
+
+
+def downgrade():
+    op.create_index('ix_transaction_user_date', 'transaction', ['user_id', 'date'], unique=False)
+    op.drop_index('ix_transaction_user_date_id', table_name='transaction')
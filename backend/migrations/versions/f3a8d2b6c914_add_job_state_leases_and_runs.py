@@ -0,0 +1,37 @@
+"""Add lease and last-run columns to job_state
+
+Revision ID: f3a8d2b6c914
+Revises: d81a6f3c5e07
+Create Date: 2026-10-18 20:02:17.334906
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8d2b6c914'
+down_revision = 'd81a6f3c5e07'
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    ('owner', sa.String(length=100)),
+    ('lease_expires_at', sa.DateTime()),
+    ('last_run_at', sa.DateTime()),
+    ('last_duration', sa.Float()),
+)
+
+
+def upgrade():
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('job_state')}
+    with op.batch_alter_table('job_state', schema=None) as batch_op:
+        for name, type_ in COLUMNS:
+            if name not in existing:
+                batch_op.add_column(sa.Column(name, type_, nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('job_state', schema=None) as batch_op:
+        for name, _ in reversed(COLUMNS):
+            batch_op.drop_column(name)
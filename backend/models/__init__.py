@@ -2,6 +2,10 @@ from .user import User
 from .category import Category
 from .transaction import Transaction
 from .budget import Budget
+from .monthly_rollup import MonthlyRollup
+from .notification import Notification
+from .job_state import JobState
+from .dead_letter_task import DeadLetterTask
 
-__all__ = ['User', 'Category', 'Transaction', 'Budget']
+__all__ = ['User', 'Category', 'Transaction', 'Budget', 'MonthlyRollup', 'Notification', 'JobState', 'DeadLetterTask']
 
@@ -16,6 +16,8 @@ class Budget(db.Model):
     end_date = db.Column(db.Date, nullable=False)
     alert_threshold = db.Column(db.Float, default=0.8)  # Alert when 80% of budget is used
     alert_enabled = db.Column(db.Boolean, default=True)
+    # Highest alert already sent for the current spend (see services/budget_alerts.py)
+    alert_level = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -0,0 +1,25 @@
+from extensions import db
+from datetime import datetime
+
+class DeadLetterTask(db.Model):
+    """A background task that failed on every attempt (see services/task_queue.py)."""
+    __tablename__ = 'dead_letter_task'
+
+    id = db.Column(db.Integer, primary_key=True)
+    task_name = db.Column(db.String(100), nullable=False)
+    args = db.Column(db.JSON)
+    kwargs = db.Column(db.JSON)
+    attempts = db.Column(db.Integer, nullable=False)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'task_name': self.task_name,
+            'args': self.args,
+            'kwargs': self.kwargs,
+            'attempts': self.attempts,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
@@ -0,0 +1,26 @@
+from extensions import db
+from datetime import datetime
+
+class JobState(db.Model):
+    """Durable per-job bookkeeping for scheduled tasks (see services/jobs.py)."""
+    __tablename__ = 'job_state'
+
+    name = db.Column(db.String(100), primary_key=True)
+    # Where an interrupted run resumes from; the shape is up to each job
+    checkpoint = db.Column(db.JSON)
+    # Lease: the process currently holding this job (or the scheduler leadership)
+    owner = db.Column(db.String(100))
+    lease_expires_at = db.Column(db.DateTime)
+    # Published by every scheduled run
+    last_run_at = db.Column(db.DateTime)
+    last_duration = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'owner': self.owner,
+            'lease_expires_at': self.lease_expires_at,
+            'last_run_at': self.last_run_at,
+            'last_duration': self.last_duration
+        }
@@ -0,0 +1,32 @@
+from extensions import db
+
+class MonthlyRollup(db.Model):
+    """Per-user monthly totals for one category and transaction type.
+
+    Maintained incrementally from routes/transactions.py (see services/rollups.py)
+    so dashboard and report queries read months x categories rows instead of
+    the raw ledger.
+    """
+    __tablename__ = 'monthly_rollup'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'category_id', 'type', 'year_month', name='uq_monthly_rollup_key'),
+        db.Index('ix_monthly_rollup_user_type_month', 'user_id', 'type', 'year_month'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=False)
+    type = db.Column(db.String(10), nullable=False)  # 'income' or 'expense'
+    year_month = db.Column(db.String(7), nullable=False)  # 'YYYY-MM'
+    total = db.Column(db.Float, nullable=False, default=0.0)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'category_id': self.category_id,
+            'type': self.type,
+            'year_month': self.year_month,
+            'total': self.total,
+            'count': self.count
+        }
@@ -3,9 +3,15 @@ from datetime import datetime
 
 class Notification(db.Model):
     __tablename__ = 'notifications'
+    __table_args__ = (
+        # Scheduled jobs look up recent notifications of one type (dedupe, retention)
+        db.Index('ix_notifications_type_created_at', 'type', 'created_at'),
+        # Retention deletes walk this in batches (services/retention.py)
+        db.Index('ix_notifications_created_at', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     type = db.Column(db.String(50), nullable=False)  # budget_alert, system, etc.
     title = db.Column(db.String(100), nullable=False)
     message = db.Column(db.Text, nullable=False)
@@ -27,27 +33,37 @@ class Notification(db.Model):
             'notification_data': self.notification_data
         }
     
-    @classmethod
-    def create_budget_alert(cls, user_id, budget_data):
-        return cls(
-            user_id=user_id,
-            type='budget_alert',
-            title='Budget Alert',
-            message=f'You have used {budget_data["current_percentage"]}% of your budget for {budget_data["category_name"]}.',
-            notification_data={
+    @staticmethod
+    def budget_alert_values(user_id, budget_data):
+        """Column values for a budget alert, shared with bulk inserts."""
+        return {
+            'user_id': user_id,
+            'type': 'budget_alert',
+            'title': 'Budget Alert',
+            'message': f'You have used {budget_data["current_percentage"]}% of your budget for {budget_data["category_name"]}.',
+            'notification_data': {
                 'budget_id': budget_data['budget_id'],
                 'category_id': budget_data['category_id'],
                 'current_percentage': budget_data['current_percentage'],
                 'amount_remaining': budget_data['amount_remaining']
             }
-        )
+        }
+
+    @classmethod
+    def create_budget_alert(cls, user_id, budget_data):
+        return cls(**cls.budget_alert_values(user_id, budget_data))
     
+    @staticmethod
+    def system_notification_values(user_id, title, message, notification_data=None):
+        """Column values for a system notification, shared with bulk inserts."""
+        return {
+            'user_id': user_id,
+            'type': 'system',
+            'title': title,
+            'message': message,
+            'notification_data': notification_data
+        }
+
     @classmethod
     def create_system_notification(cls, user_id, title, message, notification_data=None):
-        return cls(
-            user_id=user_id,
-            type='system',
-            title=title,
-            message=message,
-            notification_data=notification_data
-        ) 
\ No newline at end of file
+        return cls(**cls.system_notification_values(user_id, title, message, notification_data))
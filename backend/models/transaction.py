@@ -3,6 +3,18 @@ from datetime import datetime
 
 class Transaction(db.Model):
     __tablename__ = 'transaction'
+    __table_args__ = (
+        # Composite indexes for the read hot paths (dashboard, reports, budgets).
+        # Every query is scoped to a user, then narrowed by date, type and/or category.
+        # Trailing id gives keyset pagination a total (date, id) order to seek on.
+        db.Index('ix_transaction_user_date_id', 'user_id', 'date', 'id'),
+        db.Index('ix_transaction_user_type_date', 'user_id', 'type', 'date'),
+        db.Index('ix_transaction_user_category_type_date', 'user_id', 'category_id', 'type', 'date'),
+        # Cross-user batch jobs (daily reports) scan one day for every user
+        db.Index('ix_transaction_date_user', 'date', 'user_id'),
+        # Anomaly detection picks up every user's expenses recorded since the last run
+        db.Index('ix_transaction_type_created_at', 'type', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -25,4 +37,4 @@ class Transaction(db.Model):
             'type': self.type,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }
@@ -8,6 +8,8 @@ from .reports import reports_bp
 from .dashboard import dashboard_bp
 from .settings import settings_bp
 from .notifications import notifications_bp
+from .calendar import calendar_bp
+from .export import export_bp
 from .root import bp as root_bp
 
 __all__ = [
@@ -19,6 +21,8 @@ __all__ = [
     'dashboard_bp',
     'settings_bp',
     'notifications_bp',
+    'calendar_bp',
+    'export_bp',
     'root_bp'
 ]
 
@@ -34,4 +38,6 @@ def register_routes(app):
     app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
     app.register_blueprint(settings_bp, url_prefix='/api/settings')
     app.register_blueprint(notifications_bp, url_prefix='/api/notifications')
-    app.register_blueprint(reports_bp, url_prefix='/api/reports')
\ No newline at end of file
+    app.register_blueprint(reports_bp, url_prefix='/api/reports')
+    app.register_blueprint(calendar_bp, url_prefix='/api/calendar')
+    app.register_blueprint(export_bp, url_prefix='/api/export')
\ No newline at end of file
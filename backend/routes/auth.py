@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify
 from models import User, Category
 from extensions import db, jwt
-from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_current_user
+from services.response_cache import etag_response
 import logging
 from flask import current_app
 from services.email_service import EmailService
@@ -37,13 +38,9 @@ def register():
         db.session.commit()
         logger.info(f"User created successfully with ID: {user.id}")
         
-        # Send verification email
+        # Send verification email from the task queue; SMTP latency stays off this request
         if email_service:
-            logger.info("Email service available, attempting to send verification email")
-            success = email_service.send_verification_email(user.email)
-            if not success:
-                logger.error("Failed to send verification email")
-                return jsonify({"error": "Failed to send verification email"}), 500
+            email_service.queue_verification_email(user.email)
         else:
             logger.error("Email service not initialized")
             return jsonify({"error": "Email service not configured"}), 500
@@ -105,7 +102,7 @@ def resend_verification():
             return jsonify({"error": "Email already verified"}), 400
         
         if email_service:
-            email_service.send_verification_email(email)
+            email_service.queue_verification_email(email)
             return jsonify({"message": "Verification email sent"}), 200
         else:
             return jsonify({"error": "Email service not configured"}), 500
@@ -162,10 +159,11 @@ def refresh():
 
 @auth_bp.route('/profile', methods=['GET'])
 @jwt_required()
+@etag_response
 def profile():
     current_user_id = get_jwt_identity()
     logger.info(f"Fetching profile for user ID: {current_user_id}")
-    user = User.query.get(current_user_id)
+    user = get_current_user()
     if not user:
         logger.warning(f"Profile fetch attempt for non-existent user ID: {current_user_id}")
         return jsonify({"msg": "User not found"}), 404
@@ -177,7 +175,7 @@ def profile():
 def update_profile():
     current_user_id = get_jwt_identity()
     logger.info(f"Updating profile for user ID: {current_user_id}")
-    user = User.query.get(current_user_id)
+    user = get_current_user()
 
     if not user:
         logger.warning(f"Profile update attempt for non-existent user ID: {current_user_id}")
@@ -1,9 +1,13 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import Budget, Category, Transaction # Models only
+from services.response_cache import etag_response
+from services.serializers import serialize_budget
+from models import Budget, Category # Models only
 from extensions import db # Extensions here
 from datetime import datetime
-from sqlalchemy import func, extract
+from services.budget_spend import spend_for_window
+from services.read_models import BudgetRow, budget_select, fetch, fetch_one
+from services.forecasting import forecast_budgets
 import logging
 
 logger = logging.getLogger(__name__)
@@ -57,14 +61,16 @@ def add_budget():
         category_id=category_id,
         amount=amount,
         start_date=start_date,
-        end_date=end_date
-        # Keep defaults for spent, alert_threshold, alert_enabled
+        end_date=end_date,
+        # Seed spent from the ledger; transaction writes keep it current afterwards
+        spent=spend_for_window(current_user_id, category_id, start_date, end_date)
+        # Keep defaults for alert_threshold, alert_enabled
     )
     try:
         db.session.add(new_budget)
         db.session.commit()
         logger.info(f"Budget created successfully for user {current_user_id}, category {category_id}")
-        return jsonify(new_budget.to_dict()), 201
+        return jsonify(serialize_budget(new_budget)), 201
     except Exception as e:
         db.session.rollback()
         logger.error(f"Database error creating budget: {e}")
@@ -72,71 +78,49 @@ def add_budget():
 
 @budgets_bp.route('', methods=['GET'])
 @jwt_required()
+@etag_response
 def get_budgets():
     current_user_id = get_jwt_identity()
     start_date_str = request.args.get('start_date') # Optional: YYYY-MM-DD
     end_date_str = request.args.get('end_date')     # Optional: YYYY-MM-DD
     category_id = request.args.get('category_id', type=int) # Optional
 
-    query = Budget.query.filter_by(user_id=current_user_id)
+    # Budget.spent is maintained on transaction writes, so one joined column
+    # select returns everything the list needs.
+    query = budget_select(current_user_id)
 
     try:
         if start_date_str:
             start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
             # Find budgets that end on or after the requested start date
-            query = query.filter(Budget.end_date >= start_date)
+            query = query.where(Budget.end_date >= start_date)
         if end_date_str:
             end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
             # Find budgets that start on or before the requested end date
-            query = query.filter(Budget.start_date <= end_date)
+            query = query.where(Budget.start_date <= end_date)
     except ValueError:
         return jsonify({"msg": "Invalid date format. Use YYYY-MM-DD."}), 400
 
     if category_id:
-        query = query.filter_by(category_id=category_id)
+        query = query.where(Budget.category_id == category_id)
 
     # Order by start date, most recent first
-    budgets = query.order_by(Budget.start_date.desc()).all()
-
-    budgets_data = []
-    for budget in budgets:
-        budget_dict = budget.to_dict()
-        # Calculate current spending within the budget's timeframe and category
-        current_spending = db.session.query(func.sum(Transaction.amount)).filter(
-            Transaction.user_id == current_user_id,
-            Transaction.category_id == budget.category_id,
-            Transaction.type == 'expense',
-            Transaction.date >= budget.start_date,
-            Transaction.date <= budget.end_date
-        ).scalar() or 0.0
-        budget_dict['current_spending'] = round(current_spending, 2)
-        budget_dict['category_name'] = budget.category.name # Add category name
-        budgets_data.append(budget_dict)
-
-    return jsonify(budgets_data)
+    budgets = fetch(query.order_by(Budget.start_date.desc()), BudgetRow)
+    # Projections for all active budgets come from one batched, cached computation
+    forecasts = forecast_budgets(current_user_id, budgets)
+    return jsonify([budget.to_dict(forecasts.get(budget.id)) for budget in budgets])
 
 @budgets_bp.route('/<int:budget_id>', methods=['GET'])
 @jwt_required()
+@etag_response
 def get_budget(budget_id):
     current_user_id = get_jwt_identity()
-    budget = Budget.query.filter_by(id=budget_id, user_id=current_user_id).first()
+    budget = fetch_one(budget_select(current_user_id).where(Budget.id == budget_id), BudgetRow)
     if not budget:
         logger.warning(f"Budget {budget_id} not found for user {current_user_id}")
         return jsonify({"msg": "Budget not found"}), 404
 
-    budget_dict = budget.to_dict()
-    # Calculate current spending within the budget's timeframe and category
-    current_spending = db.session.query(func.sum(Transaction.amount)).filter(
-        Transaction.user_id == current_user_id,
-        Transaction.category_id == budget.category_id,
-        Transaction.type == 'expense',
-        Transaction.date >= budget.start_date,
-        Transaction.date <= budget.end_date
-    ).scalar() or 0.0
-    budget_dict['current_spending'] = round(current_spending, 2)
-    budget_dict['category_name'] = budget.category.name
-
-    return jsonify(budget_dict)
+    return jsonify(budget.to_dict(forecast_budgets(current_user_id, [budget]).get(budget.id)))
 
 @budgets_bp.route('/<int:budget_id>', methods=['PUT'])
 @jwt_required()
@@ -188,6 +172,7 @@ def update_budget(budget_id):
             
             budget.start_date = new_start_date
             budget.end_date = new_end_date
+            budget.spent = spend_for_window(current_user_id, budget.category_id, new_start_date, new_end_date)
             
         if 'alert_threshold' in data:
             budget.alert_threshold = float(data['alert_threshold'])
@@ -213,16 +198,9 @@ def update_budget(budget_id):
             logger.error(f"Database error updating budget {budget_id}: {e}")
             return jsonify({"msg": "Failed to update budget due to database error"}), 500
 
-    # Return the updated budget with potentially recalculated spending
-    budget_dict = budget.to_dict()
-    current_spending = db.session.query(func.sum(Transaction.amount)).filter(
-        Transaction.user_id == current_user_id,
-        Transaction.category_id == budget.category_id,
-        Transaction.type == 'expense',
-        Transaction.date >= budget.start_date,
-        Transaction.date <= budget.end_date
-    ).scalar() or 0.0
-    budget_dict['current_spending'] = round(current_spending, 2)
+    # Return the updated budget with its recalculated spending
+    budget_dict = serialize_budget(budget)
+    budget_dict['current_spending'] = round(budget.spent or 0.0, 2)
     budget_dict['category_name'] = budget.category.name
 
     return jsonify(budget_dict)
@@ -1,39 +1,140 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from services.response_cache import cached_response, etag_response
 from models.transaction import Transaction
-from sqlalchemy import func
+from sqlalchemy import func, select
+from services.streaming import wants_stream, stream_rows
+from services.read_models import transaction_select
+from services.pagination import keyset_page, page_size_arg
+from services import bucketing
+from extensions import db
+from datetime import date, datetime, timedelta
 
 calendar_bp = Blueprint("calendar", __name__)
 
+# A multi-year heatmap is still one grouped query; cap it so a typo can't ask for centuries.
+HEATMAP_MAX_DAYS = 5 * 366
+
+def calendar_entry(t):
+    return {
+        "id": t.id,
+        "date": t.date,
+        "description": t.description,
+        "amount": t.amount,
+        "type": t.type,
+        "category": t.category_id
+    }
+
+def month_range(year, month):
+    start = date(year, month, 1)
+    return start, bucketing.shift(start, 'month') - timedelta(days=1)
+
+def requested_range():
+    """(start, end) from ?start=&end= or ?year=&month=; raises ValueError when invalid."""
+    start = request.args.get("start")
+    end = request.args.get("end")
+    if start or end:
+        if not (start and end):
+            raise ValueError("Both start and end are required")
+        start = datetime.strptime(start, '%Y-%m-%d').date()
+        end = datetime.strptime(end, '%Y-%m-%d').date()
+        if end < start:
+            raise ValueError("end must not be before start")
+        return start, end
+    year = request.args.get("year", type=int)
+    month = request.args.get("month", type=int)
+    if not year or not month or not 1 <= month <= 12:
+        raise ValueError("Year and month are required")
+    return month_range(year, month)
+
+def heatmap_query(user_id, start, end):
+    # Plain range predicates on date keep this on ix_transaction_user_date_id.
+    return select(
+        Transaction.date,
+        Transaction.type,
+        func.sum(Transaction.amount),
+        func.count(Transaction.id)
+    ).where(
+        Transaction.user_id == user_id,
+        *bucketing.date_range(Transaction.date, start, end)
+    ).group_by(Transaction.date, Transaction.type)
+
 @calendar_bp.route("/transactions", methods=["GET"])
 @jwt_required()
+@etag_response
 def get_calendar_transactions():
     try:
         user_id = get_jwt_identity()
-        year = request.args.get("year", type=int)
-        month = request.args.get("month", type=int)
-
-        if not year or not month:
-            return jsonify({"message": "Year and month are required"}), 400
-
-        # Fetch transactions for the specified month
-        transactions = Transaction.query.filter(
-            Transaction.user_id == user_id,
-            func.extract("year", Transaction.date) == year,
-            func.extract("month", Transaction.date) == month
-        ).all()
-
-        result = [
-            {
-                "id": t.id,
-                "date": t.date,
-                "description": t.description,
-                "amount": t.amount,
-                "type": t.type,
-                "category": t.category_id
-            }
-            for t in transactions
-        ]
+        try:
+            start, end = requested_range()
+        except ValueError as e:
+            return jsonify({"message": str(e)}), 400
+
+        query = transaction_select(user_id).where(*bucketing.date_range(Transaction.date, start, end))
+
+        # Drill-down from the heatmap: newest-first pages within the range
+        cursor = request.args.get("cursor")
+        page_size = request.args.get("page_size", type=int)
+        if cursor or page_size is not None:
+            try:
+                rows, next_cursor = keyset_page(query, Transaction.date, Transaction.id, cursor, page_size_arg(page_size))
+            except ValueError as e:
+                return jsonify({"message": str(e)}), 400
+            return jsonify({
+                "transactions": [calendar_entry(t) for t in rows],
+                "next_cursor": next_cursor
+            })
+
+        if wants_stream():
+            return stream_rows(query, calendar_entry)
+
+        result = [calendar_entry(t) for t in db.session.execute(query)]
         return jsonify(result)
     except Exception as e:
-        return jsonify({"error": "An error occurred while fetching calendar transactions.", "details": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": "An error occurred while fetching calendar transactions.", "details": str(e)}), 500
+
+@calendar_bp.route("/heatmap", methods=["GET"])
+@jwt_required()
+@etag_response
+@cached_response()
+def get_calendar_heatmap():
+    """Per-day income/expense totals and counts for ?start=&end= (or ?year=&month=).
+
+    Only days with activity are listed; drill into one with
+    /transactions?start=<day>&end=<day>&page_size=N.
+    """
+    try:
+        user_id = get_jwt_identity()
+        try:
+            start, end = requested_range()
+        except ValueError as e:
+            return jsonify({"message": str(e)}), 400
+        if (end - start).days >= HEATMAP_MAX_DAYS:
+            return jsonify({"message": f"Range is limited to {HEATMAP_MAX_DAYS} days"}), 400
+
+        days = {}
+        totals = {"income": 0.0, "expense": 0.0, "income_count": 0, "expense_count": 0}
+        for day, txn_type, total, count in db.session.execute(heatmap_query(user_id, start, end)):
+            if txn_type not in ("income", "expense"):
+                continue
+            entry = days.setdefault(day, {
+                "date": day, "income": 0.0, "expense": 0.0, "income_count": 0, "expense_count": 0
+            })
+            entry[txn_type] = round(total or 0.0, 2)
+            entry[f"{txn_type}_count"] = count
+            totals[txn_type] += total or 0.0
+            totals[f"{txn_type}_count"] += count
+
+        for entry in days.values():
+            entry["net"] = round(entry["income"] - entry["expense"], 2)
+        totals["income"] = round(totals["income"], 2)
+        totals["expense"] = round(totals["expense"], 2)
+
+        return jsonify({
+            "start": start,
+            "end": end,
+            "days": [days[day] for day in sorted(days)],
+            "totals": totals
+        })
+    except Exception as e:
+        return jsonify({"error": "An error occurred while building the calendar heatmap.", "details": str(e)}), 500
@@ -1,5 +1,8 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from services.response_cache import cached_response, etag_response
+from services.serializers import serialize_category
+from services.read_models import CategoryRow, category_select, fetch
 from models import Category, Transaction, Budget # Models only
 from extensions import db # Extensions here
 import logging
@@ -35,23 +38,25 @@ def add_category():
     db.session.add(new_category)
     db.session.commit()
 
-    return jsonify(new_category.to_dict()), 201
+    return jsonify(serialize_category(new_category)), 201
 
 @categories_bp.route('', methods=['GET'])
 @jwt_required()
+@etag_response
 def get_categories():
     current_user_id = get_jwt_identity()
-    categories = Category.query.filter_by(user_id=current_user_id).order_by(Category.name).all()
+    categories = fetch(category_select(current_user_id).order_by(Category.name), CategoryRow)
     return jsonify([c.to_dict() for c in categories])
 
 @categories_bp.route('/<int:category_id>', methods=['GET'])
 @jwt_required()
+@etag_response
 def get_category(category_id):
     current_user_id = get_jwt_identity()
     category = Category.query.filter_by(id=category_id, user_id=current_user_id).first()
     if not category:
         return jsonify({"msg": "Category not found"}), 404
-    return jsonify(category.to_dict())
+    return jsonify(serialize_category(category))
 
 @categories_bp.route('/<int:category_id>', methods=['PUT'])
 @jwt_required()
@@ -74,7 +79,7 @@ def update_category(category_id):
         category.icon = data['icon']
 
     db.session.commit()
-    return jsonify(category.to_dict())
+    return jsonify(serialize_category(category))
 
 @categories_bp.route('/<int:category_id>', methods=['DELETE'])
 @jwt_required()
@@ -98,6 +103,8 @@ def delete_category(category_id):
 
 @categories_bp.route('/breakdown', methods=['GET'])
 @jwt_required()
+@etag_response
+@cached_response()
 def get_category_expense_breakdown():
     current_user_id = get_jwt_identity()
     # Join transactions and categories, sum by category
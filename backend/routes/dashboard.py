@@ -1,28 +1,33 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from services.response_cache import cached_response, etag_response
 from models.transaction import Transaction
 from models.category import Category
 from models.budget import Budget
-from models.user import User
 from extensions import db
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_
+from sqlalchemy import event, func, select
+from services import rollups, bucketing, forecasting
+from services.read_models import TransactionRow, BudgetRow, transaction_select, budget_select, fetch
+from collections import defaultdict, namedtuple
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 dashboard_bp = Blueprint('dashboard', __name__)
 
-def get_date_range(timeframe, start_date=None, end_date=None):
-    today = datetime.now().date()
+TrendRow = namedtuple('TrendRow', ['month', 'total'])
+CategoryRow = namedtuple('CategoryRow', ['name', 'total'])
+
+RECENT_TRANSACTIONS = 5
+
+def get_date_range(timeframe, start_date=None, end_date=None, today=None):
+    today = today or datetime.now().date()
     if timeframe == "today":
         return today, today
-    elif timeframe == "month":
-        start = today.replace(day=1)
-        if today.month == 12:
-            end = today.replace(year=today.year + 1, month=1, day=1) - timedelta(days=1)
-        else:
-            end = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
-        return start, end
+    elif timeframe in ("week", "month", "quarter", "year"):
+        # The calendar week/month/quarter/year containing today
+        return bucketing.window(timeframe, 1, today)
     elif timeframe == "custom" and start_date and end_date:
         try:
             start = datetime.strptime(start_date, '%Y-%m-%d').date()
@@ -35,8 +40,152 @@ def get_date_range(timeframe, start_date=None, end_date=None):
         # Default to all time
         return None, None
 
+def rollup_window(start, end):
+    """Return (usable, start_month, end_month) when a date range covers whole months."""
+    if not start and not end:
+        return True, None, None
+    if start.day == 1 and (end + timedelta(days=1)).day == 1:
+        return True, rollups.month_key(start), rollups.month_key(end)
+    return False, None, None
+
+def ledger_aggregate_query(user_id, start, end):
+    """(month, type, category name, total) over the ledger, for day-range windows."""
+    month_expr = bucketing.bucket_key_expr(Transaction.date, 'month')
+    return select(
+        month_expr.label('month'),
+        Transaction.type,
+        Category.name,
+        func.sum(Transaction.amount).label('total')
+    ).join(
+        Category, Category.id == Transaction.category_id
+    ).where(
+        Transaction.user_id == user_id,
+        *bucketing.date_range(Transaction.date, start, end)
+    ).group_by(month_expr, Transaction.type, Category.name)
+
+def recent_transactions_query(user_id, start=None, end=None):
+    return transaction_select(user_id).where(
+        *bucketing.date_range(Transaction.date, start, end)
+    ).order_by(Transaction.date.desc(), Transaction.id.desc()).limit(RECENT_TRANSACTIONS)
+
+def aggregate_pass(user_id, start, end):
+    """Totals, per-category and per-month figures from one grouped query.
+
+    Groups once at the finest grain the dashboard needs (month x type x
+    category) and folds the coarser totals in Python, so the filtered set is
+    scanned a single time. Whole-month windows read the monthly rollups; day
+    ranges read the ledger.
+    """
+    use_rollups, start_month, end_month = rollup_window(start, end)
+    if use_rollups:
+        rows = rollups.totals_by_month_type_category(user_id, start_month, end_month)
+    else:
+        rows = db.session.execute(ledger_aggregate_query(user_id, start, end)).all()
+
+    totals = {'income': 0.0, 'expense': 0.0}
+    by_category = defaultdict(float)
+    by_month = defaultdict(float)
+    for month, txn_type, name, total in rows:
+        total = total or 0.0
+        totals[txn_type] = totals.get(txn_type, 0.0) + total
+        if txn_type == 'expense':
+            by_category[name] += total
+            by_month[month] += total
+
+    category_breakdown = [
+        CategoryRow(name, total)
+        for name, total in sorted(by_category.items(), key=lambda item: item[1], reverse=True)
+    ]
+    expense_trends = [TrendRow(month, by_month[month]) for month in sorted(by_month)]
+    return totals, category_breakdown, expense_trends
+
+def dashboard_payload(user_id, timeframe='all', start_date=None, end_date=None):
+    """The /api/dashboard body, from a fixed number of queries.
+
+    One grouped aggregate pass (see aggregate_pass), the recent transactions and
+    the budget status through the read models, plus the user's time zone.
+    """
+    start, end = get_date_range(timeframe, start_date, end_date, bucketing.user_today(user_id))
+
+    # Summary, category breakdown and monthly trends in one grouped pass
+    totals, category_breakdown, expense_trends = aggregate_pass(user_id, start, end)
+    total_expenses = totals['expense']
+    total_income = totals['income']
+    current_balance = total_income - total_expenses
+    savings = max(0, current_balance)
+    savings_rate = (savings / total_income * 100) if total_income > 0 else 0
+
+    # Recent transactions, with the category name joined in
+    recent_transactions = fetch(recent_transactions_query(user_id, start, end), TransactionRow)
+
+    # Budget status from the maintained Budget.spent
+    budget_filter = []
+    if start and end:
+        budget_filter = [Budget.start_date <= end, Budget.end_date >= start]
+    budget_status = fetch(budget_select(user_id).where(*budget_filter), BudgetRow)
+
+    return {
+        'summary': {
+            'totalExpenses': total_expenses,
+            'totalIncome': total_income,
+            'currentBalance': current_balance,
+            'savings': savings,
+            'savingsRate': f"{savings_rate:.1f}%",
+            'expenseTrend': calculate_trend(expense_trends),
+            'incomeTrend': calculate_trend(expense_trends, 'income'),
+            'balanceTrend': calculate_balance_trend(current_balance, total_income)
+        },
+        'recentTransactions': [{
+            'id': t.id,
+            'description': t.description,
+            'amount': t.amount,
+            'type': t.type,
+            'date': t.date.isoformat(),
+            'category': t.category_name
+        } for t in recent_transactions],
+        'categoryBreakdown': [{
+            'name': c.name,
+            'total': c.total
+        } for c in category_breakdown],
+        'budgetStatus': [{
+            'category': b.category_name,
+            'budget': b.amount,
+            'spent': b.spent or 0
+        } for b in budget_status],
+        'expenseTrends': [{
+            'month': t.month,
+            'total': t.total
+        } for t in expense_trends]
+    }
+
+def benchmark_dashboard(user_id, timeframes=('all', 'month', 'year'), repeat=5):
+    """{timeframe: (best seconds, queries per build)} for dashboard_payload against live data."""
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    results = {}
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        for timeframe in timeframes:
+            timings = []
+            for _ in range(repeat):
+                statements.clear()
+                started = time.perf_counter()
+                dashboard_payload(user_id, timeframe)
+                timings.append(time.perf_counter() - started)
+                # Nothing is written, so drop what the reads loaded
+                db.session.rollback()
+            results[timeframe] = (min(timings), len(statements))
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+    return results
+
 @dashboard_bp.route('', methods=['GET'])
 @jwt_required()
+@etag_response
+@cached_response()
 def get_dashboard_data():
     try:
         user_id = get_jwt_identity()
@@ -48,106 +197,7 @@ def get_dashboard_data():
         if timeframe == "custom":
             logger.info(f"Custom date range: {start_date} to {end_date}")
 
-        start, end = get_date_range(timeframe, start_date, end_date)
-        date_filter = []
-        if start and end:
-            date_filter = [Transaction.date >= start, Transaction.date <= end]
-
-        # Get summary data
-        summary_query = db.session.query(
-            func.sum(Transaction.amount).filter(Transaction.type == 'expense').label('total_expenses'),
-            func.sum(Transaction.amount).filter(Transaction.type == 'income').label('total_income')
-        ).filter(Transaction.user_id == user_id, *date_filter)
-
-        summary = summary_query.first()
-        total_expenses = summary.total_expenses or 0
-        total_income = summary.total_income or 0
-        current_balance = total_income - total_expenses
-        savings = max(0, current_balance)
-        savings_rate = (savings / total_income * 100) if total_income > 0 else 0
-
-        # Get recent transactions
-        recent_transactions = Transaction.query.filter(
-            Transaction.user_id == user_id,
-            *date_filter
-        ).order_by(Transaction.date.desc()).limit(5).all()
-
-        # Get category breakdown
-        category_breakdown = db.session.query(
-            Category.name,
-            func.sum(Transaction.amount).label('total')
-        ).join(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == 'expense',
-            *date_filter
-        ).group_by(Category.name).all()
-
-        # Get budget status
-        budget_status = db.session.query(
-            Category.name,
-            Budget.amount.label('budget'),
-            func.sum(Transaction.amount).label('spent')
-        ).join(Budget).outerjoin(
-            Transaction,
-            and_(
-                Transaction.category_id == Category.id,
-                Transaction.user_id == user_id,
-                *date_filter
-            )
-        ).filter(
-            Budget.user_id == user_id
-        ).group_by(Category.name, Budget.amount).all()
-
-        # Get expense trends
-        if db.engine.url.drivername == 'postgresql':
-            month_label_expr = func.to_char(Transaction.date.cast(db.DateTime), 'YYYY-MM').label('month')
-        else:
-            # Default for SQLite
-            month_label_expr = func.strftime('%Y-%m', Transaction.date).label('month')
-
-        expense_trends = db.session.query(
-            month_label_expr,
-            func.sum(Transaction.amount).label('total')
-        ).filter(
-            Transaction.user_id == user_id,
-            Transaction.type == 'expense',
-            *date_filter
-        ).group_by('month').order_by('month').all()
-
-        response_data = {
-            'summary': {
-                'totalExpenses': total_expenses,
-                'totalIncome': total_income,
-                'currentBalance': current_balance,
-                'savings': savings,
-                'savingsRate': f"{savings_rate:.1f}%",
-                'expenseTrend': calculate_trend(expense_trends),
-                'incomeTrend': calculate_trend(expense_trends, 'income'),
-                'balanceTrend': calculate_balance_trend(current_balance, total_income)
-            },
-            'recentTransactions': [{
-                'id': t.id,
-                'description': t.description,
-                'amount': t.amount,
-                'type': t.type,
-                'date': t.date.isoformat(),
-                'category': t.category.name if t.category else None
-            } for t in recent_transactions],
-            'categoryBreakdown': [{
-                'name': c.name,
-                'total': c.total
-            } for c in category_breakdown],
-            'budgetStatus': [{
-                'category': b.name,
-                'budget': b.budget,
-                'spent': b.spent or 0
-            } for b in budget_status],
-            'expenseTrends': [{
-                'month': t.month,
-                'total': t.total
-            } for t in expense_trends]
-        }
-
+        response_data = dashboard_payload(user_id, timeframe, start_date, end_date)
         logger.info(f"Successfully fetched dashboard data for user {user_id}")
         return jsonify(response_data)
 
@@ -189,15 +239,17 @@ def calculate_balance_trend(current_balance, total_income):
 
 @dashboard_bp.route('/recent-transactions', methods=['GET'])
 @jwt_required()
+@etag_response
+@cached_response()
 def get_recent_transactions():
     try:
         user_id = get_jwt_identity()
         limit = request.args.get('limit', 5, type=int)
         
-        transactions = Transaction.query.filter_by(user_id=user_id)\
-            .order_by(Transaction.date.desc())\
-            .limit(limit)\
-            .all()
+        transactions = fetch(
+            transaction_select(user_id).order_by(Transaction.date.desc()).limit(limit),
+            TransactionRow
+        )
             
         return jsonify([t.to_dict() for t in transactions])
         
@@ -207,13 +259,15 @@ def get_recent_transactions():
 
 @dashboard_bp.route('/category-breakdown', methods=['GET'])
 @jwt_required()
+@etag_response
+@cached_response()
 def get_category_breakdown():
     try:
         user_id = get_jwt_identity()
         
         # Get current month's transactions grouped by category
-        today = datetime.utcnow()
-        start_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        today = bucketing.user_today(user_id)
+        start_of_month = bucketing.bucket_start(today, 'month')
         
         breakdown = db.session.query(
             Category.name,
@@ -248,44 +302,34 @@ def get_category_breakdown():
 
 @dashboard_bp.route('/budget-status', methods=['GET'])
 @jwt_required()
+@etag_response
+@cached_response()
 def get_budget_status():
     try:
         user_id = get_jwt_identity()
         
-        # Get current month's start and end dates
-        today = datetime.utcnow()
-        start_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        
-        # Get active budgets and their spending
-        budgets = db.session.query(
-            Budget,
-            Category.name.label('category_name'),
-            func.coalesce(func.sum(Transaction.amount), 0).label('spent')
-        ).join(
-            Category,
-            Budget.category_id == Category.id
-        ).outerjoin(
-            Transaction,
-            db.and_(
-                Transaction.category_id == Budget.category_id,
-                Transaction.date >= start_of_month,
-                Transaction.type == 'expense'
-            )
-        ).filter(
-            Budget.user_id == user_id,
+        today = bucketing.user_today(user_id)
+
+        # Active budgets with their maintained spent, plus batched projections
+        budgets = fetch(budget_select(user_id).where(
             Budget.start_date <= today,
             Budget.end_date >= today
-        ).group_by(
-            Budget.id,
-            Category.name
-        ).all()
-        
-        result = [{
-            'category': budget.category_name,
-            'limit': budget.Budget.amount,
-            'spent': float(budget.spent),
-            'percentage': round((float(budget.spent) / budget.Budget.amount * 100) if budget.Budget.amount > 0 else 0, 2)
-        } for budget in budgets]
+        ).order_by(Budget.id), BudgetRow)
+        forecasts = forecasting.forecast_budgets(user_id, budgets, today)
+
+        result = []
+        for budget in budgets:
+            spent = float(budget.spent or 0.0)
+            forecast = forecasts[budget.id]
+            result.append({
+                'category': budget.category_name,
+                'limit': budget.amount,
+                'spent': spent,
+                'percentage': round((spent / budget.amount * 100) if budget.amount > 0 else 0, 2),
+                'projected': forecast['projected_spend'],
+                'projectedPercentage': forecast['projected_percentage'],
+                'exhaustionDate': forecast['exhaustion_date']
+            })
         
         return jsonify(result)
         
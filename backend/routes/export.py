@@ -0,0 +1,97 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models import Transaction, Category # Models only
+from extensions import db # Extensions here
+from services.exporters import export_rows, ExportUnavailable
+from routes import reports
+from sqlalchemy import select
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+export_bp = Blueprint('export', __name__)
+
+EXPORT_CHUNK_SIZE = 1000
+
+TRANSACTION_COLUMNS = ['id', 'date', 'type', 'category', 'amount', 'description']
+
+# Report name -> (payload builder, key of its tabular part, that table's columns).
+# The builders are the undecorated halves of the report views, so exports never
+# go through the response cache or ETag handling keyed on the export URL.
+REPORT_TABLES = {
+    'summary': (reports.summary_report, 'top_spending_categories', ['category', 'amount']),
+    'spending-by-category': (reports.spending_by_category_report, 'topCategories',
+                             ['name', 'amount', 'percentage']),
+    'income-vs-expense': (reports.income_vs_expense_report, 'monthlyComparison',
+                          ['name', 'income', 'expenses', 'savings']),
+    'spending-trends': (reports.spending_trends_report, 'monthlySpending', ['name', 'amount', 'change']),
+}
+
+def transaction_export_query(user_id, args):
+    query = select(
+        Transaction.id,
+        Transaction.date,
+        Transaction.type,
+        Category.name,
+        Transaction.amount,
+        Transaction.description
+    ).outerjoin(Category, Category.id == Transaction.category_id).where(Transaction.user_id == user_id)
+
+    category_id = args.get('category')
+    transaction_type = args.get('type')
+    start_date = args.get('start_date')
+    end_date = args.get('end_date')
+    if category_id:
+        query = query.where(Transaction.category_id == int(category_id))
+    if transaction_type:
+        query = query.where(Transaction.type == transaction_type)
+    if start_date:
+        query = query.where(Transaction.date >= datetime.strptime(start_date, '%Y-%m-%d').date())
+    if end_date:
+        query = query.where(Transaction.date <= datetime.strptime(end_date, '%Y-%m-%d').date())
+    return query.order_by(Transaction.date.desc(), Transaction.id.desc())
+
+def iter_rows(query):
+    """Yield export rows from a server-side cursor, EXPORT_CHUNK_SIZE at a time."""
+    result = db.session.execute(query.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+    try:
+        for row in result:
+            yield tuple(row)
+    finally:
+        result.close()
+
+@export_bp.route('/transactions', methods=['GET'])
+@jwt_required()
+def export_transactions():
+    user_id = get_jwt_identity()
+    fmt = request.args.get('format', 'csv').lower()
+    try:
+        query = transaction_export_query(user_id, request.args)
+        return export_rows(fmt, TRANSACTION_COLUMNS, iter_rows(query), 'transactions')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except ExportUnavailable as e:
+        return jsonify({'error': str(e)}), 501
+    except Exception as e:
+        logger.error(f'Error exporting transactions: {str(e)}')
+        return jsonify({'error': 'Failed to export transactions'}), 500
+
+@export_bp.route('/reports/<report_name>', methods=['GET'])
+@jwt_required()
+def export_report(report_name):
+    if report_name not in REPORT_TABLES:
+        return jsonify({'error': f'Unknown report: {report_name}'}), 404
+    fmt = request.args.get('format', 'csv').lower()
+    build, key, columns = REPORT_TABLES[report_name]
+    try:
+        # Reports are already aggregated, so their payloads are small enough to reuse as-is
+        table = build(get_jwt_identity())[key]
+        rows = [tuple(item[column] for column in columns) for item in table]
+        return export_rows(fmt, columns, rows, report_name.replace('-', '_'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except ExportUnavailable as e:
+        return jsonify({'error': str(e)}), 501
+    except Exception as e:
+        logger.error(f'Error exporting report {report_name}: {str(e)}')
+        return jsonify({'error': 'Failed to export report'}), 500
@@ -1,63 +1,60 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import Transaction, Category # Models only
-from extensions import db # Extensions here
-from datetime import datetime, timedelta
-from sqlalchemy import func, extract
-import pandas as pd
-import io
+from services.response_cache import cached_response, etag_response
+from datetime import timedelta
+from services import rollups, bucketing, analytics
 import logging
-import calendar
 
 logger = logging.getLogger(__name__)
 reports_bp = Blueprint('reports', __name__)
 
-@reports_bp.route('/summary', methods=['GET'])
-@jwt_required()
-def get_summary():
-    current_user_id = get_jwt_identity()
-    
-    # Get month and year from query params, default to current month/year
-    today = datetime.utcnow().date()
+# timeRange -> number of months a trend report covers. At these sizes the
+# per-bucket loops below beat services/analytics' array path (see its docstring).
+RANGE_MONTHS = {'month': 6, 'quarter': 3, 'year': 12}
+MAX_ANALYTICS_MONTHS = 120
+
+def trend_window(user_id):
+    """(unit, bucket starts, start, end) for the trend reports.
+
+    The window is the last RANGE_MONTHS[timeRange] months up to today in the
+    user's time zone, split into ?granularity= buckets (month by default).
+    Raises ValueError for an unknown granularity.
+    """
+    today = bucketing.user_today(user_id)
+    unit = request.args.get('granularity', 'month')
+    num_months = RANGE_MONTHS.get(request.args.get('timeRange', 'month'), 6)
+    start_date, end_date = bucketing.window('month', num_months, today)
+    starts = bucketing.buckets_between(start_date, end_date, unit)
+    # Widen to whole buckets so the first and last ones are not partial
+    return unit, starts, starts[0], bucketing.shift(starts[-1], unit) - timedelta(days=1)
+
+def percent_change(previous, current):
+    if previous == 0:
+        return "+∞%" if current > 0 else "0%"
+    return f"{round(((current - previous) / previous) * 100, 2)}%"
+
+def summary_report(current_user_id):
+    """Month totals and top spending categories (?year=&month=, default this month)."""
+    # Get month and year from query params, default to the user's current month/year
+    today = bucketing.user_today(current_user_id)
     year = request.args.get('year', default=today.year, type=int)
     month = request.args.get('month', default=today.month, type=int)
     
-    # Calculate start and end dates for the month
-    _, num_days = calendar.monthrange(year, month)
-    start_date = datetime(year, month, 1).date()
-    end_date = datetime(year, month, num_days).date()
-    
-    # Total Income for the month
-    total_income = db.session.query(func.sum(Transaction.amount)).filter(
-        Transaction.user_id == current_user_id,
-        Transaction.type == 'income',
-        Transaction.date >= start_date,
-        Transaction.date <= end_date
-    ).scalar() or 0.0
-
-    # Total Expense for the month
-    total_expense = db.session.query(func.sum(Transaction.amount)).filter(
-        Transaction.user_id == current_user_id,
-        Transaction.type == 'expense',
-        Transaction.date >= start_date,
-        Transaction.date <= end_date
-    ).scalar() or 0.0
+    # Month totals come from the incrementally maintained rollups
+    year_month = f"{year}-{month:02d}"
+    totals = rollups.totals_by_type(current_user_id, year_month, year_month)
+    total_income = totals['income']
+    total_expense = totals['expense']
 
     # Net Savings/Loss
     net_savings = total_income - total_expense
 
     # Top spending categories for the month
-    top_spending_categories = db.session.query(
-        Category.name,
-        func.sum(Transaction.amount).label('total_spent')
-    ).join(Transaction, Category.id == Transaction.category_id).filter(
-        Transaction.user_id == current_user_id,
-        Transaction.type == 'expense',
-        Transaction.date >= start_date,
-        Transaction.date <= end_date
-    ).group_by(Category.name).order_by(func.sum(Transaction.amount).desc()).limit(5).all()
+    top_spending_categories = rollups.totals_by_category(
+        current_user_id, 'expense', year_month, year_month, limit=5
+    )
 
-    summary = {
+    return {
         'year': year,
         'month': month,
         'total_income': total_income,
@@ -67,205 +64,112 @@ def get_summary():
             {'category': name, 'amount': amount} for name, amount in top_spending_categories
         ]
     }
-    return jsonify(summary)
 
-@reports_bp.route('/spending-by-category', methods=['GET'])
+@reports_bp.route('/summary', methods=['GET'])
 @jwt_required()
-def get_spending_by_category():
-    current_user_id = get_jwt_identity()
-    today = datetime.utcnow().date()
-    # Default: current month
-    year = today.year
-    month = today.month
+@etag_response
+@cached_response()
+def get_summary():
+    return jsonify(summary_report(get_jwt_identity()))
+
+def spending_by_category_report(current_user_id):
+    """Expense per category over ?timeRange= (this month, last 3 months or year to date)."""
+    today = bucketing.user_today(current_user_id)
     time_range = request.args.get('timeRange', 'month')
     if time_range == 'year':
-        year = today.year
-        month = None
+        # Year to date
+        start_date, end_date = bucketing.bucket_start(today, 'year'), today
     elif time_range == 'quarter':
-        # Use last 3 months
-        month = today.month - 2 if today.month > 2 else 1
-    # Calculate start and end dates
-    if month:
-        _, num_days = calendar.monthrange(year, month)
-        start_date = datetime(year, month, 1).date()
-        end_date = datetime(year, month, num_days).date()
+        # Last 3 months, including this one
+        start_date, end_date = bucketing.window('month', 3, today)
     else:
-        start_date = datetime(year, 1, 1).date()
-        end_date = today
-    spending_data = db.session.query(
-        Category.name,
-        func.sum(Transaction.amount).label('total_spent')
-    ).join(Transaction, Category.id == Transaction.category_id).filter(
-        Transaction.user_id == current_user_id,
-        Transaction.type == 'expense',
-        Transaction.date >= start_date,
-        Transaction.date <= end_date
-    ).group_by(Category.name).order_by(func.sum(Transaction.amount).desc()).all()
+        # Default: current month
+        start_date, end_date = bucketing.window('month', 1, today)
+    spending_data = rollups.totals_by_category(
+        current_user_id, 'expense', rollups.month_key(start_date), rollups.month_key(end_date)
+    )
     total = sum([amount for _, amount in spending_data])
     topCategories = [
         {"name": name, "amount": float(amount), "percentage": round((amount/total)*100, 2) if total > 0 else 0}
         for name, amount in spending_data
     ]
-    return jsonify({"topCategories": topCategories})
+    return {"topCategories": topCategories}
 
-@reports_bp.route('/income-vs-expense', methods=['GET'])
+@reports_bp.route('/spending-by-category', methods=['GET'])
 @jwt_required()
-def get_income_vs_expense():
-    current_user_id = get_jwt_identity()
-    today = datetime.utcnow().date()
-    # Default: last 6 months
-    num_months = 6
-    # Optionally support timeRange param
-    time_range = request.args.get('timeRange', 'month')
-    if time_range == 'year':
-        num_months = 12
-    elif time_range == 'quarter':
-        num_months = 3
-    # Calculate start and end dates
-    end_date = today
-    start_month = today.month - num_months + 1
-    start_year = today.year
-    if start_month <= 0:
-        start_year -= 1
-        start_month += 12
-    start_date = datetime(start_year, start_month, 1).date()
+@etag_response
+@cached_response()
+def get_spending_by_category():
+    return jsonify(spending_by_category_report(get_jwt_identity()))
 
-    # Monthly income and expenses
-    income_data = db.session.query(
-        extract('year', Transaction.date).label('year'),
-        extract('month', Transaction.date).label('month'),
-        func.sum(Transaction.amount).label('total_income')
-    ).filter(
-        Transaction.user_id == current_user_id,
-        Transaction.type == 'income',
-        Transaction.date >= start_date,
-        Transaction.date <= end_date
-    ).group_by('year', 'month').order_by('year', 'month').all()
+def income_vs_expense_report(current_user_id):
+    """Income, expenses and savings per bucket of the trend window.
 
-    expense_data = db.session.query(
-        extract('year', Transaction.date).label('year'),
-        extract('month', Transaction.date).label('month'),
-        func.sum(Transaction.amount).label('total_expense')
-    ).filter(
-        Transaction.user_id == current_user_id,
-        Transaction.type == 'expense',
-        Transaction.date >= start_date,
-        Transaction.date <= end_date
-    ).group_by('year', 'month').order_by('year', 'month').all()
+    Raises ValueError for an unknown granularity.
+    """
+    unit, starts, start_date, end_date = trend_window(current_user_id)
+    totals = bucketing.totals_by_bucket(current_user_id, unit, start_date, end_date)
+    series = bucketing.densify(totals, starts, unit, lambda: {'income': 0.0, 'expense': 0.0})
 
-    # Build monthly comparison
-    months = []
     monthlyComparison = []
-    income_dict = {f"{int(y)}-{int(m):02d}": total for y, m, total in income_data}
-    expense_dict = {f"{int(y)}-{int(m):02d}": total for y, m, total in expense_data}
-    for i in range(num_months):
-        month_date = (datetime(today.year, today.month, 1) - timedelta(days=30*i)).replace(day=1)
-        key = f"{month_date.year}-{month_date.month:02d}"
-        months.append(key)
-    months = sorted(set(months))
-    for key in months:
-        income = income_dict.get(key, 0)
-        expenses = expense_dict.get(key, 0)
-        savings = income - expenses
-        name = datetime.strptime(key, "%Y-%m").strftime("%b %Y")
+    for bucket, values in series:
+        income = values['income']
+        expenses = values['expense']
         monthlyComparison.append({
-            "name": name,
+            "name": bucketing.bucket_label(bucket, unit),
             "income": round(income, 2),
             "expenses": round(expenses, 2),
-            "savings": round(savings, 2)
+            "savings": round(income - expenses, 2)
         })
     # Summary
-    totalIncome = sum([m[2] for m in income_data])
-    totalExpenses = sum([m[2] for m in expense_data])
+    totalIncome = sum(values['income'] for _, values in series)
+    totalExpenses = sum(values['expense'] for _, values in series)
     netSavings = totalIncome - totalExpenses
     savingsRate = round((netSavings / totalIncome * 100) if totalIncome > 0 else 0, 2)
-    return jsonify({
+    return {
         "totalIncome": round(totalIncome, 2),
         "totalExpenses": round(totalExpenses, 2),
         "netSavings": round(netSavings, 2),
         "savingsRate": savingsRate,
         "monthlyComparison": monthlyComparison
-    })
+    }
 
-@reports_bp.route('/spending-trends', methods=['GET'])
+@reports_bp.route('/income-vs-expense', methods=['GET'])
 @jwt_required()
-def get_spending_trends():
-    current_user_id = get_jwt_identity()
-    today = datetime.utcnow().date()
-    # Default: last 6 months
-    num_months = 6
-    time_range = request.args.get('timeRange', 'month')
-    if time_range == 'year':
-        num_months = 12
-    elif time_range == 'quarter':
-        num_months = 3
-    # Calculate start and end dates
-    end_date = today
-    start_month = today.month - num_months + 1
-    start_year = today.year
-    if start_month <= 0:
-        start_year -= 1
-        start_month += 12
-    start_date = datetime(start_year, start_month, 1).date()
-    # Monthly spending
-    expense_data = db.session.query(
-        extract('year', Transaction.date).label('year'),
-        extract('month', Transaction.date).label('month'),
-        func.sum(Transaction.amount).label('total_expense')
-    ).filter(
-        Transaction.user_id == current_user_id,
-        Transaction.type == 'expense',
-        Transaction.date >= start_date,
-        Transaction.date <= end_date
-    ).group_by('year', 'month').order_by('year', 'month').all()
-    # Build monthlySpending
-    months = []
+@etag_response
+@cached_response()
+def get_income_vs_expense():
+    try:
+        return jsonify(income_vs_expense_report(get_jwt_identity()))
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
+def spending_trends_report(current_user_id):
+    """Expense per bucket of the trend window, plus per-category this vs last month.
+
+    Raises ValueError for an unknown granularity.
+    """
+    unit, starts, start_date, end_date = trend_window(current_user_id)
+    totals = bucketing.totals_by_bucket(current_user_id, unit, start_date, end_date)
     monthlySpending = []
-    expense_dict = {f"{int(y)}-{int(m):02d}": total for y, m, total in expense_data}
     prev_amount = None
-    for i in range(num_months):
-        month_date = (datetime(today.year, today.month, 1) - timedelta(days=30*i)).replace(day=1)
-        key = f"{month_date.year}-{month_date.month:02d}"
-        months.append(key)
-    months = sorted(set(months))
-    for key in months:
-        amount = expense_dict.get(key, 0)
-        name = datetime.strptime(key, "%Y-%m").strftime("%b %Y")
+    for bucket, values in bucketing.densify(totals, starts, unit, lambda: {'income': 0.0, 'expense': 0.0}):
+        amount = values['expense']
         change = ""
         if prev_amount is not None:
-            if prev_amount == 0:
-                change = "+∞%"
-            else:
-                change = f"{round(((amount - prev_amount) / prev_amount) * 100, 2)}%"
+            change = "+∞%" if prev_amount == 0 else percent_change(prev_amount, amount)
         monthlySpending.append({
-            "name": name,
+            "name": bucketing.bucket_label(bucket, unit),
             "amount": round(amount, 2),
             "change": change
         })
         prev_amount = amount
     # Category trends (this month vs last month)
-    this_month = today.month
-    last_month = this_month - 1 if this_month > 1 else 12
-    this_year = today.year
-    last_year = this_year if this_month > 1 else this_year - 1
-    cat_this = db.session.query(
-        Category.name,
-        func.sum(Transaction.amount).label('total')
-    ).join(Transaction, Category.id == Transaction.category_id).filter(
-        Transaction.user_id == current_user_id,
-        Transaction.type == 'expense',
-        extract('year', Transaction.date) == this_year,
-        extract('month', Transaction.date) == this_month
-    ).group_by(Category.name).all()
-    cat_last = db.session.query(
-        Category.name,
-        func.sum(Transaction.amount).label('total')
-    ).join(Transaction, Category.id == Transaction.category_id).filter(
-        Transaction.user_id == current_user_id,
-        Transaction.type == 'expense',
-        extract('year', Transaction.date) == last_year,
-        extract('month', Transaction.date) == last_month
-    ).group_by(Category.name).all()
+    today = bucketing.user_today(current_user_id)
+    this_key = rollups.month_key(today)
+    last_key = rollups.month_key(bucketing.add_months(today, -1))
+    cat_this = rollups.totals_by_category(current_user_id, 'expense', this_key, this_key)
+    cat_last = rollups.totals_by_category(current_user_id, 'expense', last_key, last_key)
     cat_this_dict = {name: total for name, total in cat_this}
     cat_last_dict = {name: total for name, total in cat_last}
     all_cats = set(cat_this_dict.keys()) | set(cat_last_dict.keys())
@@ -273,20 +177,43 @@ def get_spending_trends():
     for cat in all_cats:
         this_amt = cat_this_dict.get(cat, 0)
         last_amt = cat_last_dict.get(cat, 0)
-        if last_amt == 0:
-            change = "+∞%" if this_amt > 0 else "0%"
-        else:
-            change = f"{round(((this_amt - last_amt) / last_amt) * 100, 2)}%"
         categoryTrends.append({
             "category": cat,
             "thisMonth": round(this_amt, 2),
             "lastMonth": round(last_amt, 2),
-            "change": change
+            "change": percent_change(last_amt, this_amt)
         })
-    return jsonify({
+    return {
         "monthlySpending": monthlySpending,
         "categoryTrends": categoryTrends
-    })
+    }
+
+@reports_bp.route('/spending-trends', methods=['GET'])
+@jwt_required()
+@etag_response
+@cached_response()
+def get_spending_trends():
+    try:
+        return jsonify(spending_trends_report(get_jwt_identity()))
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
+@reports_bp.route('/analytics', methods=['GET'])
+@jwt_required()
+@etag_response
+@cached_response()
+def get_analytics():
+    """Vectorized monthly metrics: rolling means, MoM/YoY deltas, savings and category shares."""
+    current_user_id = get_jwt_identity()
+    months = request.args.get('months', 12, type=int)
+    window = request.args.get('window', 3, type=int)
+    if not 1 <= months <= MAX_ANALYTICS_MONTHS or not 1 <= window <= 12:
+        return jsonify({"msg": f"months must be 1-{MAX_ANALYTICS_MONTHS} and window 1-12"}), 400
+    try:
+        return jsonify(analytics.report(current_user_id, months, window))
+    except Exception as e:
+        logger.error(f"Error building analytics for user {current_user_id}: {str(e)}")
+        return jsonify({"msg": "Failed to build analytics"}), 500
 
 # Remove or update old routes if they are no longer needed or clash
 # For example, remove the old '/expense-income' if '/income-vs-expense' replaces it
@@ -306,7 +233,4 @@ def get_spending_trends():
 # def get_spending_trends():
 #     ...
 
-# @bp.route('/export', methods=['GET'])
-# @jwt_required()
-# def export_report():
-#     ...
\ No newline at end of file
+# Report exports live in routes/export.py (/api/export/reports/<name>)
\ No newline at end of file
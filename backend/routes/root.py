@@ -1,11 +1,42 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_current_user
+from functools import wraps
+from services.response_cache import cache_stats
+from services.jobs import job_states
 
 bp = Blueprint("root", __name__)
 
+def admin_required(view):
+    """Limit an operational endpoint to the users listed in ADMIN_EMAILS.
+
+    Apply below @jwt_required(). With ADMIN_EMAILS unset nobody qualifies, and
+    the CLI (flask scheduler status, ...) remains the way in.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user = get_current_user()
+        if user is None or user.email.lower() not in current_app.config['ADMIN_EMAILS']:
+            return jsonify({"msg": "Admin access required"}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
 @bp.route("/")
 def index():
     return jsonify({
         "message": "Welcome to Expense Tracker API",
         "status": "running",
         "version": "1.0.0"
-    }) 
\ No newline at end of file
+    })
+
+@bp.route("/api/cache/stats")
+@jwt_required()
+@admin_required
+def get_cache_stats():
+    return jsonify(cache_stats())
+
+@bp.route("/api/scheduler/jobs")
+@jwt_required()
+@admin_required
+def get_scheduler_jobs():
+    """Leases and the last run time/duration published by each scheduled job."""
+    return jsonify(job_states())
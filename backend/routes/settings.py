@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from models.user import User
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_current_user
+from services.response_cache import etag_response
+from services.serializers import serialize_settings
 from models.settings import Settings
 from extensions import db
 import logging
@@ -32,7 +33,7 @@ def upload_profile_picture():
             
         if file and allowed_file(file.filename):
             user_id = get_jwt_identity()
-            user = User.query.get(user_id)
+            user = get_current_user()
             
             if not user:
                 return jsonify({"error": "User not found"}), 404
@@ -70,7 +71,7 @@ def update_profile():
         logger.info(f"Updating profile for user {user_id}")
         
         data = request.json
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user:
             return jsonify({"error": "User not found"}), 404
@@ -134,7 +135,7 @@ def update_security():
         return jsonify({
             "status": "success",
             "message": "Security settings updated successfully",
-            "data": settings.to_dict()
+            "data": serialize_settings(settings)
         })
     except Exception as e:
         logger.error(f"Error in update_security: {str(e)}")
@@ -174,7 +175,7 @@ def update_preferences():
         return jsonify({
             "status": "success",
             "message": "Preferences updated successfully",
-            "data": settings.to_dict()
+            "data": serialize_settings(settings)
         })
     except Exception as e:
         logger.error(f"Error in update_preferences: {str(e)}")
@@ -218,7 +219,7 @@ def update_currency():
         return jsonify({
             "status": "success",
             "message": "Currency settings updated successfully",
-            "data": settings.to_dict()
+            "data": serialize_settings(settings)
         })
     except Exception as e:
         logger.error(f"Error in update_currency: {str(e)}")
@@ -258,7 +259,7 @@ def update_notifications():
         return jsonify({
             "status": "success",
             "message": "Notification settings updated successfully",
-            "data": settings.to_dict()
+            "data": serialize_settings(settings)
         })
     except Exception as e:
         logger.error(f"Error in update_notifications: {str(e)}")
@@ -271,12 +272,13 @@ def update_notifications():
 # Get All Settings
 @settings_bp.route('/', methods=['GET'])
 @jwt_required()
+@etag_response
 def get_settings():
     try:
         user_id = get_jwt_identity()
         logger.info(f"Fetching settings for user {user_id}")
         
-        user = User.query.get(user_id)
+        user = get_current_user()
         if not user:
             return jsonify({"error": "User not found"}), 404
             
@@ -290,7 +292,7 @@ def get_settings():
         # Combine user profile data with settings
         response_data = {
             **user.to_dict(),
-            **settings.to_dict()
+            **serialize_settings(settings)
         }
         
         return jsonify({
@@ -310,7 +312,7 @@ def get_settings():
 def delete_account():
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = get_current_user()
         if not user:
             return jsonify({"message": "User not found"}), 404
 
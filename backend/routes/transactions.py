@@ -1,47 +1,85 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from services.response_cache import etag_response
+from services.serializers import serialize_transaction
 from models import Transaction, Category # Models only
 from extensions import db # Extensions here
+from services.aggregates import LedgerEntry, snapshot, apply_ledger_changes
+from services.pagination import keyset_page, page_size_arg
+from services.streaming import wants_stream, stream_rows
+from services.read_models import TransactionRow, transaction_select, fetch
 from datetime import datetime
+from sqlalchemy import insert, update, delete, func
+from services import importers
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 transactions_bp = Blueprint('transactions', __name__)
 
+BATCH_MAX_IDS = 10000
+# Criteria a batch filter may combine; at least one is required
+BATCH_FILTER_KEYS = ('category_id', 'type', 'start_date', 'end_date')
+
+def transaction_list_query(user_id, args):
+    """The listing's filtered select: ?category=, ?type=, ?start_date=, ?end_date=."""
+    # Base query: plain columns with the category name joined, no ORM entities
+    query = transaction_select(user_id)
+    
+    # Apply filters
+    category_id = args.get('category')
+    transaction_type = args.get('type')
+    start_date = args.get('start_date')
+    end_date = args.get('end_date')
+    if category_id:
+        query = query.where(Transaction.category_id == category_id)
+    if transaction_type:
+        query = query.where(Transaction.type == transaction_type)
+    if start_date:
+        query = query.where(Transaction.date >= datetime.strptime(start_date, '%Y-%m-%d').date())
+    if end_date:
+        query = query.where(Transaction.date <= datetime.strptime(end_date, '%Y-%m-%d').date())
+    return query
+
 @transactions_bp.route('', methods=['GET'])
 @jwt_required()
+@etag_response
 def get_transactions():
     try:
         user_id = get_jwt_identity()
         
         # Get query parameters
-        category_id = request.args.get('category')
-        transaction_type = request.args.get('type')
-        start_date = request.args.get('start_date')
-        end_date = request.args.get('end_date')
         limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        page_size = request.args.get('page_size', type=int)
         
-        # Base query
-        query = Transaction.query.filter_by(user_id=user_id)
-        
-        # Apply filters
-        if category_id:
-            query = query.filter_by(category_id=category_id)
-        if transaction_type:
-            query = query.filter_by(type=transaction_type)
-        if start_date:
-            query = query.filter(Transaction.date >= datetime.strptime(start_date, '%Y-%m-%d').date())
-        if end_date:
-            query = query.filter(Transaction.date <= datetime.strptime(end_date, '%Y-%m-%d').date())
+        query = transaction_list_query(user_id, request.args)
             
+        # Keyset pagination: opt in with page_size and/or cursor
+        if cursor or page_size is not None:
+            try:
+                transactions, next_cursor = keyset_page(
+                    query, Transaction.date, Transaction.id, cursor, page_size_arg(page_size)
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            return jsonify({
+                'transactions': [TransactionRow(row).to_dict() for row in transactions],
+                'next_cursor': next_cursor
+            })
+
         # Order by date
         query = query.order_by(Transaction.date.desc())
         
         # Apply limit
         if limit:
             query = query.limit(limit)
+
+        # Large histories: stream from a server-side cursor instead of building the list
+        if wants_stream():
+            return stream_rows(query, lambda row: TransactionRow(row).to_dict())
             
-        transactions = query.all()
+        transactions = fetch(query, TransactionRow)
         return jsonify([transaction.to_dict() for transaction in transactions])
         
     except Exception as e:
@@ -85,18 +123,20 @@ def add_transaction():
         type=transaction_type
     )
     db.session.add(new_transaction)
+    apply_ledger_changes(added=[new_transaction])
     db.session.commit()
 
-    return jsonify(new_transaction.to_dict()), 201
+    return jsonify(serialize_transaction(new_transaction)), 201
 
 @transactions_bp.route('/<int:transaction_id>', methods=['GET'])
 @jwt_required()
+@etag_response
 def get_transaction(transaction_id):
     current_user_id = get_jwt_identity()
     transaction = Transaction.query.filter_by(id=transaction_id, user_id=current_user_id).first()
     if not transaction:
         return jsonify({"msg": "Transaction not found"}), 404
-    return jsonify(transaction.to_dict())
+    return jsonify(serialize_transaction(transaction))
 
 @transactions_bp.route('/<int:transaction_id>', methods=['PUT'])
 @jwt_required()
@@ -107,6 +147,7 @@ def update_transaction(transaction_id):
         return jsonify({"msg": "Transaction not found"}), 404
 
     data = request.get_json()
+    before = snapshot(transaction)
     
     if 'amount' in data:
         try:
@@ -130,8 +171,9 @@ def update_transaction(transaction_id):
             return jsonify({"msg": "Invalid transaction type"}), 400
         transaction.type = data['type']
 
+    apply_ledger_changes(removed=[before], added=[transaction])
     db.session.commit()
-    return jsonify(transaction.to_dict())
+    return jsonify(serialize_transaction(transaction))
 
 @transactions_bp.route('/<int:transaction_id>', methods=['DELETE'])
 @jwt_required()
@@ -141,6 +183,232 @@ def delete_transaction(transaction_id):
     if not transaction:
         return jsonify({"msg": "Transaction not found"}), 404
 
+    apply_ledger_changes(removed=[transaction])
     db.session.delete(transaction)
     db.session.commit()
-    return jsonify({"msg": "Transaction deleted successfully"})
\ No newline at end of file
+    return jsonify({"msg": "Transaction deleted successfully"})
+
+@transactions_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_transactions():
+    current_user_id = int(get_jwt_identity())
+    upload = request.files.get('file')
+    if not upload or upload.filename == '':
+        return jsonify({"msg": "No file uploaded"}), 400
+
+    try:
+        fmt = importers.detect_format(upload.filename, request.form.get('format'))
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    batch_size = request.form.get('batch_size', type=int) or current_app.config['IMPORT_BATCH_SIZE']
+    batch_size = max(1, min(batch_size, current_app.config['IMPORT_MAX_BATCH_SIZE']))
+    max_errors = current_app.config['IMPORT_MAX_REPORTED_ERRORS']
+
+    # Resolve categories once per file instead of once per row
+    category_ids = {}
+    category_names = {}
+    for category_id, name in db.session.query(Category.id, Category.name).filter_by(user_id=current_user_id):
+        category_ids[str(category_id)] = category_id
+        category_names[name.lower()] = category_id
+
+    default_category_id = request.form.get('default_category_id')
+    if default_category_id:
+        default_category_id = category_ids.get(default_category_id)
+        if default_category_id is None:
+            return jsonify({"msg": "Default category not found or does not belong to user"}), 404
+
+    started = time.perf_counter()
+    imported = 0
+    failed = 0
+    batches = 0
+    errors = []
+    batch = []
+
+    def flush():
+        db.session.execute(insert(Transaction), batch)
+        apply_ledger_changes(added=[
+            LedgerEntry(current_user_id, row['category_id'], row['type'], row['date'], row['amount'])
+            for row in batch
+        ], bulk=True)
+        db.session.commit()
+
+    try:
+        for line_number, raw in importers.iter_rows(upload, fmt):
+            try:
+                row = importers.normalize_row(raw, category_ids, category_names, default_category_id)
+            except importers.ImportRowError as e:
+                failed += 1
+                if len(errors) < max_errors:
+                    errors.append({"line": line_number, "error": str(e)})
+                continue
+
+            row['user_id'] = current_user_id
+            batch.append(row)
+            if len(batch) >= batch_size:
+                flush()
+                imported += len(batch)
+                batches += 1
+                batch = []
+
+        if batch:
+            flush()
+            imported += len(batch)
+            batches += 1
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error importing transactions for user {current_user_id}: {str(e)}")
+        return jsonify({
+            "msg": "Import failed",
+            "imported": imported,
+            "failed": failed,
+            "errors": errors
+        }), 500
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Imported {imported} transactions for user {current_user_id} in {elapsed:.2f}s ({failed} rejected)")
+    return jsonify({
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+        "batches": batches,
+        "batch_size": batch_size,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(imported / elapsed, 1) if elapsed > 0 else None
+    }), 201 if imported else 400
+
+
+def batch_scope(user_id, data):
+    """WHERE clauses for a batch request: an explicit id list or a filter object."""
+    scope = [Transaction.user_id == user_id]
+    if 'ids' in data:
+        ids = data['ids']
+        if not isinstance(ids, list) or not ids:
+            raise ValueError("ids must be a non-empty list")
+        if len(ids) > BATCH_MAX_IDS:
+            raise ValueError(f"At most {BATCH_MAX_IDS} ids per request")
+        scope.append(Transaction.id.in_([int(i) for i in ids]))
+    elif isinstance(data.get('filter'), dict):
+        criteria = data['filter']
+        unknown = sorted(set(criteria) - set(BATCH_FILTER_KEYS))
+        if unknown:
+            raise ValueError(f"Unknown filter keys: {', '.join(unknown)}")
+        criteria = {key: value for key, value in criteria.items() if value not in (None, '')}
+        # An empty filter would match the user's whole ledger
+        if not criteria:
+            raise ValueError(f"filter needs at least one of: {', '.join(BATCH_FILTER_KEYS)}")
+        if 'category_id' in criteria:
+            scope.append(Transaction.category_id == int(criteria['category_id']))
+        if 'type' in criteria:
+            if criteria['type'] not in ['income', 'expense']:
+                raise ValueError("type must be income or expense")
+            scope.append(Transaction.type == criteria['type'])
+        if 'start_date' in criteria:
+            scope.append(Transaction.date >= datetime.strptime(criteria['start_date'], '%Y-%m-%d').date())
+        if 'end_date' in criteria:
+            scope.append(Transaction.date <= datetime.strptime(criteria['end_date'], '%Y-%m-%d').date())
+    else:
+        raise ValueError("Provide either ids or filter")
+    return scope
+
+
+def grouped_ledger_entries(user_id, scope):
+    """Affected rows collapsed per (category, type, date) for aggregate bookkeeping."""
+    rows = db.session.query(
+        Transaction.category_id,
+        Transaction.type,
+        Transaction.date,
+        func.sum(Transaction.amount),
+        func.count(Transaction.id)
+    ).filter(*scope).group_by(Transaction.category_id, Transaction.type, Transaction.date).all()
+    return [
+        LedgerEntry(user_id, category_id, txn_type, day, total or 0.0, count)
+        for category_id, txn_type, day, total, count in rows
+    ]
+
+
+@transactions_bp.route('/batch', methods=['PUT'])
+@jwt_required()
+def batch_update_transactions():
+    current_user_id = int(get_jwt_identity())
+    data = request.get_json() or {}
+    changes = data.get('changes') or {}
+
+    values = {}
+    try:
+        scope = batch_scope(current_user_id, data)
+        if 'amount' in changes:
+            values['amount'] = float(changes['amount'])
+        if 'date' in changes:
+            values['date'] = datetime.strptime(changes['date'], '%Y-%m-%d').date()
+        if 'type' in changes:
+            if changes['type'] not in ['income', 'expense']:
+                return jsonify({"msg": "Invalid transaction type"}), 400
+            values['type'] = changes['type']
+        if 'description' in changes:
+            values['description'] = changes['description']
+        if 'category_id' in changes:
+            values['category_id'] = int(changes['category_id'])
+    except (ValueError, TypeError) as e:
+        return jsonify({"msg": f"Invalid batch request: {e}"}), 400
+
+    if not values:
+        return jsonify({"msg": "No changes provided"}), 400
+    if 'category_id' in values:
+        category = Category.query.filter_by(id=values['category_id'], user_id=current_user_id).first()
+        if not category:
+            return jsonify({"msg": "Category not found or does not belong to user"}), 404
+
+    try:
+        before = grouped_ledger_entries(current_user_id, scope)
+        result = db.session.execute(
+            update(Transaction).where(*scope).values(**values, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        # Derive the post-update groups from the pre-update ones instead of re-reading
+        after = [
+            entry._replace(
+                category_id=values.get('category_id', entry.category_id),
+                type=values.get('type', entry.type),
+                date=values.get('date', entry.date),
+                amount=values['amount'] * entry.count if 'amount' in values else entry.amount
+            )
+            for entry in before
+        ]
+        apply_ledger_changes(removed=before, added=after, bulk=True)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Batch update failed for user {current_user_id}: {str(e)}")
+        return jsonify({"msg": "Failed to update transactions"}), 500
+
+    logger.info(f"Batch updated {result.rowcount} transactions for user {current_user_id}")
+    return jsonify({"updated": result.rowcount})
+
+
+@transactions_bp.route('/batch', methods=['DELETE'])
+@jwt_required()
+def batch_delete_transactions():
+    current_user_id = int(get_jwt_identity())
+    data = request.get_json() or {}
+
+    try:
+        scope = batch_scope(current_user_id, data)
+    except (ValueError, TypeError) as e:
+        return jsonify({"msg": f"Invalid batch request: {e}"}), 400
+
+    try:
+        before = grouped_ledger_entries(current_user_id, scope)
+        result = db.session.execute(
+            delete(Transaction).where(*scope).execution_options(synchronize_session=False)
+        )
+        apply_ledger_changes(removed=before, bulk=True)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Batch delete failed for user {current_user_id}: {str(e)}")
+        return jsonify({"msg": "Failed to delete transactions"}), 500
+
+    logger.info(f"Batch deleted {result.rowcount} transactions for user {current_user_id}")
+    return jsonify({"deleted": result.rowcount})
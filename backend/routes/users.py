@@ -1,7 +1,6 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_current_user
 from extensions import db
-from models.user import User
 
 users_bp = Blueprint('users', __name__)
 
@@ -9,8 +8,7 @@ users_bp = Blueprint('users', __name__)
 @jwt_required()
 def get_user_profile():
     """Get the current user's profile"""
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = get_current_user()
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -21,8 +19,7 @@ def get_user_profile():
 @jwt_required()
 def update_user_profile():
     """Update the current user's profile"""
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = get_current_user()
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -49,8 +46,7 @@ def update_user_profile():
 @jwt_required()
 def delete_user_profile():
     """Delete the current user's profile"""
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = get_current_user()
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -1,29 +1,141 @@
+"""APScheduler wiring with a single leader across processes.
+
+Every worker calling init_scheduler() joins an election on the
+'scheduler-leader' lease row in job_state; only the holder runs a
+BackgroundScheduler, and a standby takes over once the lease lapses. Jobs live
+in a SQLAlchemyJobStore so next run times survive restarts and handovers:
+coalesce plus misfire_grace_time turns any runs missed while no leader was up
+into at most one catch-up run. Each run also takes a per-job lease, so a run
+can't overlap with one still going on a previous leader, and publishes its
+start time and duration to job_state.
+"""
+
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.schedulers import SchedulerNotRunningError
-from tasks import check_budget_alerts, generate_daily_reports, cleanup_old_notifications
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+import tasks
+from extensions import db
+from services import jobs
+from datetime import datetime
+import atexit
+import os
+import socket
+import threading
+import time
+import uuid
 import logging
 
 logger = logging.getLogger(__name__)
-scheduler = BackgroundScheduler()
 
-def init_scheduler(app):
-    # Add jobs
-    scheduler.add_job(func=check_budget_alerts, trigger="interval", hours=24, id="Check budget alerts")
-    scheduler.add_job(func=generate_daily_reports, trigger="interval", hours=24, id="Generate daily reports")
-    scheduler.add_job(func=cleanup_old_notifications, trigger="interval", hours=24, id="Cleanup old notifications")
-    
-    # Start the scheduler
-    scheduler.start()
-    logger.info("Scheduler started successfully")
-    
-    # Register shutdown handler
-    @app.teardown_appcontext
-    def shutdown_scheduler(exception=None):
+LEADER_LEASE = 'scheduler-leader'
+# This process's identity in lease rows
+OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# job id -> (task name in tasks.py, trigger arguments)
+JOBS = {
+    'Check budget alerts': ('check_budget_alerts', {'trigger': 'interval', 'hours': 24}),
+    'Detect transaction anomalies': ('detect_transaction_anomalies', {'trigger': 'interval', 'hours': 24}),
+    'Generate daily reports': ('generate_daily_reports', {'trigger': 'interval', 'hours': 24}),
+    'Apply retention policies': ('apply_retention_policies', {'trigger': 'interval', 'hours': 24}),
+    'Reconcile budget spend': ('reconcile_budget_spend', {'trigger': 'interval', 'hours': 24}),
+}
+
+scheduler = None  # The running BackgroundScheduler while this process leads
+_app = None
+_stop = threading.Event()
+_election = None
+
+
+def run_job(name, app=None):
+    """Entry point for every stored job; only the task name is persisted."""
+    app = app or _app
+    with app.app_context():
+        if not jobs.acquire_lease(name, OWNER, app.config['SCHEDULER_JOB_LEASE_SECONDS']):
+            logger.warning(f"Skipping {name}: a previous run still holds its lease")
+            return
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
         try:
-            if scheduler.running:
-                scheduler.shutdown()
-                logger.info("Scheduler shut down successfully")
-        except SchedulerNotRunningError:
-            pass  # Ignore if scheduler is already stopped
+            getattr(tasks, name)()
+        finally:
+            jobs.record_run(name, started_at, time.perf_counter() - started)
+            jobs.release_lease(name, OWNER)
+
+
+def _start_leading(app):
+    global scheduler
+    with app.app_context():
+        engine = db.engine
+    scheduler = BackgroundScheduler(
+        jobstores={'default': SQLAlchemyJobStore(engine=engine, tablename='apscheduler_jobs')},
+        job_defaults={
+            'coalesce': True,
+            'max_instances': 1,
+            'misfire_grace_time': app.config['SCHEDULER_MISFIRE_GRACE_SECONDS']
+        },
+        timezone='UTC'
+    )
+    # Start paused so stored jobs are visible before anything can fire
+    scheduler.start(paused=True)
+    stored = {job.id for job in scheduler.get_jobs()}
+    for job_id in stored - set(JOBS):
+        scheduler.remove_job(job_id)
+    for job_id, (name, trigger) in JOBS.items():
+        if job_id not in stored:
+            # Existing jobs keep their persisted next run time
+            scheduler.add_job(run_job, args=[name], id=job_id, name=job_id, **trigger)
+    scheduler.resume()
+    logger.info(f"Scheduler started successfully (leader {OWNER})")
+
+
+def _stop_leading():
+    global scheduler
+    if scheduler is None:
+        return
+    try:
+        scheduler.shutdown(wait=False)
+        logger.info("Scheduler shut down successfully")
+    except Exception as e:
+        logger.error(f"Error shutting down scheduler: {str(e)}")
+    scheduler = None
+
+
+def _elect(app):
+    ttl = app.config['SCHEDULER_LEASE_SECONDS']
+    while not _stop.is_set():
+        try:
+            with app.app_context():
+                leading = jobs.acquire_lease(LEADER_LEASE, OWNER, ttl)
+        except Exception as e:
+            logger.error(f"Scheduler lease renewal failed: {str(e)}")
+            leading = False
+        if leading and scheduler is None:
+            _start_leading(app)
+        elif not leading and scheduler is not None:
+            logger.warning("Scheduler leadership lost; standing by")
+            _stop_leading()
+        # Renew well inside the lease so a slow round trip can't let it lapse
+        _stop.wait(ttl / 3)
+
+
+def shutdown_scheduler():
+    _stop.set()
+    was_leading = scheduler is not None
+    _stop_leading()
+    if was_leading and _app is not None:
+        try:
+            with _app.app_context():
+                jobs.release_lease(LEADER_LEASE, OWNER)
         except Exception as e:
-            logger.error(f"Error shutting down scheduler: {str(e)}") 
\ No newline at end of file
+            logger.error(f"Error releasing scheduler lease: {str(e)}")
+
+
+def init_scheduler(app):
+    """Join the scheduler election; safe to call from every worker process."""
+    global _app, _election
+    if _election is not None:
+        return
+    _app = app
+    _stop.clear()
+    _election = threading.Thread(target=_elect, args=(app,), name='scheduler-election', daemon=True)
+    _election.start()
+    atexit.register(shutdown_scheduler)
@@ -0,0 +1,58 @@
+from collections import defaultdict, namedtuple
+from extensions import db
+from services import rollups, budget_spend, forecasting
+from services.response_cache import mark_user_changed
+
+# The fields of a transaction that derived aggregates depend on. `count` lets one
+# entry stand for a pre-grouped set of rows (amount is then their total).
+LedgerEntry = namedtuple('LedgerEntry', ['user_id', 'category_id', 'type', 'date', 'amount', 'count'], defaults=(1,))
+
+
+def snapshot(transaction):
+    """Capture a transaction's aggregate-relevant state before it is modified."""
+    return LedgerEntry(
+        int(transaction.user_id),
+        int(transaction.category_id),
+        transaction.type,
+        transaction.date,
+        float(transaction.amount)
+    )
+
+
+def apply_ledger_changes(removed=(), added=(), bulk=False):
+    """Keep monthly rollups and Budget.spent in step with ledger writes.
+
+    `removed` and `added` are LedgerEntry tuples (or transactions) that left and
+    entered the ledger; an update is the old snapshot removed plus the new one added.
+    Must be called before the session commits so both land in one DB transaction.
+
+    With `bulk=True` (imports, batch edits) budgets are recomputed once per
+    touched user/category instead of incremented once per distinct date.
+    """
+    deltas = defaultdict(lambda: [0.0, 0])
+    spend_deltas = defaultdict(float)
+    for sign, entries in ((-1, removed), (1, added)):
+        for entry in entries:
+            if not isinstance(entry, LedgerEntry):
+                entry = snapshot(entry)
+            key = (entry.user_id, entry.category_id, entry.type, rollups.month_key(entry.date))
+            deltas[key][0] += sign * entry.amount
+            deltas[key][1] += sign * entry.count
+            if entry.type == 'expense':
+                spend_deltas[(entry.user_id, entry.category_id, entry.date)] += sign * entry.amount
+
+    rollups.apply_deltas({key: tuple(value) for key, value in deltas.items()})
+    # Core writes bypass the flush hook, so invalidate cached views explicitly.
+    for user_id in {key[0] for key in deltas}:
+        mark_user_changed(db.session, user_id)
+    touched = defaultdict(set)
+    for user_id, category_id, _ in spend_deltas:
+        touched[user_id].add(category_id)
+    for user_id, category_ids in touched.items():
+        forecasting.mark_categories_changed(db.session, user_id, category_ids)
+    if not bulk:
+        budget_spend.apply_spend_deltas(spend_deltas)
+        return
+
+    for user_id, category_ids in touched.items():
+        budget_spend.recalculate_budget_spend(user_id, sorted(category_ids))
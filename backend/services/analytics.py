@@ -0,0 +1,197 @@
+"""Vectorized monthly metrics behind /api/reports/analytics.
+
+Built for long series (up to 120 months) where every metric is
+needed at once. The summary and trend reports in routes/reports.py keep their
+plain loops: they fold at most 12 buckets, at week/day/quarter granularity as
+well as month, and `flask bench-analytics` puts this path's fixed pandas/NumPy
+cost (~2 ms) at about 10x their loop time at that size.
+"""
+
+from services import rollups, bucketing
+import numpy as np
+import pandas as pd
+import time
+
+# Extra months loaded before the requested window so rolling means and
+# year-over-year deltas are defined from its first month.
+HISTORY_MONTHS = 12
+
+
+def load_monthly_frame(user_id, start, end):
+    """(month, type, category, total) rollup rows for [start, end] as one DataFrame."""
+    rows = rollups.totals_by_month_type_category(user_id, rollups.month_key(start), rollups.month_key(end))
+    frame = pd.DataFrame(rows, columns=['month', 'type', 'category', 'total'])
+    frame['total'] = frame['total'].astype(float)
+    return frame
+
+
+def month_positions(frame, months):
+    """Row -> position of its month in `months` (a PeriodIndex); -1 outside it."""
+    return pd.Index(months.astype(str)).get_indexer(frame['month'])
+
+
+def monthly_series(frame, months, positions=None):
+    """(income, expense) arrays per month over `months`, zero-filled."""
+    positions = month_positions(frame, months) if positions is None else positions
+    totals = frame['total'].to_numpy(dtype=float)
+    types = frame['type'].to_numpy()
+    inside = positions >= 0
+
+    def sums(txn_type):
+        mask = inside & (types == txn_type)
+        return np.bincount(positions[mask], weights=totals[mask], minlength=len(months)).astype(float, copy=False)
+
+    return sums('income'), sums('expense')
+
+
+def category_shares(frame, months, positions=None):
+    """(categories, months x categories matrix of each category's share of that month's spend)."""
+    positions = month_positions(frame, months) if positions is None else positions
+    mask = (positions >= 0) & (frame['type'].to_numpy() == 'expense')
+    codes, categories = pd.factorize(frame['category'].to_numpy()[mask], sort=True)
+    cells = np.bincount(
+        positions[mask] * len(categories) + codes,
+        weights=frame['total'].to_numpy(dtype=float)[mask],
+        minlength=len(months) * len(categories)
+    )
+    matrix = cells.astype(float, copy=False).reshape(len(months), len(categories))
+    totals = matrix.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = np.where(totals > 0, matrix / totals, 0.0)
+    return list(categories), shares
+
+
+def rolling_mean(values, window):
+    """Trailing mean over up to `window` values (fewer at the start), via one cumsum."""
+    cumulative = np.cumsum(np.concatenate(([0.0], values)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+
+def pct_change(values, periods):
+    """Percent change against `periods` months earlier; NaN where undefined."""
+    previous = np.full(len(values), np.nan)
+    previous[periods:] = values[:-periods]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(previous > 0, (values - previous) / previous * 100, np.nan)
+
+
+def compute(income, expense, window=3):
+    """All report metrics for monthly income/expense arrays, as whole-array operations."""
+    savings = income - expense
+    with np.errstate(divide='ignore', invalid='ignore'):
+        savings_rate = np.where(income > 0, savings / income * 100, 0.0)
+
+    return {
+        'income': income,
+        'expense': expense,
+        'savings': savings,
+        'savings_rate': savings_rate,
+        'cumulative_savings': np.cumsum(savings),
+        'income_rolling': rolling_mean(income, window),
+        'expense_rolling': rolling_mean(expense, window),
+        'income_mom': pct_change(income, 1),
+        'expense_mom': pct_change(expense, 1),
+        'income_yoy': pct_change(income, 12),
+        'expense_yoy': pct_change(expense, 12),
+    }
+
+
+def to_json_list(values, digits=2):
+    """Round an array and turn NaN (undefined deltas) into None."""
+    rounded = np.round(np.asarray(values, dtype=float), digits)
+    return [None if np.isnan(value) else float(value) for value in rounded]
+
+
+def report(user_id, months=12, window=3, today=None):
+    """Monthly analytics for the last `months` months, from one rollup query.
+
+    Cumulative savings start at the first month of the window; rolling means
+    and year-over-year deltas also use the HISTORY_MONTHS before it.
+    """
+    today = today or bucketing.user_today(user_id)
+    start, end = bucketing.window('month', months + HISTORY_MONTHS, today)
+    periods = pd.period_range(start=start, end=end, freq='M')
+
+    frame = load_monthly_frame(user_id, start, end)
+    positions = month_positions(frame, periods)
+    metrics = compute(*monthly_series(frame, periods, positions), window)
+    visible = slice(len(periods) - months, None)
+    metrics = {name: values[visible] for name, values in metrics.items()}
+    metrics['cumulative_savings'] = np.cumsum(metrics['savings'])
+
+    categories, shares = category_shares(frame, periods, positions)
+    return {
+        'months': [str(period) for period in periods[visible]],
+        'window': window,
+        **{name: to_json_list(values) for name, values in metrics.items()},
+        'category_share': {
+            'categories': categories,
+            'matrix': [to_json_list(row, 4) for row in shares[visible]]
+        }
+    }
+
+
+def _loop_report(rows, months):
+    """compute() and category_shares() as per-row Python loops, the way the trend reports fold buckets."""
+    income, expense, shares = {}, {}, {}
+    for month, txn_type, category, total in rows:
+        target = income if txn_type == 'income' else expense
+        target[month] = target.get(month, 0) + total
+        if txn_type == 'expense':
+            shares.setdefault(month, {})
+            shares[month][category] = shares[month].get(category, 0) + total
+    result, cumulative, prev = [], 0.0, None
+    for i, month in enumerate(months):
+        inc, exp = income.get(month, 0), expense.get(month, 0)
+        savings = inc - exp
+        cumulative += savings
+        change = None if not prev else (exp - prev) / prev * 100
+        yoy_prev = expense.get(months[i - 12], 0) if i >= 12 else 0
+        yoy = None if not yoy_prev else (exp - yoy_prev) / yoy_prev * 100
+        recent = [expense.get(m, 0) for m in months[max(0, i - 2):i + 1]]
+        month_total = sum(shares.get(month, {}).values())
+        share = {c: (v / month_total if month_total else 0) for c, v in shares.get(month, {}).items()}
+        result.append((inc, exp, savings, savings / inc * 100 if inc > 0 else 0, cumulative,
+                       change, yoy, sum(recent) / len(recent), share))
+        prev = exp
+    return result
+
+
+def benchmark_reports(month_counts=(12, 120, 1200), categories=20, repeat=3):
+    """Time the vectorized metrics against the old loops on synthetic rollup rows.
+
+    Returns {months: {variant: best seconds}}.
+    """
+    rng = np.random.default_rng(0)
+    results = {}
+    for count in month_counts:
+        periods = pd.period_range(end=pd.Period('2024-12', freq='M'), periods=count, freq='M')
+        months = [str(period) for period in periods]
+        rows = [(month, 'income', 'Salary', float(rng.uniform(3000, 5000))) for month in months]
+        rows += [
+            (month, 'expense', f'Category {c}', float(rng.uniform(10, 500)))
+            for month in months for c in range(categories)
+        ]
+
+        def vectorized():
+            frame = pd.DataFrame(rows, columns=['month', 'type', 'category', 'total'])
+            positions = month_positions(frame, periods)
+            compute(*monthly_series(frame, periods, positions))
+            category_shares(frame, periods, positions)
+
+        variants = {
+            'loops': lambda: _loop_report(rows, months),
+            'vectorized': vectorized,
+        }
+        results[count] = {}
+        for name, run in variants.items():
+            best = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                run()
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            results[count][name] = best
+    return results
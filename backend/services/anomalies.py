@@ -0,0 +1,148 @@
+"""Flag expenses far above a user's typical spend in that category.
+
+One pass over the whole user base: one query loads the recent transactions to
+score, one loads the expense history of every (user, category) pair they touch,
+and the per-pair median/MAD statistics and robust z-scores are computed on NumPy
+arrays. Flags become Notification rows in a single bulk INSERT.
+"""
+
+from extensions import db
+from models import Transaction, Category
+from models.notification import Notification
+from sqlalchemy import and_, insert, select
+from services.bucketing import date_range
+from datetime import datetime, timedelta
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_TYPE = 'anomaly'
+HISTORY_DAYS = 365
+MIN_HISTORY = 5
+# Iglewicz-Hoaglin cut-off for the modified z-score
+Z_THRESHOLD = 3.5
+# 0.6745 is the 75th percentile of the standard normal: MAD / 0.6745 estimates sigma
+MAD_SCALE = 0.6745
+# Used instead when over half a pair's history is one repeated amount (MAD == 0)
+MEAN_AD_SCALE = 0.7979
+
+
+def pair_keys(user_ids, category_ids):
+    """One int64 key per (user, category) so pairs can be grouped and searched as arrays."""
+    return (np.asarray(user_ids, dtype=np.int64) << 32) | np.asarray(category_ids, dtype=np.int64)
+
+
+def _group_medians(groups, values, count):
+    """Median of `values` within each of `count` groups (labels 0..count-1, all non-empty)."""
+    order = np.lexsort((values, groups))
+    sorted_values = values[order]
+    sizes = np.bincount(groups, minlength=count)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    low = starts + (sizes - 1) // 2
+    high = starts + sizes // 2
+    return (sorted_values[low] + sorted_values[high]) / 2
+
+
+def robust_stats(keys, amounts):
+    """(unique pair keys, history sizes, medians, sigma estimates) per pair."""
+    pairs, groups, sizes = np.unique(keys, return_inverse=True, return_counts=True)
+    medians = _group_medians(groups, amounts, len(pairs))
+    deviations = np.abs(amounts - medians[groups])
+    mad = _group_medians(groups, deviations, len(pairs))
+    mean_ad = np.bincount(groups, weights=deviations, minlength=len(pairs)) / sizes
+    sigma = np.where(mad > 0, mad / MAD_SCALE, mean_ad / MEAN_AD_SCALE)
+    return pairs, sizes, medians, sigma
+
+
+def score(candidate_keys, candidate_amounts, pairs, sizes, medians, sigma):
+    """(robust z-scores, pair index) per candidate; z is NaN when its pair has too little history."""
+    index = np.clip(np.searchsorted(pairs, candidate_keys), 0, len(pairs) - 1)
+    known = (pairs[index] == candidate_keys) & (sizes[index] >= MIN_HISTORY) & (sigma[index] > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(known, (candidate_amounts - medians[index]) / sigma[index], np.nan)
+    return z, index
+
+
+def _already_flagged(since):
+    rows = db.session.execute(
+        select(Notification.notification_data).where(
+            Notification.type == NOTIFICATION_TYPE,
+            Notification.created_at >= since
+        )
+    ).scalars()
+    return {data.get('transaction_id') for data in rows if data}
+
+
+def candidates_query(since):
+    """Expenses recorded since `since`, for every user, with their category name."""
+    return (
+        select(Transaction.id, Transaction.user_id, Transaction.category_id, Transaction.amount,
+               Transaction.date, Category.name)
+        .join(Category, Category.id == Transaction.category_id)
+        .where(Transaction.type == 'expense', Transaction.created_at >= since)
+    )
+
+
+def history_query(since, now):
+    """Earlier expense amounts of just the (user, category) pairs recorded since `since`."""
+    touched = select(Transaction.user_id, Transaction.category_id).where(
+        Transaction.type == 'expense', Transaction.created_at >= since
+    ).distinct().subquery()
+    return (
+        select(Transaction.user_id, Transaction.category_id, Transaction.amount)
+        .join(touched, and_(touched.c.user_id == Transaction.user_id,
+                            touched.c.category_id == Transaction.category_id))
+        .where(
+            Transaction.type == 'expense',
+            Transaction.created_at < since,
+            *date_range(Transaction.date, now.date() - timedelta(days=HISTORY_DAYS))
+        )
+    )
+
+
+def detect_anomalies(since, now=None):
+    """Score expenses recorded since `since` and notify on outliers; returns the count flagged."""
+    now = now or datetime.utcnow()
+    candidates = db.session.execute(candidates_query(since)).all()
+    flagged = _already_flagged(since)
+    candidates = [row for row in candidates if row.id not in flagged]
+    if not candidates:
+        return 0
+
+    # History of just the pairs being scored, for every user at once
+    history = db.session.execute(history_query(since, now)).all()
+    if not history:
+        return 0
+
+    user_ids, category_ids, amounts = (np.array(column) for column in zip(*history))
+    pairs, sizes, medians, sigma = robust_stats(pair_keys(user_ids, category_ids), amounts.astype(float))
+
+    _, c_users, c_categories, c_amounts, _, _ = zip(*candidates)
+    z, index = score(pair_keys(c_users, c_categories), np.array(c_amounts, dtype=float),
+                     pairs, sizes, medians, sigma)
+    outliers = np.flatnonzero(z > Z_THRESHOLD)
+    if not len(outliers):
+        return 0
+
+    rows = []
+    for i in outliers:
+        txn = candidates[i]
+        typical = round(float(medians[index[i]]), 2)
+        rows.append({
+            'user_id': txn.user_id,
+            'type': NOTIFICATION_TYPE,
+            'title': 'Unusual Transaction',
+            'message': f'{txn.amount:.2f} in {txn.name} on {txn.date.isoformat()} is well above your typical {typical:.2f}.',
+            'is_read': False,
+            'created_at': now,
+            'notification_data': {
+                'transaction_id': txn.id,
+                'category_id': txn.category_id,
+                'amount': txn.amount,
+                'typical_amount': typical,
+                'score': round(float(z[i]), 2)
+            }
+        })
+    db.session.execute(insert(Notification), rows)
+    return len(rows)
@@ -0,0 +1,198 @@
+from flask import g, has_request_context
+from extensions import db
+from models import Transaction
+from models.settings import Settings
+from sqlalchemy import func, literal, select, cast, Integer, String
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import logging
+
+logger = logging.getLogger(__name__)
+
+UNITS = ('day', 'week', 'month', 'quarter', 'year')
+DEFAULT_TIMEZONE = 'UTC'
+
+
+def _check_unit(unit):
+    if unit not in UNITS:
+        raise ValueError(f"Unsupported granularity: {unit}. Use one of {', '.join(UNITS)}")
+
+
+def add_months(value, months):
+    """First day of the month `months` after value's month (negative goes back)."""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def bucket_start(value, unit):
+    """First day of the bucket containing `value`; weeks start on Monday (ISO)."""
+    _check_unit(unit)
+    if unit == 'day':
+        return value
+    if unit == 'week':
+        return value - timedelta(days=value.weekday())
+    if unit == 'month':
+        return value.replace(day=1)
+    if unit == 'quarter':
+        return date(value.year, (value.month - 1) // 3 * 3 + 1, 1)
+    return date(value.year, 1, 1)
+
+
+def shift(start, unit, steps=1):
+    """Start of the bucket `steps` buckets after the one starting at `start`."""
+    _check_unit(unit)
+    if unit == 'day':
+        return start + timedelta(days=steps)
+    if unit == 'week':
+        return start + timedelta(weeks=steps)
+    if unit == 'month':
+        return add_months(start, steps)
+    if unit == 'quarter':
+        return add_months(start, 3 * steps)
+    return date(start.year + steps, 1, 1)
+
+
+def bucket_key(value, unit):
+    """Stable string key for the bucket containing `value`; matches bucket_key_expr()."""
+    start = bucket_start(value, unit)
+    if unit in ('day', 'week'):
+        return start.isoformat()
+    if unit == 'month':
+        return f"{start.year}-{start.month:02d}"
+    if unit == 'quarter':
+        return f"{start.year}-Q{(start.month - 1) // 3 + 1}"
+    return str(start.year)
+
+
+def bucket_label(start, unit):
+    """Human-readable name for a bucket, as shown on report axes."""
+    if unit == 'day':
+        return start.strftime('%b %d, %Y')
+    if unit == 'week':
+        return start.strftime('Week of %b %d, %Y')
+    if unit == 'month':
+        return start.strftime('%b %Y')
+    if unit == 'quarter':
+        return f"Q{(start.month - 1) // 3 + 1} {start.year}"
+    return str(start.year)
+
+
+def last_buckets(unit, count, anchor):
+    """Starts of the `count` buckets ending with the one containing `anchor`, oldest first."""
+    current = bucket_start(anchor, unit)
+    return [shift(current, unit, -i) for i in range(count - 1, -1, -1)]
+
+
+def buckets_between(start, end, unit):
+    """Starts of every bucket overlapping [start, end], oldest first."""
+    starts = []
+    current = bucket_start(start, unit)
+    while current <= end:
+        starts.append(current)
+        current = shift(current, unit)
+    return starts
+
+
+def window(unit, count, anchor):
+    """(start, end) dates covering the last `count` whole buckets up to `anchor`'s."""
+    starts = last_buckets(unit, count, anchor)
+    return starts[0], shift(starts[-1], unit) - timedelta(days=1)
+
+
+def date_range(column, start=None, end=None):
+    """Sargable predicates for start <= column <= end (inclusive dates).
+
+    Always compares the bare column with bound values so an index on it can be
+    used; never wrap the column in date()/extract()/strftime() to filter.
+    """
+    predicates = []
+    if start is not None:
+        predicates.append(column >= start)
+    if end is not None:
+        predicates.append(column < end + timedelta(days=1))
+    return predicates
+
+
+def user_timezone(user_id):
+    # Looked up once per request: the ETag check and the view both need it
+    zones = g.setdefault('user_timezones', {}) if has_request_context() else {}
+    if int(user_id) not in zones:
+        zones[int(user_id)] = _load_timezone(user_id)
+    return zones[int(user_id)]
+
+
+def _load_timezone(user_id):
+    name = db.session.execute(
+        select(Settings.timezone).where(Settings.user_id == user_id)
+    ).scalar()
+    try:
+        return ZoneInfo(name or DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unknown timezone {name!r} for user {user_id}; using {DEFAULT_TIMEZONE}")
+        return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+def user_today(user_id):
+    """Today's date in the user's Settings.timezone (transactions carry local dates)."""
+    return datetime.now(user_timezone(user_id)).date()
+
+
+def bucket_key_expr(column, unit):
+    """SQL expression computing bucket_key() for a date column, for GROUP BY only."""
+    _check_unit(unit)
+    if db.engine.dialect.name == 'postgresql':
+        as_timestamp = column.cast(db.DateTime)
+        if unit == 'day':
+            return func.to_char(as_timestamp, 'YYYY-MM-DD')
+        if unit == 'week':
+            return func.to_char(func.date_trunc('week', as_timestamp), 'YYYY-MM-DD')
+        if unit == 'month':
+            return func.to_char(as_timestamp, 'YYYY-MM')
+        if unit == 'quarter':
+            return func.to_char(as_timestamp, 'YYYY-"Q"Q')
+        return func.to_char(as_timestamp, 'YYYY')
+
+    # Default for SQLite
+    if unit == 'day':
+        return func.strftime('%Y-%m-%d', column)
+    if unit == 'week':
+        # 'weekday 0' moves forward to Sunday; six days back is that week's Monday
+        return func.strftime('%Y-%m-%d', column, 'weekday 0', '-6 days')
+    if unit == 'month':
+        return func.strftime('%Y-%m', column)
+    if unit == 'quarter':
+        quarter = (cast(func.strftime('%m', column), Integer) + 2) // 3
+        return func.strftime('%Y', column) + literal('-Q') + cast(quarter, String)
+    return func.strftime('%Y', column)
+
+
+def densify(totals, starts, unit, empty):
+    """[(start, totals-or-empty)] for every bucket start, filling gaps with empty()."""
+    return [(start, totals.get(bucket_key(start, unit)) or empty()) for start in starts]
+
+
+def ledger_totals_query(user_id, unit, start, end):
+    """(bucket key, type, total) per bucket of [start, end], grouped over the ledger."""
+    key = bucket_key_expr(Transaction.date, unit)
+    return select(key, Transaction.type, func.sum(Transaction.amount)).where(
+        Transaction.user_id == user_id, *date_range(Transaction.date, start, end)
+    ).group_by(key, Transaction.type)
+
+
+def totals_by_bucket(user_id, unit, start, end):
+    """{bucket_key: {'income': x, 'expense': y}} for buckets with activity in [start, end].
+
+    Whole-month ranges at month granularity read the monthly rollups; anything
+    else is one grouped query over the ledger with a sargable date range.
+    """
+    from services import rollups
+
+    if unit == 'month' and start.day == 1 and (end + timedelta(days=1)).day == 1:
+        # Whole months: the incrementally maintained rollups already hold these sums
+        return rollups.totals_by_month(user_id, bucket_key(start, 'month'), bucket_key(end, 'month'))
+
+    rows = db.session.execute(ledger_totals_query(user_id, unit, start, end))
+    totals = {}
+    for bucket, txn_type, total in rows:
+        totals.setdefault(bucket, {'income': 0.0, 'expense': 0.0})[txn_type] = float(total or 0.0)
+    return totals
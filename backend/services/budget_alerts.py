@@ -0,0 +1,94 @@
+"""Set-based budget alert evaluation for the scheduler.
+
+Spend for every active, alert-enabled budget comes from one range join of
+budgets against the ledger. Each budget remembers the highest alert level it
+has already been notified about (Budget.alert_level), so a notification goes
+out once per threshold crossing rather than on every run; if spend falls back
+(refunds, a raised amount) the level drops and a later crossing alerts again.
+"""
+
+from extensions import db
+from models import Budget, Category, Transaction, Notification
+from sqlalchemy import and_, func, insert, select, update
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+ALERT_NONE = 0
+ALERT_THRESHOLD = 1
+ALERT_EXCEEDED = 2
+
+
+def alert_level(spent, amount, threshold):
+    if not amount or amount <= 0:
+        return ALERT_NONE
+    used = spent / amount
+    if used >= 1:
+        return ALERT_EXCEEDED
+    if used >= (threshold if threshold is not None else 0.8):
+        return ALERT_THRESHOLD
+    return ALERT_NONE
+
+
+def budget_spend_rows(today):
+    """Spend to date for every active, alert-enabled budget, in one grouped range join."""
+    return db.session.execute(budget_spend_query(today)).all()
+
+
+def budget_spend_query(today):
+    spent = func.coalesce(func.sum(Transaction.amount), 0.0).label('spent')
+    return (
+        select(
+            Budget.id, Budget.user_id, Budget.category_id, Budget.amount, Budget.alert_threshold,
+            Budget.alert_level, Budget.updated_at, Category.name.label('category_name'), spent
+        )
+        .join(Category, Category.id == Budget.category_id)
+        .outerjoin(Transaction, and_(
+            Transaction.user_id == Budget.user_id,
+            Transaction.category_id == Budget.category_id,
+            Transaction.type == 'expense',
+            Transaction.date >= Budget.start_date,
+            Transaction.date <= today
+        ))
+        .where(
+            Budget.start_date <= today,
+            Budget.end_date >= today,
+            Budget.alert_enabled == True
+        )
+        .group_by(Budget.id, Category.name)
+    )
+
+
+def evaluate_budget_alerts(today=None):
+    """Notify on new threshold crossings; returns (budgets evaluated, alerts sent).
+
+    Runs in the caller's session; the caller commits.
+    """
+    today = today or datetime.utcnow().date()
+    now = datetime.utcnow()
+    rows = budget_spend_rows(today)
+
+    notifications, level_changes = [], []
+    for row in rows:
+        level = alert_level(row.spent, row.amount, row.alert_threshold)
+        if level == row.alert_level:
+            continue
+        # Carry updated_at through unchanged: this is bookkeeping, not a user edit
+        level_changes.append({'id': row.id, 'alert_level': level, 'updated_at': row.updated_at})
+        if level > row.alert_level:
+            values = Notification.budget_alert_values(row.user_id, {
+                'budget_id': row.id,
+                'category_id': row.category_id,
+                'category_name': row.category_name,
+                'current_percentage': round(row.spent / row.amount * 100, 2),
+                'amount_remaining': row.amount - row.spent
+            })
+            values.update(is_read=False, created_at=now)
+            notifications.append(values)
+
+    if notifications:
+        db.session.execute(insert(Notification), notifications)
+    if level_changes:
+        db.session.execute(update(Budget), level_changes)
+    return len(rows), len(notifications)
@@ -0,0 +1,87 @@
+from extensions import db
+from models import Budget, Transaction
+from sqlalchemy import func, select, update
+from services.response_cache import mark_user_changed
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _window_spend():
+    """Correlated SUM of expenses inside each budget's category and date window."""
+    return select(func.coalesce(func.sum(Transaction.amount), 0.0)).where(
+        Transaction.user_id == Budget.user_id,
+        Transaction.category_id == Budget.category_id,
+        Transaction.type == 'expense',
+        Transaction.date >= Budget.start_date,
+        Transaction.date <= Budget.end_date
+    ).scalar_subquery()
+
+
+def apply_spend_deltas(deltas):
+    """Add expense deltas to every budget whose window contains them.
+
+    `deltas` maps (user_id, category_id, date) -> amount. Runs in the caller's
+    session so Budget.spent commits or rolls back with the ledger write.
+    """
+    for (user_id, category_id, day), amount in deltas.items():
+        if not amount:
+            continue
+        db.session.execute(
+            update(Budget).where(
+                Budget.user_id == user_id,
+                Budget.category_id == category_id,
+                Budget.start_date <= day,
+                Budget.end_date >= day
+            ).values(spent=func.coalesce(Budget.spent, 0.0) + amount).execution_options(synchronize_session=False)
+        )
+
+
+def window_spend_query(user_id, category_id, start_date, end_date):
+    return select(func.sum(Transaction.amount)).where(
+        Transaction.user_id == user_id,
+        Transaction.category_id == category_id,
+        Transaction.type == 'expense',
+        Transaction.date >= start_date,
+        Transaction.date <= end_date
+    )
+
+
+def spend_for_window(user_id, category_id, start_date, end_date):
+    """Expense total for a category/date window, used when a budget is created or moved."""
+    return db.session.execute(window_spend_query(user_id, category_id, start_date, end_date)).scalar() or 0.0
+
+
+def recalculate_budget_spend(user_id=None, category_ids=None):
+    """Recompute Budget.spent from the ledger in one set-based UPDATE; returns the rows updated."""
+    stmt = update(Budget).values(spent=_window_spend())
+    if user_id is not None:
+        stmt = stmt.where(Budget.user_id == user_id)
+    if category_ids is not None:
+        stmt = stmt.where(Budget.category_id.in_(category_ids))
+    return _mark_updated_users(stmt)
+
+
+def _mark_updated_users(stmt):
+    """Run a Budget UPDATE and invalidate the cached views of every user it touched."""
+    user_ids = db.session.execute(
+        stmt.returning(Budget.user_id).execution_options(synchronize_session=False)
+    ).scalars().all()
+    # Core UPDATEs bypass the flush hook; bumped once the caller commits
+    for user_id in set(user_ids):
+        mark_user_changed(db.session, user_id)
+    return len(user_ids)
+
+
+def reconcile_budget_spend(tolerance=0.005):
+    """Repair budgets whose stored spent has drifted from the ledger; returns the count fixed."""
+    expected = _window_spend()
+    repaired = _mark_updated_users(
+        update(Budget).where(
+            func.abs(func.coalesce(Budget.spent, 0.0) - expected) > tolerance
+        ).values(spent=expected)
+    )
+    db.session.commit()
+    if repaired:
+        logger.warning(f"Reconciled spent on {repaired} drifted budgets")
+    return repaired
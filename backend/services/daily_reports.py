@@ -0,0 +1,84 @@
+"""Daily summary notifications for every user with activity on a given day.
+
+Users are visited in user_id order, CHUNK_SIZE at a time: each chunk is one
+GROUP BY user_id over a sargable date range (served by ix_transaction_date_user),
+one bulk INSERT of notifications and a checkpoint, committed together. A run
+that dies part-way resumes after the last committed user instead of starting
+over or notifying anyone twice.
+"""
+
+from extensions import db
+from models import Transaction, Notification
+from sqlalchemy import func, insert, select
+from services import jobs
+from services.bucketing import date_range
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = 'generate_daily_reports'
+CHUNK_SIZE = 5000
+
+
+def daily_totals(day, after_user_id=0, limit=CHUNK_SIZE):
+    """(user_id, income, expense) for the next `limit` users with activity on `day`."""
+    return db.session.execute(daily_totals_query(day, after_user_id, limit)).all()
+
+
+def daily_totals_query(day, after_user_id=0, limit=CHUNK_SIZE):
+    return (
+        select(
+            Transaction.user_id,
+            func.sum(Transaction.amount).filter(Transaction.type == 'income'),
+            func.sum(Transaction.amount).filter(Transaction.type == 'expense')
+        )
+        .where(*date_range(Transaction.date, day, day), Transaction.user_id > after_user_id)
+        .group_by(Transaction.user_id)
+        .order_by(Transaction.user_id)
+        .limit(limit)
+    )
+
+
+def report_values(user_id, day, income, expense, now):
+    income = round(income or 0, 2)
+    expense = round(expense or 0, 2)
+    values = Notification.system_notification_values(
+        user_id=user_id,
+        title='Daily Summary',
+        message=f'Yesterday\'s Summary:\nIncome: {income}\nExpenses: {expense}',
+        notification_data={
+            'date': day.isoformat(),
+            'total_income': income,
+            'total_expense': expense
+        }
+    )
+    values.update(is_read=False, created_at=now)
+    return values
+
+
+def generate_daily_reports(day, chunk_size=CHUNK_SIZE):
+    """Notify every user active on `day`; returns the number notified by this run."""
+    checkpoint = jobs.load_checkpoint(JOB_NAME) or {}
+    after_user_id = 0
+    if checkpoint.get('date') == day.isoformat():
+        if checkpoint.get('done'):
+            return 0
+        after_user_id = checkpoint.get('last_user_id', 0)
+        logger.info(f"Resuming daily reports for {day} after user {after_user_id}")
+
+    notified = 0
+    while True:
+        rows = daily_totals(day, after_user_id, chunk_size)
+        if rows:
+            now = datetime.utcnow()
+            db.session.execute(insert(Notification), [
+                report_values(user_id, day, income, expense, now) for user_id, income, expense in rows
+            ])
+            after_user_id = rows[-1][0]
+            notified += len(rows)
+        done = len(rows) < chunk_size
+        jobs.save_checkpoint(JOB_NAME, {'date': day.isoformat(), 'last_user_id': after_user_id, 'done': done})
+        db.session.commit()
+        if done:
+            return notified
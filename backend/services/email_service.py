@@ -4,12 +4,17 @@ import random
 import string
 from datetime import datetime, timedelta
 from extensions import db
+from services.task_queue import task
 import logging
 
 logger = logging.getLogger(__name__)
 
 class EmailVerification(db.Model):
     __tablename__ = 'email_verification'
+    __table_args__ = (
+        # Expired codes are purged in batches along this (services/retention.py)
+        db.Index('ix_email_verification_expires_at', 'expires_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), nullable=False)
@@ -31,6 +36,7 @@ class EmailService:
         logger.info("Initializing EmailService")
         self.mail = Mail(app)
         self.app = app
+        app.extensions['email_service'] = self
         logger.info(f"Email configuration: SERVER={app.config.get('MAIL_SERVER')}, "
                    f"PORT={app.config.get('MAIL_PORT')}, "
                    f"USERNAME={app.config.get('MAIL_USERNAME')}, "
@@ -39,24 +45,23 @@ class EmailService:
     def generate_verification_code(self):
         return ''.join(random.choices(string.digits, k=6))
     
-    def send_verification_email(self, email):
-        try:
-            logger.info(f"Attempting to send verification email to {email}")
-            
-            # Create new verification record
-            verification = EmailVerification(email=email)
-            db.session.add(verification)
-            db.session.commit()
-            logger.info(f"Created verification record with code: {verification.code}")
-            
-            # Create email message
-            msg = Message(
-                'Verify Your Email - Traxpense',
-                sender=self.app.config['MAIL_DEFAULT_SENDER'],
-                recipients=[email]
-            )
-            
-            msg.body = f'''Hello,
+    def create_verification(self, email):
+        """Store a fresh verification code for `email` and return its record."""
+        verification = EmailVerification(email=email)
+        db.session.add(verification)
+        db.session.commit()
+        logger.info(f"Created verification record {verification.id} for {email}")
+        return verification
+
+    def deliver_verification(self, verification):
+        """Send an existing code by email; raises when the mail server fails."""
+        msg = Message(
+            'Verify Your Email - Traxpense',
+            sender=self.app.config['MAIL_DEFAULT_SENDER'],
+            recipients=[verification.email]
+        )
+        
+        msg.body = f'''Hello,
 
 Thank you for registering with Traxpense. To verify your email address, please use the following verification code:
 
@@ -68,25 +73,29 @@ If you did not request this verification, please ignore this email.
 
 Best regards,
 Traxpense Team'''
-            
-            msg.html = f'''
-            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                <h2 style="color: #333;">Verify Your Email</h2>
-                <p>Thank you for registering with Traxpense. To verify your email address, please use the following verification code:</p>
-                <div style="background-color: #f5f5f5; padding: 15px; border-radius: 5px; text-align: center; margin: 20px 0;">
-                    <h1 style="color: #007bff; margin: 0;">{verification.code}</h1>
-                </div>
-                <p style="color: #666;">This code will expire in 15 minutes.</p>
-                <p style="color: #666;">If you did not request this verification, please ignore this email.</p>
-                <hr style="border: 1px solid #eee; margin: 20px 0;">
-                <p style="color: #999; font-size: 12px;">Best regards,<br>Traxpense Team</p>
+        
+        msg.html = f'''
+        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+            <h2 style="color: #333;">Verify Your Email</h2>
+            <p>Thank you for registering with Traxpense. To verify your email address, please use the following verification code:</p>
+            <div style="background-color: #f5f5f5; padding: 15px; border-radius: 5px; text-align: center; margin: 20px 0;">
+                <h1 style="color: #007bff; margin: 0;">{verification.code}</h1>
             </div>
-            '''
-            
-            # Send email
-            logger.info("Attempting to send email...")
-            self.mail.send(msg)
-            logger.info(f"Verification email sent successfully to {email}")
+            <p style="color: #666;">This code will expire in 15 minutes.</p>
+            <p style="color: #666;">If you did not request this verification, please ignore this email.</p>
+            <hr style="border: 1px solid #eee; margin: 20px 0;">
+            <p style="color: #999; font-size: 12px;">Best regards,<br>Traxpense Team</p>
+        </div>
+        '''
+        
+        self.mail.send(msg)
+        logger.info(f"Verification email sent successfully to {verification.email}")
+
+    def send_verification_email(self, email):
+        """Create a code and send it inline; prefer queue_verification_email in request handlers."""
+        try:
+            logger.info(f"Attempting to send verification email to {email}")
+            self.deliver_verification(self.create_verification(email))
             return True
             
         except Exception as e:
@@ -94,6 +103,12 @@ Traxpense Team'''
             logger.exception("Full traceback:")
             db.session.rollback()
             return False
+
+    def queue_verification_email(self, email):
+        """Create a code now and send it from the task queue, with retries."""
+        verification = self.create_verification(email)
+        send_verification_email_task.delay(verification.id)
+        return verification
     
     def verify_code(self, email, code):
         try:
@@ -122,4 +137,13 @@ Traxpense Team'''
             logger.error(f"Error verifying code for {email}: {str(e)}")
             logger.exception("Full traceback:")
             db.session.rollback()
-            return False, "Error verifying code" 
\ No newline at end of file
+            return False, "Error verifying code" 
+
+
+@task('email.send_verification', max_retries=5, backoff=5.0)
+def send_verification_email_task(verification_id):
+    verification = db.session.get(EmailVerification, verification_id)
+    if verification is None or verification.is_verified or verification.is_expired():
+        logger.info(f"Skipping verification email {verification_id}: no longer pending")
+        return
+    current_app.extensions['email_service'].deliver_verification(verification)
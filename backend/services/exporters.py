@@ -0,0 +1,187 @@
+from flask import Response, stream_with_context
+from datetime import datetime
+import csv
+import io
+import logging
+import os
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('csv', 'xlsx', 'parquet')
+CSV_FLUSH_ROWS = 1000
+PARQUET_ROW_GROUP_SIZE = 50000
+FILE_CHUNK_SIZE = 64 * 1024
+
+MIMETYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+class ExportUnavailable(RuntimeError):
+    """Raised when the writer for a format needs an optional package that is missing."""
+
+
+def _log_done(name, rows, started):
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed > 0 else 0
+    logger.info(f"Exported {rows} rows to {name} in {elapsed:.2f}s ({rate:.0f} rows/s)")
+
+
+def export_csv(columns, rows, filename):
+    """Stream CSV row by row; only CSV_FLUSH_ROWS rows are buffered at a time."""
+    def generate():
+        started = time.perf_counter()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+            if count % CSV_FLUSH_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+        _log_done(filename, count, started)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=MIMETYPES['csv'],
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+
+def _send_temp_file(path, filename, fmt):
+    """Stream a finished export file from disk and remove it once sent."""
+    def generate():
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(FILE_CHUNK_SIZE), b''):
+                    yield chunk
+        finally:
+            os.remove(path)
+
+    return Response(
+        generate(),
+        mimetype=MIMETYPES[fmt],
+        headers={
+            'Content-Disposition': f'attachment; filename={filename}',
+            'Content-Length': str(os.path.getsize(path))
+        }
+    )
+
+
+def export_xlsx(columns, rows, filename):
+    """Write XLSX in xlsxwriter's constant_memory mode, which flushes each row to disk."""
+    import xlsxwriter
+
+    started = time.perf_counter()
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd'})
+    try:
+        worksheet = workbook.add_worksheet()
+        worksheet.write_row(0, 0, columns)
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            worksheet.write_row(count, 0, row)
+    finally:
+        workbook.close()
+    _log_done(filename, count, started)
+    return _send_temp_file(path, filename, 'xlsx')
+
+
+def export_parquet(columns, rows, filename):
+    """Write Parquet one row group at a time via pyarrow's ParquetWriter."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportUnavailable("Parquet export requires the pyarrow package (pip install 'expense-tracker[parquet]')")
+
+    started = time.perf_counter()
+    fd, path = tempfile.mkstemp(suffix='.parquet')
+    os.close(fd)
+    writer = None
+    count = 0
+    try:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= PARQUET_ROW_GROUP_SIZE:
+                writer = _write_row_group(pa, pq, writer, path, columns, chunk)
+                count += len(chunk)
+                chunk = []
+        if chunk or writer is None:
+            writer = _write_row_group(pa, pq, writer, path, columns, chunk)
+            count += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    _log_done(filename, count, started)
+    return _send_temp_file(path, filename, 'parquet')
+
+
+def _write_row_group(pa, pq, writer, path, columns, chunk):
+    table = pa.Table.from_pydict({
+        name: [row[i] for row in chunk] for i, name in enumerate(columns)
+    })
+    if writer is None:
+        writer = pq.ParquetWriter(path, table.schema)
+    else:
+        table = table.cast(writer.schema)
+    writer.write_table(table)
+    return writer
+
+
+EXPORTERS = {
+    'csv': export_csv,
+    'xlsx': export_xlsx,
+    'parquet': export_parquet,
+}
+
+
+def export_rows(fmt, columns, rows, basename):
+    """Dispatch to the writer for `fmt`; `rows` is any iterable of sequences."""
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unsupported export format: {fmt}. Use one of {', '.join(EXPORT_FORMATS)}")
+    stamp = datetime.utcnow().strftime('%Y%m%d')
+    return EXPORTERS[fmt](columns, rows, f"{basename}_{stamp}.{fmt}")
+
+
+
+def benchmark_exports(sizes=(10000, 100000), formats=EXPORT_FORMATS):
+    """Time each writer end to end on synthetic transaction rows.
+
+    Returns {size: {format: (seconds, bytes written)}}; formats whose optional
+    package is missing are left out. Needs a request context (CSV streams
+    through stream_with_context).
+    """
+    from datetime import date
+
+    columns = ['id', 'date', 'type', 'category', 'amount', 'description']
+    results = {}
+    for size in sizes:
+        rows = [
+            (i, date(2024, 1 + i % 12, 1 + i % 28), 'expense' if i % 3 else 'income',
+             f'Category {i % 12}', 12.5 + i, f'Transaction {i}')
+            for i in range(size)
+        ]
+        results[size] = {}
+        for fmt in formats:
+            started = time.perf_counter()
+            try:
+                response = export_rows(fmt, columns, iter(rows), 'benchmark')
+            except ExportUnavailable:
+                continue
+            try:
+                written = sum(len(chunk) for chunk in response.response)
+            finally:
+                response.close()
+            results[size][fmt] = (time.perf_counter() - started, written)
+    return results
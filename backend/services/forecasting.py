@@ -0,0 +1,185 @@
+"""End-of-period spend projections for active budgets.
+
+All budgets in a request are forecast together: one grouped query loads the
+daily expense series for every category involved, and the projection is a
+least-squares fit over the whole budgets x days matrix at once. Results are
+cached per (user, category) and dropped when a ledger write to that category
+commits; the stored signature also retires them when the budget itself or the
+current date changes.
+"""
+
+from extensions import db, cache
+from models import Transaction
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from services import bucketing
+from datetime import timedelta
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHANGED_CATEGORIES_KEY = 'changed_forecast_categories'
+CACHE_TIMEOUT = 24 * 3600
+
+
+def _cache_key(user_id, category_id):
+    return f"budget-forecast:{int(user_id)}:{int(category_id)}"
+
+
+def _signature(budget, today):
+    return (float(budget.amount or 0.0), float(budget.spent or 0.0),
+            budget.start_date.isoformat(), budget.end_date.isoformat(), today.isoformat())
+
+
+def mark_categories_changed(session, user_id, category_ids):
+    """Drop the cached forecasts for these categories once the session commits."""
+    changed = session.info.setdefault(CHANGED_CATEGORIES_KEY, set())
+    changed.update((int(user_id), int(category_id)) for category_id in category_ids)
+
+
+def _drop_changed_forecasts(session):
+    changed = session.info.pop(CHANGED_CATEGORIES_KEY, ())
+    if not changed:
+        return
+    try:
+        cache.delete_many(*(_cache_key(user_id, category_id) for user_id, category_id in changed))
+    except Exception as e:
+        # Signatures still catch most staleness; never fail a committed write over it.
+        logger.error(f"Failed to drop cached budget forecasts: {str(e)}")
+
+
+def _discard_changed_forecasts(session, *args):
+    session.info.pop(CHANGED_CATEGORIES_KEY, None)
+
+
+def init_forecasting(app):
+    for name, listener in (
+        ('after_commit', _drop_changed_forecasts),
+        ('after_rollback', _discard_changed_forecasts),
+    ):
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
+
+
+def daily_spend(user_id, category_ids, start, end):
+    """(category_id, date, total) expense rows for the categories over [start, end]."""
+    return db.session.execute(daily_spend_query(user_id, category_ids, start, end)).all()
+
+
+def daily_spend_query(user_id, category_ids, start, end):
+    return (
+        select(Transaction.category_id, Transaction.date, func.sum(Transaction.amount))
+        .where(
+            Transaction.user_id == user_id,
+            Transaction.type == 'expense',
+            Transaction.category_id.in_(category_ids),
+            *bucketing.date_range(Transaction.date, start, end)
+        )
+        .group_by(Transaction.category_id, Transaction.date)
+    )
+
+
+def project(budgets, rows, today):
+    """Forecast every budget from the daily spend rows, as array operations.
+
+    `budgets` must all be active on `today`. The daily rate is the slope of a
+    least-squares line through each budget's cumulative spend so far (the plain
+    average when only one day has elapsed); the remaining days are projected at
+    that rate.
+    """
+    origin = min(budget.start_date for budget in budgets)
+    width = (today - origin).days + 1
+    categories = sorted({budget.category_id for budget in budgets})
+    row_of = {category_id: i for i, category_id in enumerate(categories)}
+
+    daily = np.zeros((len(categories), width))
+    if rows:
+        category_ids, days, totals = zip(*rows)
+        np.add.at(
+            daily,
+            ([row_of[c] for c in category_ids], [(day - origin).days for day in days]),
+            np.asarray(totals, dtype=float)
+        )
+
+    offsets = np.array([(budget.start_date - origin).days for budget in budgets])
+    amounts = np.array([float(budget.amount or 0.0) for budget in budgets])
+    spent = np.array([float(budget.spent or 0.0) for budget in budgets])
+    remaining = np.array([(budget.end_date - today).days for budget in budgets])
+
+    day = np.arange(width)
+    mask = day >= offsets[:, None]
+    series = daily[[row_of[budget.category_id] for budget in budgets]] * mask
+    cumulative = np.cumsum(series, axis=1)
+    elapsed = mask.sum(axis=1)
+
+    # Slope of cumulative spend against day, over each budget's own window
+    x_mean = (day * mask).sum(axis=1) / elapsed
+    y_mean = (cumulative * mask).sum(axis=1) / elapsed
+    dx = (day - x_mean[:, None]) * mask
+    variance = (dx * dx).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where(variance > 0, (dx * (cumulative - y_mean[:, None])).sum(axis=1) / variance, 0.0)
+    rate = np.where(elapsed > 1, np.maximum(slope, 0.0), cumulative[:, -1] / elapsed)
+
+    projected = spent + rate * remaining
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentage = np.where(amounts > 0, projected / amounts * 100, 0.0)
+        days_left = np.where(rate > 0, np.ceil((amounts - spent) / rate), np.inf)
+    crossed = (cumulative >= amounts[:, None]) & mask
+    first_crossed = crossed.argmax(axis=1)
+
+    forecasts = {}
+    for i, budget in enumerate(budgets):
+        if spent[i] >= amounts[i]:
+            exhausted = origin + timedelta(days=int(first_crossed[i])) if crossed[i].any() else today
+        elif days_left[i] <= remaining[i]:
+            exhausted = today + timedelta(days=int(days_left[i]))
+        else:
+            exhausted = None
+        forecasts[budget.id] = {
+            'daily_rate': round(float(rate[i]), 2),
+            'projected_spend': round(float(projected[i]), 2),
+            'projected_percentage': round(float(percentage[i]), 2),
+            'exhaustion_date': exhausted,
+        }
+    return forecasts
+
+
+def forecast_budgets(user_id, budgets, today=None):
+    """{budget_id: forecast} for the budgets active today; others are left out.
+
+    `budgets` are rows with id, category_id, amount, spent, start_date and
+    end_date (BudgetRow or Budget). Cached forecasts are reused; the rest are
+    computed together from one query.
+    """
+    today = today or bucketing.user_today(user_id)
+    active = [budget for budget in budgets if budget.start_date <= today <= budget.end_date]
+    if not active:
+        return {}
+
+    category_ids = sorted({budget.category_id for budget in active})
+    cached = cache.get_many(*(_cache_key(user_id, category_id) for category_id in category_ids))
+    by_category = {category_id: entry or {} for category_id, entry in zip(category_ids, cached)}
+
+    forecasts, stale = {}, []
+    for budget in active:
+        entry = by_category[budget.category_id].get(budget.id)
+        if entry and entry[0] == _signature(budget, today):
+            forecasts[budget.id] = entry[1]
+        else:
+            stale.append(budget)
+    if not stale:
+        return forecasts
+
+    stale_categories = sorted({budget.category_id for budget in stale})
+    start = min(budget.start_date for budget in stale)
+    fresh = project(stale, daily_spend(user_id, stale_categories, start, today), today)
+    forecasts.update(fresh)
+
+    for budget in stale:
+        by_category[budget.category_id][budget.id] = (_signature(budget, today), fresh[budget.id])
+    cache.set_many({
+        _cache_key(user_id, category_id): by_category[category_id] for category_id in stale_categories
+    }, timeout=CACHE_TIMEOUT)
+    return forecasts
@@ -0,0 +1,88 @@
+from flask import current_app
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from extensions import db
+from services.invalidation import get_bus
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+IDENTITY_CHANNEL = 'identity'
+CHANGED_IDENTITIES_KEY = 'changed_identity_ids'
+
+# user_id -> (column values, expires_at). Column values rather than User objects,
+# since an ORM instance belongs to the session that loaded it.
+_lock = threading.Lock()
+_users = {}
+
+
+def _snapshot(user):
+    return {attr.key: getattr(user, attr.key) for attr in sa_inspect(type(user)).column_attrs}
+
+
+def forget_user(user_id):
+    with _lock:
+        _users.pop(int(user_id), None)
+
+
+def load_user(user_id):
+    """Resolve a JWT identity to a User attached to the current session.
+
+    Served from a short-TTL process cache when possible: the cached column values
+    are merged back in with load=False, which attaches the instance without a
+    SELECT. Flask-JWT-Extended keeps the result for the rest of the request.
+    """
+    from models import User
+
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+    with _lock:
+        cached = _users.get(user_id)
+    if cached and cached[1] > time.monotonic():
+        user = User(**cached[0])
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+    user = db.session.get(User, user_id)
+    ttl = current_app.config.get('IDENTITY_CACHE_TTL', 0)
+    if user is not None and ttl:
+        with _lock:
+            _users[user_id] = (_snapshot(user), time.monotonic() + ttl)
+    return user
+
+
+def _collect_changed_identities(session, flush_context):
+    from models import User
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            session.info.setdefault(CHANGED_IDENTITIES_KEY, set()).add(obj.id)
+
+
+def _publish_changed_identities(session):
+    for user_id in session.info.pop(CHANGED_IDENTITIES_KEY, ()):
+        try:
+            get_bus().publish(IDENTITY_CHANNEL, int(user_id))
+        except Exception as e:
+            logger.error(f"Failed to invalidate cached identity for user {user_id}: {str(e)}")
+
+
+def _discard_changed_identities(session, *args):
+    session.info.pop(CHANGED_IDENTITIES_KEY, None)
+
+
+def init_identity_cache(app):
+    """Drop cached identities on every worker once a profile update, password
+    change or account deletion commits."""
+    get_bus().subscribe(IDENTITY_CHANNEL, forget_user)
+    for name, listener in (
+        ('after_flush', _collect_changed_identities),
+        ('after_commit', _publish_changed_identities),
+        ('after_rollback', _discard_changed_identities),
+    ):
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
@@ -0,0 +1,173 @@
+from datetime import datetime
+import csv
+import io
+import re
+
+SUPPORTED_FORMATS = ('csv', 'ofx', 'qif')
+
+# Statement exports disagree on date formats; try these in order.
+DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', "%m/%d'%Y", "%m/%d'%y", '%m/%d/%y', '%Y%m%d')
+
+# Opening or closing tag plus the text up to the next tag (SGML leaves have no closing tag)
+OFX_TAG = re.compile(r'<(/?)([^>/]+)>([^<\r\n]*)')
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+def parse_date(value):
+    value = (value or '').strip().replace(' ', '')
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ImportRowError(f"Invalid date: {value!r}")
+
+
+def parse_amount(value):
+    try:
+        return float(str(value).strip().replace(',', '').replace('$', ''))
+    except (TypeError, ValueError):
+        raise ImportRowError(f"Invalid amount: {value!r}")
+
+
+def detect_format(filename, requested=None):
+    fmt = requested or (filename.rsplit('.', 1)[-1] if filename and '.' in filename else '')
+    fmt = fmt.lower()
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt or 'unknown'}. Use one of {', '.join(SUPPORTED_FORMATS)}")
+    return fmt
+
+
+def parse_csv(stream):
+    """Rows from a CSV with date, amount and optional type, description, category/category_id columns."""
+    reader = csv.DictReader(stream)
+    for line_number, record in enumerate(reader, start=2):
+        record = {(key or '').strip().lower(): (value or '').strip() for key, value in record.items()}
+        yield line_number, {
+            'date': record.get('date'),
+            'amount': record.get('amount'),
+            'type': record.get('type') or None,
+            'description': record.get('description') or None,
+            'category': record.get('category') or None,
+            'category_id': record.get('category_id') or None
+        }
+
+
+def _ofx_row(fields):
+    return {
+        'date': (fields.get('DTPOSTED') or '')[:8],
+        'amount': fields.get('TRNAMT'),
+        'type': None,
+        'description': fields.get('NAME') or fields.get('MEMO') or None,
+        'category': None,
+        'category_id': None
+    }
+
+
+def parse_ofx(stream):
+    """Rows from the <STMTTRN> blocks of an OFX file (SGML or XML flavour).
+
+    Tags are handled one at a time, not per line, so files written on a single
+    line (minified XML) yield every transaction. A block ends at </STMTTRN>,
+    or failing that at the next <STMTTRN> or </BANKTRANLIST>.
+    """
+    current = None
+    start_line = 0
+    for line_number, line in enumerate(stream, start=1):
+        if '<' not in line:
+            continue
+        for closing, tag, value in OFX_TAG.findall(line):
+            tag = tag.strip().upper()
+            if tag == 'STMTTRN' and not closing:
+                if current:
+                    yield start_line, _ofx_row(current)
+                current, start_line = {}, line_number
+            elif closing and tag in ('STMTTRN', 'BANKTRANLIST'):
+                if current:
+                    yield start_line, _ofx_row(current)
+                current = None
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+    if current:
+        yield start_line, _ofx_row(current)
+
+
+def parse_qif(stream):
+    """Rows from a QIF file; records are terminated by a '^' line."""
+    current = {}
+    start_line = 1
+    for line_number, line in enumerate(stream, start=1):
+        line = line.rstrip('\r\n')
+        if not line or line.startswith('!'):
+            if not current:
+                start_line = line_number + 1
+            continue
+        code, value = line[0], line[1:].strip()
+        if code == '^':
+            if current:
+                yield start_line, {
+                    'date': current.get('D'),
+                    'amount': current.get('T') or current.get('U'),
+                    'type': None,
+                    'description': current.get('P') or current.get('M') or None,
+                    'category': current.get('L') or None,
+                    'category_id': None
+                }
+            current, start_line = {}, line_number + 1
+        else:
+            current.setdefault(code, value)
+
+
+PARSERS = {
+    'csv': parse_csv,
+    'ofx': parse_ofx,
+    'qif': parse_qif,
+}
+
+
+def iter_rows(file_storage, fmt):
+    """Stream-parse an uploaded file without reading it into memory first."""
+    stream = io.TextIOWrapper(file_storage.stream, encoding='utf-8-sig', errors='replace', newline='')
+    return PARSERS[fmt](stream)
+
+
+def normalize_row(raw, category_ids, category_names, default_category_id=None):
+    """Validate a parsed row against the user's categories.
+
+    `category_ids` (str id -> id) and `category_names` (lower-cased name -> id)
+    are built once per file from the user's categories.
+    """
+    if not raw.get('date'):
+        raise ImportRowError("Missing date")
+    if raw.get('amount') in (None, ''):
+        raise ImportRowError("Missing amount")
+    date = parse_date(raw['date'])
+    amount = parse_amount(raw['amount'])
+
+    txn_type = (raw.get('type') or '').lower() or ('expense' if amount < 0 else 'income')
+    if txn_type not in ('income', 'expense'):
+        raise ImportRowError(f"Invalid transaction type: {raw['type']!r}")
+    amount = abs(amount)
+    if amount == 0:
+        raise ImportRowError("Amount must be non-zero")
+
+    if raw.get('category_id'):
+        category_id = category_ids.get(raw['category_id'])
+    elif raw.get('category'):
+        category_id = category_names.get(raw['category'].lower())
+    else:
+        category_id = default_category_id
+    if category_id is None:
+        raise ImportRowError(f"Category not found: {raw.get('category_id') or raw.get('category') or '(none)'}")
+
+    description = raw.get('description')
+    return {
+        'category_id': category_id,
+        'amount': amount,
+        'description': description[:200] if description else None,
+        'date': date,
+        'type': txn_type
+    }
@@ -0,0 +1,111 @@
+from collections import defaultdict
+import json
+import logging
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = 'expense-tracker:invalidate:'
+
+
+class LocalBus:
+    """In-process invalidation bus; the stand-in when no shared backend is configured.
+
+    Handlers receive the published message (any JSON-serializable value) and are
+    called synchronously in the publishing thread.
+    """
+
+    def __init__(self):
+        self._handlers = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel, handler):
+        with self._lock:
+            if handler not in self._handlers[channel]:
+                self._handlers[channel].append(handler)
+
+    def publish(self, channel, message):
+        self._dispatch(channel, message)
+
+    def _dispatch(self, channel, message):
+        with self._lock:
+            handlers = list(self._handlers.get(channel, ()))
+        for handler in handlers:
+            try:
+                handler(message)
+            except Exception as e:
+                logger.error(f"Invalidation handler for {channel} failed: {str(e)}")
+
+    def close(self):
+        pass
+
+
+class RedisBus(LocalBus):
+    """Broadcast invalidations to every worker through Redis pub/sub.
+
+    Messages are applied locally at once and fanned out to other processes by a
+    listener thread; a worker ignores the echo of its own messages.
+    """
+
+    def __init__(self, url):
+        super().__init__()
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("A shared invalidation bus requires the redis package")
+        self.origin = uuid.uuid4().hex
+        self._redis = redis.Redis.from_url(url)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._thread = None
+
+    def subscribe(self, channel, handler):
+        super().subscribe(channel, handler)
+        self._pubsub.subscribe(**{CHANNEL_PREFIX + channel: self._on_message})
+        if self._thread is None:
+            self._thread = self._pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def publish(self, channel, message):
+        self._dispatch(channel, message)
+        try:
+            self._redis.publish(CHANNEL_PREFIX + channel, json.dumps({'origin': self.origin, 'message': message}))
+        except Exception as e:
+            # Other workers fall back to their local TTLs until the next broadcast.
+            logger.error(f"Failed to broadcast invalidation on {channel}: {str(e)}")
+
+    def _on_message(self, raw):
+        payload = json.loads(raw['data'])
+        if payload.get('origin') == self.origin:
+            return
+        channel = raw['channel']
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        self._dispatch(channel[len(CHANNEL_PREFIX):], payload.get('message'))
+
+    def close(self):
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+        self._pubsub.close()
+
+
+_bus = LocalBus()
+
+
+def get_bus():
+    return _bus
+
+
+def init_invalidation_bus(app):
+    """Use Redis pub/sub when INVALIDATION_BUS_URL is set, else the in-process bus."""
+    global _bus
+    url = app.config.get('INVALIDATION_BUS_URL')
+    bus = RedisBus(url) if url else LocalBus()
+    # Carry over handlers registered at import time.
+    for channel, handlers in _bus._handlers.items():
+        for handler in handlers:
+            bus.subscribe(channel, handler)
+    _bus.close()
+    _bus = bus
+    app.extensions['invalidation_bus'] = bus
+    return bus
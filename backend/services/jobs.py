@@ -0,0 +1,69 @@
+"""Bookkeeping for scheduled jobs, kept in job_state: checkpoints, leases and last runs."""
+
+from extensions import db
+from models import JobState
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
+
+
+def load_checkpoint(name):
+    """The checkpoint a job last saved, or None."""
+    state = db.session.get(JobState, name)
+    return state.checkpoint if state else None
+
+
+def save_checkpoint(name, checkpoint):
+    """Record progress in the caller's transaction, so it commits with the work it describes."""
+    state = db.session.get(JobState, name)
+    if state is None:
+        state = JobState(name=name)
+        db.session.add(state)
+    state.checkpoint = checkpoint
+
+
+def acquire_lease(name, owner, ttl):
+    """Take or renew the named lease for `ttl` seconds; True when `owner` holds it.
+
+    One conditional UPDATE decides, so concurrent processes can't both win.
+    Commits immediately.
+    """
+    now = datetime.utcnow()
+    if db.session.get(JobState, name) is None:
+        try:
+            db.session.add(JobState(name=name))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+    acquired = db.session.execute(
+        update(JobState).where(
+            JobState.name == name,
+            or_(JobState.owner == owner, JobState.owner.is_(None), JobState.lease_expires_at < now)
+        ).values(owner=owner, lease_expires_at=now + timedelta(seconds=ttl))
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+    db.session.commit()
+    return acquired
+
+
+def release_lease(name, owner):
+    db.session.execute(
+        update(JobState).where(JobState.name == name, JobState.owner == owner)
+        .values(owner=None, lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def record_run(name, started_at, duration):
+    """Publish a finished run's start time and duration."""
+    db.session.execute(
+        update(JobState).where(JobState.name == name)
+        .values(last_run_at=started_at, last_duration=round(duration, 3))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def job_states():
+    return [state.to_dict() for state in db.session.execute(select(JobState).order_by(JobState.name)).scalars()]
@@ -0,0 +1,116 @@
+from flask.json.provider import DefaultJSONProvider
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+import json
+import time
+import uuid
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Whether the active encoder writes date/datetime itself (see services/serializers.py)
+NATIVE_DATES = orjson is not None
+
+
+def encode_default(o):
+    """Types neither encoder handles natively; dates are ISO 8601 on both paths."""
+    if isinstance(o, (datetime, date, dt_time)):
+        return o.isoformat()
+    if isinstance(o, Decimal):
+        return float(o)
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if hasattr(o, 'to_dict'):
+        return o.to_dict()
+    if hasattr(o, 'tolist'):
+        # NumPy scalars and arrays on the stdlib path
+        return o.tolist()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes with orjson when it is installed.
+
+    orjson writes date/datetime (and NumPy values) natively in C, so payloads of
+    serialized rows skip the per-field isoformat() calls. Without orjson, or when
+    a caller asks for stdlib-only options such as indent, the stdlib encoder is
+    used with the same date handling.
+    """
+
+    default = staticmethod(encode_default)
+    # Dict order is already deterministic; sorting every payload is pure overhead.
+    sort_keys = False
+
+    if orjson is not None:
+        OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=encode_default, option=self.OPTIONS).decode()
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=encode_default, option=self.OPTIONS) + b'\n',
+            mimetype=self.mimetype
+        )
+
+
+def benchmark_encoding(sizes=(1000, 10000, 100000), repeat=3):
+    """Time turning transaction rows into a JSON payload, end to end.
+
+    Compares the old path (to_dict() with per-field isoformat, stdlib json) with
+    the precomputed serializer on each available encoder. Returns
+    {size: {variant: best seconds}}.
+    """
+    from types import SimpleNamespace
+    from services.serializers import TRANSACTION_FIELDS, serialize_transaction
+
+    def to_dict(row):
+        return {
+            name: value.isoformat() if isinstance(value, (date, datetime)) else value
+            for name, value in ((name, getattr(row, name)) for name in TRANSACTION_FIELDS)
+        }
+
+    results = {}
+    for size in sizes:
+        now = datetime.utcnow()
+        rows = [
+            SimpleNamespace(**dict(zip(TRANSACTION_FIELDS, (
+                i, 1, i % 12, 12.5 + i, f'Transaction {i}', date(2024, 1 + i % 12, 1 + i % 28),
+                'expense' if i % 3 else 'income', now, now
+            ))))
+            for i in range(size)
+        ]
+        variants = {
+            'to_dict + json': lambda: json.dumps([to_dict(row) for row in rows]).encode(),
+        }
+        if orjson is not None:
+            variants['serializer + orjson'] = lambda: orjson.dumps(
+                [serialize_transaction(row) for row in rows], default=encode_default, option=FastJSONProvider.OPTIONS
+            )
+        else:
+            variants['serializer + json'] = lambda: json.dumps(
+                [serialize_transaction(row) for row in rows], default=encode_default
+            ).encode()
+
+        results[size] = {}
+        for name, encode in variants.items():
+            best = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                encode()
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            results[size][name] = best
+    return results
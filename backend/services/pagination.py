@@ -0,0 +1,58 @@
+from datetime import datetime
+from sqlalchemy import Select, tuple_
+from extensions import db
+import base64
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(date, id):
+    """Opaque cursor for the (date, id) position of the last row on a page."""
+    raw = f"{date.isoformat()}:{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError on a malformed cursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        date_str, id_str = base64.urlsafe_b64decode(padded).decode().split(':')
+        return datetime.strptime(date_str, '%Y-%m-%d').date(), int(id_str)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def page_size_arg(value):
+    """Requested page size capped at MAX_PAGE_SIZE; raises ValueError below 1."""
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    if int(value) < 1:
+        raise ValueError(f"Invalid page_size: {value}; must be at least 1")
+    return min(int(value), MAX_PAGE_SIZE)
+
+
+def keyset_query(query, date_column, id_column, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """The page's statement: seek past the cursor, newest first, one extra row to detect a next page."""
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        query = query.filter(tuple_(date_column, id_column) < tuple_(cursor_date, cursor_id))
+    return query.order_by(date_column.desc(), id_column.desc()).limit(page_size + 1)
+
+
+def keyset_page(query, date_column, id_column, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """Apply newest-first keyset pagination to an ORM query or a Core select().
+
+    Seeks past the cursor with a row-value comparison on (date, id), so the cost
+    of a page does not depend on how deep the client has scrolled. Returns
+    (rows, next_cursor); next_cursor is None on the last page.
+    """
+    query = keyset_query(query, date_column, id_column, cursor, page_size)
+    rows = db.session.execute(query).all() if isinstance(query, Select) else query.all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, date_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
@@ -0,0 +1,104 @@
+from extensions import db
+from datetime import date, datetime
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Representative user/date values; only the shape of the plan matters here.
+SAMPLE_USER_ID = 1
+SAMPLE_CATEGORY_ID = 1
+SAMPLE_START = date(2024, 1, 1)
+SAMPLE_END = date(2024, 1, 31)
+SAMPLE_NOW = datetime(2024, 1, 31)
+SAMPLE_SINCE = datetime(2024, 1, 30)
+
+# Tables a hot query must never read without an index
+INDEXED_TABLES = ('transaction', 'monthly_rollup')
+
+
+def hot_queries():
+    """The dashboard/report/budget/job queries that must stay on an index.
+
+    Each statement comes from the same builder the route or service executes,
+    so a change to a hot path is checked as it actually runs.
+    """
+    from models import Transaction
+    from routes import calendar, dashboard, export, transactions
+    from services import anomalies, budget_alerts, budget_spend, bucketing, daily_reports, forecasting, rollups
+    from services.pagination import encode_cursor, keyset_query
+
+    start_month, end_month = rollups.month_key(SAMPLE_START), rollups.month_key(SAMPLE_END)
+    sample_filter = {'type': 'expense', 'start_date': SAMPLE_START.isoformat(), 'end_date': SAMPLE_END.isoformat()}
+    return {
+        'dashboard.aggregate_pass': dashboard.ledger_aggregate_query(SAMPLE_USER_ID, SAMPLE_START, SAMPLE_END),
+        'dashboard.aggregate_pass_rollups': rollups.month_type_category_query(SAMPLE_USER_ID, start_month, end_month),
+        'dashboard.recent_transactions': dashboard.recent_transactions_query(SAMPLE_USER_ID),
+        'transactions.list': transactions.transaction_list_query(SAMPLE_USER_ID, sample_filter)
+            .order_by(Transaction.date.desc()),
+        'transactions.keyset_page': keyset_query(
+            transactions.transaction_list_query(SAMPLE_USER_ID, {}), Transaction.date, Transaction.id,
+            encode_cursor(SAMPLE_END, 1000)
+        ),
+        'export.transactions': export.transaction_export_query(SAMPLE_USER_ID, sample_filter),
+        'calendar.heatmap': calendar.heatmap_query(SAMPLE_USER_ID, SAMPLE_START, SAMPLE_END),
+        'reports.totals_by_type': rollups.totals_by_type_query(SAMPLE_USER_ID, start_month, end_month),
+        'reports.totals_by_category': rollups.totals_by_category_query(
+            SAMPLE_USER_ID, 'expense', start_month, end_month, limit=5
+        ),
+        'reports.totals_by_month': rollups.totals_by_month_query(SAMPLE_USER_ID, start_month, end_month),
+        'reports.ledger_buckets': bucketing.ledger_totals_query(SAMPLE_USER_ID, 'week', SAMPLE_START, SAMPLE_END),
+        'budgets.window_spend': budget_spend.window_spend_query(
+            SAMPLE_USER_ID, SAMPLE_CATEGORY_ID, SAMPLE_START, SAMPLE_END
+        ),
+        'budgets.forecast_daily_spend': forecasting.daily_spend_query(
+            SAMPLE_USER_ID, [SAMPLE_CATEGORY_ID], SAMPLE_START, SAMPLE_END
+        ),
+        'tasks.budget_alerts': budget_alerts.budget_spend_query(SAMPLE_END),
+        'tasks.daily_reports': daily_reports.daily_totals_query(SAMPLE_END),
+        'tasks.anomaly_candidates': anomalies.candidates_query(SAMPLE_SINCE),
+        'tasks.anomaly_history': anomalies.history_query(SAMPLE_SINCE, SAMPLE_NOW),
+    }
+
+
+def _explain(connection, statement):
+    dialect = connection.dialect.name
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True}))
+    if dialect == 'sqlite':
+        rows = connection.execute(text(f'EXPLAIN QUERY PLAN {sql}')).fetchall()
+        return [row[-1] for row in rows]
+    if dialect == 'postgresql':
+        # Small test tables make a sequential scan the cheapest plan, so ask the
+        # planner whether an index path exists at all.
+        connection.execute(text('SET LOCAL enable_seqscan = off'))
+        rows = connection.execute(text(f'EXPLAIN {sql}')).fetchall()
+        return [row[0] for row in rows]
+    raise ValueError(f'EXPLAIN is not supported for dialect {dialect}')
+
+
+def uses_index(plan, dialect):
+    """True when no step of the plan reads an INDEXED_TABLES table without an index."""
+    for line in plan:
+        for table in INDEXED_TABLES:
+            if dialect == 'sqlite':
+                # e.g. "SCAN transaction" vs "SEARCH transaction USING INDEX ix_..."
+                if line.split(' USING')[0] in (f'SCAN {table}', f'SCAN "{table}"') and 'INDEX' not in line:
+                    return False
+            elif f'Seq Scan on {table}' in line:
+                return False
+    return True
+
+
+def check_query_plans():
+    """Run EXPLAIN for every hot query and return {name: (ok, plan)}."""
+    results = {}
+    with db.engine.connect() as connection:
+        dialect = connection.dialect.name
+        for name, statement in hot_queries().items():
+            with connection.begin():
+                plan = _explain(connection, statement)
+            ok = uses_index(plan, dialect)
+            if not ok:
+                logger.warning(f"Query {name} does not use an index: {plan}")
+            results[name] = (ok, plan)
+    return results
@@ -0,0 +1,107 @@
+"""Column-only read path for list endpoints.
+
+Each statement selects explicit columns (with the category name joined in) and
+maps result tuples onto small __slots__ DTOs, so a large listing never touches
+the identity map or per-instance attribute state. The select() constructs are
+built the same way every call, so SQLAlchemy reuses their compiled form from
+its statement cache and only the bound parameters change.
+"""
+
+from sqlalchemy import select
+from extensions import db
+from models import Transaction, Budget, Category
+from services.serializers import field_serializer
+
+
+class RowDTO:
+    """A result row; its fields are the class's __slots__, in select order.
+
+    to_dict() leaves date/datetime values for the JSON provider to encode.
+    """
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._serialize = staticmethod(field_serializer(cls.__slots__))
+
+    def __init__(self, row):
+        for name, value in zip(self.__slots__, row):
+            setattr(self, name, value)
+
+    def to_dict(self):
+        return self._serialize(self)
+
+
+class TransactionRow(RowDTO):
+    __slots__ = ('id', 'user_id', 'category_id', 'category_name', 'amount', 'description',
+                 'date', 'type', 'created_at', 'updated_at')
+
+
+class BudgetRow(RowDTO):
+    __slots__ = ('id', 'user_id', 'category_id', 'category_name', 'amount', 'spent',
+                 'start_date', 'end_date', 'alert_threshold', 'alert_enabled', 'created_at', 'updated_at')
+
+    def to_dict(self, forecast=None):
+        data = super().to_dict()
+        data['current_spending'] = round(self.spent or 0.0, 2)
+        # Projection from services.forecasting; None for budgets not active today
+        data['forecast'] = forecast
+        return data
+
+
+class CategoryRow(RowDTO):
+    __slots__ = ('id', 'user_id', 'name', 'color', 'icon', 'created_at', 'updated_at')
+
+
+def transaction_select(user_id):
+    return select(
+        Transaction.id,
+        Transaction.user_id,
+        Transaction.category_id,
+        Category.name.label('category_name'),
+        Transaction.amount,
+        Transaction.description,
+        Transaction.date,
+        Transaction.type,
+        Transaction.created_at,
+        Transaction.updated_at
+    ).join(Category, Category.id == Transaction.category_id).where(Transaction.user_id == user_id)
+
+
+def budget_select(user_id):
+    return select(
+        Budget.id,
+        Budget.user_id,
+        Budget.category_id,
+        Category.name.label('category_name'),
+        Budget.amount,
+        Budget.spent,
+        Budget.start_date,
+        Budget.end_date,
+        Budget.alert_threshold,
+        Budget.alert_enabled,
+        Budget.created_at,
+        Budget.updated_at
+    ).join(Category, Category.id == Budget.category_id).where(Budget.user_id == user_id)
+
+
+def category_select(user_id):
+    return select(
+        Category.id,
+        Category.user_id,
+        Category.name,
+        Category.color,
+        Category.icon,
+        Category.created_at,
+        Category.updated_at
+    ).where(Category.user_id == user_id)
+
+
+def fetch(statement, dto):
+    """Execute a column select and wrap each result tuple in `dto`."""
+    return [dto(row) for row in db.session.execute(statement)]
+
+
+def fetch_one(statement, dto):
+    row = db.session.execute(statement).first()
+    return dto(row) if row is not None else None
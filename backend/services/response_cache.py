@@ -0,0 +1,199 @@
+from flask import current_app, request, make_response
+from flask_jwt_extended import get_jwt_identity
+from functools import wraps
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from urllib.parse import urlencode
+from extensions import cache
+from services.invalidation import get_bus
+from services import bucketing
+import hashlib
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHANGED_USERS_KEY = 'changed_user_ids'
+VERSION_CHANNEL = 'data-version'
+
+# Process-local copy of recently read data versions, so a cache hit costs one
+# round trip to the shared backend rather than two. Entries are dropped as soon
+# as any worker broadcasts a bump, and expire after CACHE_VERSION_LOCAL_TTL in
+# case a broadcast is lost.
+_versions_lock = threading.Lock()
+_versions = {}
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def _version_key(user_id):
+    return f"data-version:{user_id}"
+
+
+def _remember_version(user_id, version):
+    ttl = current_app.config.get('CACHE_VERSION_LOCAL_TTL', 0)
+    if ttl:
+        with _versions_lock:
+            _versions[int(user_id)] = (version, time.monotonic() + ttl)
+
+
+def _forget_version(user_id):
+    with _versions_lock:
+        _versions.pop(int(user_id), None)
+
+
+def data_version(user_id):
+    """Current data generation for a user; changes whenever their data commits."""
+    with _versions_lock:
+        local = _versions.get(int(user_id))
+    if local and local[1] > time.monotonic():
+        return local[0]
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        # Evicted or never set: start a fresh generation so old entries can't match.
+        return bump_data_version(user_id)
+    _remember_version(user_id, version)
+    return version
+
+
+def bump_data_version(user_id):
+    version = f"{time.time_ns():x}"
+    # 0 keeps it until the next write; a TTL bounds staleness when the cache
+    # backend is per-process and other workers never see this bump
+    cache.set(_version_key(user_id), version, timeout=current_app.config.get('CACHE_VERSION_TTL', 0))
+    get_bus().publish(VERSION_CHANNEL, int(user_id))
+    _remember_version(user_id, version)
+    return version
+
+
+def mark_user_changed(session, user_id):
+    """Record that a user's data changed in this session; bumped on commit.
+
+    ORM writes are picked up automatically on flush. Core UPDATE/INSERT/DELETE
+    statements (bulk imports, batch edits) must call this themselves.
+    """
+    if user_id is not None:
+        session.info.setdefault(CHANGED_USERS_KEY, set()).add(int(user_id))
+
+
+def _collect_changed_users(session, flush_context):
+    from models import User
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            mark_user_changed(session, obj.id)
+        elif hasattr(obj, 'user_id'):
+            mark_user_changed(session, obj.user_id)
+
+
+def _bump_changed_users(session):
+    for user_id in session.info.pop(CHANGED_USERS_KEY, ()):
+        try:
+            bump_data_version(user_id)
+        except Exception as e:
+            # A cache outage must never fail a write that has already committed.
+            logger.error(f"Failed to invalidate cached data for user {user_id}: {str(e)}")
+
+
+def _discard_changed_users(session, *args):
+    session.info.pop(CHANGED_USERS_KEY, None)
+
+
+def init_response_cache(app):
+    """Invalidate per-user cache generations whenever a write commits."""
+    get_bus().subscribe(VERSION_CHANNEL, _forget_version)
+    for name, listener in (
+        ('after_flush', _collect_changed_users),
+        ('after_commit', _bump_changed_users),
+        ('after_rollback', _discard_changed_users),
+    ):
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
+
+
+def _record(endpoint, hit):
+    with _stats_lock:
+        entry = _stats.setdefault(endpoint, {'hits': 0, 'misses': 0})
+        entry['hits' if hit else 'misses'] += 1
+
+
+def cache_stats():
+    """Per-endpoint hit/miss counts and ratios for this worker."""
+    with _stats_lock:
+        stats = {endpoint: dict(counts) for endpoint, counts in _stats.items()}
+    for counts in stats.values():
+        total = counts['hits'] + counts['misses']
+        counts['hit_ratio'] = round(counts['hits'] / total, 4) if total else 0.0
+    return stats
+
+
+def _request_signature(kwargs):
+    query = urlencode(sorted(request.args.items(multi=True)))
+    return f"{request.endpoint}:{kwargs}:{query}"
+
+
+def etag_response(view):
+    """Answer conditional GETs from the user's data version alone.
+
+    The tag covers the data version, endpoint, view args, query string, Accept
+    header (JSON vs NDJSON listings) and today's date in the user's time zone,
+    the same date the views window on ("this month" moves even when no data
+    does). A matching If-None-Match returns 304 after the time zone lookup
+    alone, which the view reuses for the rest of the request.
+    Apply below @jwt_required() and above @cached_response().
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user_id = get_jwt_identity()
+        accept = request.headers.get('Accept', '')
+        today = bucketing.user_today(user_id)
+        raw = f"{user_id}:{data_version(user_id)}:{today}:{accept}:{_request_signature(kwargs)}"
+        etag = hashlib.sha1(raw.encode()).hexdigest()[:32]
+
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+            response.set_etag(etag, weak=True)
+            return response
+
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    return wrapper
+
+
+def cached_response(timeout=None):
+    """Cache a JWT-protected GET view per user, endpoint and normalized query args.
+
+    Entries embed the user's data version in their key, so a committed write to
+    any of the user's transactions, budgets or categories makes them unreachable
+    without having to enumerate and delete them. Apply below @jwt_required().
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            user_id = get_jwt_identity()
+            endpoint = request.endpoint
+            # Dated like the ETag, so "this month" windows roll over at the user's midnight
+            today = bucketing.user_today(user_id)
+            key = f"view:{user_id}:{data_version(user_id)}:{today}:{_request_signature(kwargs)}"
+
+            cached = cache.get(key)
+            if cached is not None:
+                _record(endpoint, True)
+                body, mimetype = cached
+                response = make_response(body)
+                response.mimetype = mimetype
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            _record(endpoint, False)
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                cache.set(key, (response.get_data(), response.mimetype), timeout=timeout)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
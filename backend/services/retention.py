@@ -0,0 +1,116 @@
+"""Retention for append-only tables, in small index-driven batches.
+
+Each policy deletes rows whose timestamp column is older than its cutoff. A
+batch is one DELETE of at most `batch_size` ids picked in index order, in its
+own short transaction, followed by a pause, so row locks are held briefly and
+WAL/vacuum work is spread out. On PostgreSQL each batch also sets a lock
+timeout: if it would have to wait on OLTP writers it gives up, backs off and
+tries again rather than queueing behind them.
+"""
+
+from flask import current_app
+from extensions import db
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.exc import OperationalError
+from collections import namedtuple
+from datetime import datetime, timedelta
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# `column` must be indexed; `max_batches` bounds one run (None = until done).
+RetentionPolicy = namedtuple(
+    'RetentionPolicy',
+    ['name', 'model', 'column', 'max_age', 'batch_size', 'pause', 'max_batches'],
+    defaults=(1000, 0.1, None)
+)
+
+LOCK_TIMEOUT = '2s'
+MAX_LOCK_RETRIES = 5
+
+
+def default_policies():
+    from models import Notification
+    from services.email_service import EmailVerification
+
+    config = current_app.config
+    batch_size = config.get('RETENTION_BATCH_SIZE', 1000)
+    pause = config.get('RETENTION_PAUSE_SECONDS', 0.1)
+    return [
+        RetentionPolicy('notifications', Notification, Notification.created_at,
+                        timedelta(days=config.get('NOTIFICATION_RETENTION_DAYS', 30)), batch_size, pause),
+        # Codes expire after minutes; keep them a little longer for support lookups
+        RetentionPolicy('email_verification', EmailVerification, EmailVerification.expires_at,
+                        timedelta(days=config.get('EMAIL_VERIFICATION_RETENTION_DAYS', 1)), batch_size, pause),
+    ]
+
+
+def eligible_rows(policy, now=None):
+    """How many rows the policy would delete right now."""
+    cutoff = (now or datetime.utcnow()) - policy.max_age
+    return db.session.execute(
+        select(func.count()).select_from(policy.model).where(policy.column < cutoff)
+    ).scalar()
+
+
+def _delete_batch(policy, cutoff):
+    primary_key = policy.model.__mapper__.primary_key[0]
+    batch = select(primary_key).where(policy.column < cutoff).order_by(policy.column).limit(policy.batch_size)
+    if db.session.get_bind().dialect.name == 'postgresql':
+        db.session.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+    # Ids first, so the DELETE is a plain primary-key IN list on every dialect
+    ids = db.session.execute(batch).scalars().all()
+    if not ids:
+        return 0
+    deleted = db.session.execute(
+        delete(policy.model).where(primary_key.in_(ids)).execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return deleted
+
+
+def purge(policy, now=None, progress=None):
+    """Apply one policy in batches; returns the number of rows deleted.
+
+    `progress(policy, batches, deleted)` is called after every batch.
+    """
+    cutoff = (now or datetime.utcnow()) - policy.max_age
+    deleted = batches = retries = 0
+    while policy.max_batches is None or batches < policy.max_batches:
+        try:
+            count = _delete_batch(policy, cutoff)
+        except OperationalError as e:
+            db.session.rollback()
+            retries += 1
+            if retries > MAX_LOCK_RETRIES:
+                logger.warning(f"Retention {policy.name}: giving up after {retries - 1} retries ({str(e)})")
+                break
+            time.sleep(policy.pause * 2 ** retries)
+            continue
+        retries = 0
+        if not count:
+            db.session.rollback()
+            break
+        batches += 1
+        deleted += count
+        if progress:
+            progress(policy, batches, deleted)
+        if count < policy.batch_size:
+            break
+        time.sleep(policy.pause)
+    return deleted
+
+
+def run_retention(policies=None, now=None, progress=None):
+    """Apply every policy; returns {policy name: rows reclaimed}."""
+    now = now or datetime.utcnow()
+    reclaimed = {}
+    for policy in policies if policies is not None else default_policies():
+        started = time.perf_counter()
+        reclaimed[policy.name] = purge(policy, now, progress)
+        logger.info(
+            f"Retention {policy.name}: {reclaimed[policy.name]} rows reclaimed "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+    return reclaimed
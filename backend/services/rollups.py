@@ -0,0 +1,241 @@
+from extensions import db
+from models import Transaction, MonthlyRollup
+from sqlalchemy import func, select, delete, insert, and_
+from services import bucketing
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Keeps multi-row upserts under SQLite's bound-parameter limit.
+UPSERT_CHUNK_SIZE = 100
+
+
+def month_key(value):
+    """'YYYY-MM' bucket for a date."""
+    return bucketing.bucket_key(value, 'month')
+
+
+def month_key_expr(column):
+    """SQL expression producing the same 'YYYY-MM' bucket as month_key()."""
+    return bucketing.bucket_key_expr(column, 'month')
+
+
+def _upsert_insert():
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+
+def apply_deltas(deltas):
+    """Add amount/count deltas to the rollup rows, creating them as needed.
+
+    `deltas` maps (user_id, category_id, type, year_month) -> (amount, count).
+    Rows whose count drops to zero are deleted, so a category with no
+    transactions left has no rollup rows pinning it. Runs in the caller's
+    session so it commits or rolls back with the ledger write.
+    """
+    rows = [
+        {
+            'user_id': int(user_id),
+            'category_id': int(category_id),
+            'type': txn_type,
+            'year_month': year_month,
+            'total': amount,
+            'count': count
+        }
+        for (user_id, category_id, txn_type, year_month), (amount, count) in deltas.items()
+        if amount or count
+    ]
+    if not rows:
+        return
+
+    dialect_insert = _upsert_insert()
+    if dialect_insert is None:
+        for row in rows:
+            _apply_delta_fallback(row)
+    else:
+        for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = dialect_insert(MonthlyRollup).values(rows[i:i + UPSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['user_id', 'category_id', 'type', 'year_month'],
+                set_={
+                    'total': MonthlyRollup.total + stmt.excluded.total,
+                    'count': MonthlyRollup.count + stmt.excluded.count
+                }
+            )
+            db.session.execute(stmt)
+
+    # Only removals can empty a row
+    emptied_users = {row['user_id'] for row in rows if row['count'] < 0}
+    if emptied_users:
+        db.session.execute(
+            delete(MonthlyRollup).where(
+                MonthlyRollup.user_id.in_(sorted(emptied_users)),
+                MonthlyRollup.count <= 0
+            ).execution_options(synchronize_session=False)
+        )
+
+
+def _apply_delta_fallback(row):
+    key = and_(
+        MonthlyRollup.user_id == row['user_id'],
+        MonthlyRollup.category_id == row['category_id'],
+        MonthlyRollup.type == row['type'],
+        MonthlyRollup.year_month == row['year_month']
+    )
+    result = db.session.execute(
+        MonthlyRollup.__table__.update().where(key).values(
+            total=MonthlyRollup.total + row['total'],
+            count=MonthlyRollup.count + row['count']
+        )
+    )
+    if result.rowcount == 0:
+        db.session.execute(insert(MonthlyRollup).values(**row))
+
+
+def _ledger_totals(user_id=None):
+    month_expr = month_key_expr(Transaction.date)
+    query = select(
+        Transaction.user_id,
+        Transaction.category_id,
+        Transaction.type,
+        month_expr.label('year_month'),
+        func.sum(Transaction.amount).label('total'),
+        func.count(Transaction.id).label('count')
+    ).group_by(Transaction.user_id, Transaction.category_id, Transaction.type, month_expr)
+    if user_id is not None:
+        query = query.where(Transaction.user_id == user_id)
+    return query
+
+
+def rebuild_rollups(user_id=None):
+    """Recompute rollup rows from the ledger (for one user or everyone)."""
+    clear = delete(MonthlyRollup)
+    if user_id is not None:
+        clear = clear.where(MonthlyRollup.user_id == user_id)
+    db.session.execute(clear)
+    result = db.session.execute(
+        insert(MonthlyRollup).from_select(
+            ['user_id', 'category_id', 'type', 'year_month', 'total', 'count'],
+            _ledger_totals(user_id)
+        )
+    )
+    db.session.commit()
+    logger.info(f"Rebuilt monthly rollups ({result.rowcount} rows) for {'user ' + str(user_id) if user_id else 'all users'}")
+    return result.rowcount
+
+
+def verify_rollups(user_id=None, tolerance=0.005):
+    """Compare rollups with the ledger; returns a list of mismatched keys."""
+    expected = {
+        (r.user_id, r.category_id, r.type, r.year_month): (r.total or 0.0, r.count)
+        for r in db.session.execute(_ledger_totals(user_id))
+    }
+    query = select(MonthlyRollup).where(MonthlyRollup.count != 0)
+    if user_id is not None:
+        query = query.where(MonthlyRollup.user_id == user_id)
+    actual = {
+        (r.user_id, r.category_id, r.type, r.year_month): (r.total, r.count)
+        for r in db.session.execute(query).scalars()
+    }
+
+    mismatches = []
+    for key in expected.keys() | actual.keys():
+        want_total, want_count = expected.get(key, (0.0, 0))
+        got_total, got_count = actual.get(key, (0.0, 0))
+        if want_count != got_count or abs(want_total - got_total) > tolerance:
+            mismatches.append({
+                'key': key,
+                'expected': {'total': want_total, 'count': want_count},
+                'actual': {'total': got_total, 'count': got_count}
+            })
+    return mismatches
+
+
+def _month_filters(user_id, start_month=None, end_month=None, txn_type=None):
+    filters = [MonthlyRollup.user_id == user_id, MonthlyRollup.count != 0]
+    if txn_type:
+        filters.append(MonthlyRollup.type == txn_type)
+    if start_month:
+        filters.append(MonthlyRollup.year_month >= start_month)
+    if end_month:
+        filters.append(MonthlyRollup.year_month <= end_month)
+    return filters
+
+
+def totals_by_type_query(user_id, start_month=None, end_month=None):
+    return select(
+        MonthlyRollup.type,
+        func.sum(MonthlyRollup.total)
+    ).where(*_month_filters(user_id, start_month, end_month)).group_by(MonthlyRollup.type)
+
+
+def totals_by_type(user_id, start_month=None, end_month=None):
+    """{'income': total, 'expense': total} for an inclusive 'YYYY-MM' range."""
+    rows = db.session.execute(totals_by_type_query(user_id, start_month, end_month)).all()
+    totals = {'income': 0.0, 'expense': 0.0}
+    totals.update({txn_type: total or 0.0 for txn_type, total in rows})
+    return totals
+
+
+def totals_by_category_query(user_id, txn_type, start_month=None, end_month=None, limit=None):
+    from models import Category
+    total = func.sum(MonthlyRollup.total)
+    query = select(Category.name, total.label('total')).join(
+        MonthlyRollup, Category.id == MonthlyRollup.category_id
+    ).where(
+        *_month_filters(user_id, start_month, end_month, txn_type)
+    ).group_by(Category.name).order_by(total.desc())
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
+def totals_by_category(user_id, txn_type, start_month=None, end_month=None, limit=None):
+    """[(category name, total)] ordered by total, largest first."""
+    return db.session.execute(
+        totals_by_category_query(user_id, txn_type, start_month, end_month, limit)
+    ).all()
+
+
+def totals_by_month_query(user_id, start_month=None, end_month=None):
+    return select(
+        MonthlyRollup.year_month,
+        MonthlyRollup.type,
+        func.sum(MonthlyRollup.total)
+    ).where(
+        *_month_filters(user_id, start_month, end_month)
+    ).group_by(MonthlyRollup.year_month, MonthlyRollup.type)
+
+
+def totals_by_month(user_id, start_month=None, end_month=None):
+    """{'YYYY-MM': {'income': total, 'expense': total}} for months with activity."""
+    rows = db.session.execute(totals_by_month_query(user_id, start_month, end_month)).all()
+    months = {}
+    for year_month, txn_type, total in rows:
+        months.setdefault(year_month, {'income': 0.0, 'expense': 0.0})[txn_type] = total or 0.0
+    return months
+
+
+def month_type_category_query(user_id, start_month=None, end_month=None):
+    from models import Category
+    return select(
+        MonthlyRollup.year_month.label('month'),
+        MonthlyRollup.type,
+        Category.name,
+        func.sum(MonthlyRollup.total).label('total')
+    ).join(
+        Category, Category.id == MonthlyRollup.category_id
+    ).where(
+        *_month_filters(user_id, start_month, end_month)
+    ).group_by(MonthlyRollup.year_month, MonthlyRollup.type, Category.name)
+
+
+def totals_by_month_type_category(user_id, start_month=None, end_month=None):
+    """(month, type, category name, total) rows: the finest grain the dashboard folds."""
+    return db.session.execute(month_type_category_query(user_id, start_month, end_month)).all()
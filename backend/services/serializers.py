@@ -0,0 +1,52 @@
+"""Precomputed field serializers for the models returned most often.
+
+Each serializer is built once from a fixed field list: one attrgetter pulls all
+values in a single C call, and date/datetime values are left as-is when the JSON
+provider encodes them natively. Output matches the models' to_dict().
+"""
+
+from datetime import date, datetime
+from operator import attrgetter
+from services.json_provider import NATIVE_DATES
+
+
+def field_serializer(fields):
+    fields = tuple(fields)
+    getter = attrgetter(*fields)
+
+    if NATIVE_DATES:
+        def serialize(obj):
+            return dict(zip(fields, getter(obj)))
+    else:
+        # The stdlib encoder would call back into Python for every date; format here instead.
+        def serialize(obj):
+            return {
+                name: value.isoformat() if isinstance(value, (date, datetime)) else value
+                for name, value in zip(fields, getter(obj))
+            }
+    return serialize
+
+
+TRANSACTION_FIELDS = ('id', 'user_id', 'category_id', 'amount', 'description', 'date',
+                      'type', 'created_at', 'updated_at')
+
+BUDGET_FIELDS = ('id', 'user_id', 'category_id', 'amount', 'spent', 'start_date', 'end_date',
+                 'alert_threshold', 'alert_enabled', 'created_at', 'updated_at')
+
+CATEGORY_FIELDS = ('id', 'user_id', 'name', 'color', 'icon', 'created_at', 'updated_at')
+
+SETTINGS_FIELDS = (
+    'id', 'user_id',
+    'bio', 'date_of_birth', 'occupation', 'location', 'profile_picture',
+    'two_factor_enabled', 'login_notifications', 'session_timeout',
+    'language', 'date_format', 'time_format', 'timezone',
+    'primary_currency', 'currency_display', 'decimal_separator', 'thousands_separator',
+    'decimal_places', 'show_currency_symbol',
+    'email_notifications', 'push_notifications', 'notification_frequency', 'quiet_hours',
+    'created_at', 'updated_at'
+)
+
+serialize_transaction = field_serializer(TRANSACTION_FIELDS)
+serialize_budget = field_serializer(BUDGET_FIELDS)
+serialize_category = field_serializer(CATEGORY_FIELDS)
+serialize_settings = field_serializer(SETTINGS_FIELDS)
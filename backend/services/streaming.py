@@ -0,0 +1,63 @@
+from flask import Response, current_app, request, stream_with_context
+from extensions import db
+import logging
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_CHUNK_SIZE = 500
+
+
+def wants_stream():
+    """True when the client asked for a streamed listing (?stream=1 or NDJSON)."""
+    return request.args.get('stream', type=int) == 1 or wants_ndjson()
+
+
+def wants_ndjson():
+    """True only when Accept names NDJSON itself and ranks it above JSON.
+
+    Wildcards (*/*, the fetch/curl/requests default) and ties keep the JSON
+    array that non-streaming clients expect.
+    """
+    accept = request.accept_mimetypes
+    if not any(value.lower() == NDJSON_MIMETYPE and quality > 0 for value, quality in accept):
+        return False
+    return accept.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def stream_rows(statement, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    """Stream a query result as a JSON array, or NDJSON when the client accepts it.
+
+    Rows are pulled from a server-side cursor `chunk_size` at a time with
+    yield_per and written out chunk by chunk, so worker memory stays flat no
+    matter how many rows match.
+    """
+    ndjson = wants_ndjson()
+    dumps = current_app.json.dumps
+
+    def generate():
+        result = db.session.execute(statement.execution_options(yield_per=chunk_size))
+        first = True
+        if not ndjson:
+            yield '['
+        try:
+            for partition in result.partitions():
+                encoded = [dumps(serialize(row)) for row in partition]
+                if ndjson:
+                    yield '\n'.join(encoded) + '\n'
+                else:
+                    yield ('' if first else ',') + ','.join(encoded)
+                first = False
+        except Exception as e:
+            # Headers are already sent, so the status code can no longer change.
+            logger.error(f"Error while streaming rows: {str(e)}")
+            raise
+        finally:
+            result.close()
+        if not ndjson:
+            yield ']'
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=NDJSON_MIMETYPE if ndjson else 'application/json'
+    )
@@ -0,0 +1,169 @@
+"""Background tasks with retries, exponential backoff and a dead-letter table.
+
+Tasks are plain functions registered with @task(name); `fn.delay(...)` queues
+a call and returns at once. Arguments must be JSON-serializable (ids rather
+than ORM objects), since with Celery they travel through the broker. Each
+attempt runs in its own app context. A failing call is retried after
+backoff * 2**attempt seconds (capped at max_backoff); once max_retries is
+exhausted it is written to dead_letter_task instead of being lost.
+
+TASK_QUEUE_BACKEND picks the runner: 'local' (default) uses an in-process
+thread pool, for development and tests; 'celery' hands calls to Celery workers
+through TASK_QUEUE_BROKER_URL (run them with `celery -A worker.celery worker`).
+"""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import random
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+TaskSpec = namedtuple('TaskSpec', ['name', 'func', 'max_retries', 'backoff', 'max_backoff'])
+
+_registry = {}
+
+
+def retry_delay(spec, attempt):
+    """Seconds to wait before retry number `attempt + 1`, with a little jitter."""
+    delay = min(spec.max_backoff, spec.backoff * 2 ** attempt)
+    return delay + random.uniform(0, delay / 10)
+
+
+def task(name, max_retries=3, backoff=2.0, max_backoff=300):
+    """Register a background task; the function gains .delay(*args, **kwargs)."""
+    def decorator(func):
+        _registry[name] = TaskSpec(name, func, max_retries, backoff, max_backoff)
+        func.delay = lambda *args, **kwargs: enqueue(name, *args, **kwargs)
+        return func
+    return decorator
+
+
+def record_dead_letter(spec, args, kwargs, error, attempts):
+    from extensions import db
+    from models import DeadLetterTask
+
+    logger.error(f"Task {spec.name} failed after {attempts} attempts: {str(error)}")
+    try:
+        db.session.rollback()
+        db.session.add(DeadLetterTask(
+            task_name=spec.name, args=list(args), kwargs=dict(kwargs),
+            attempts=attempts, error=f"{type(error).__name__}: {error}"
+        ))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Failed to record dead letter for {spec.name}: {str(e)}")
+
+
+class LocalQueue:
+    """Runs tasks on an in-process thread pool; retries wait on timers, not workers."""
+
+    def __init__(self, app, workers):
+        self.app = app
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='task-queue')
+        self._pending = 0
+        self._idle = threading.Condition()
+
+    def submit(self, name, args, kwargs):
+        with self._idle:
+            self._pending += 1
+        self._dispatch(name, args, kwargs, 0)
+
+    def _dispatch(self, name, args, kwargs, attempt):
+        self._executor.submit(self._run, name, args, kwargs, attempt)
+
+    def _run(self, name, args, kwargs, attempt):
+        spec = _registry[name]
+        with self.app.app_context():
+            try:
+                spec.func(*args, **kwargs)
+            except Exception as e:
+                if attempt < spec.max_retries:
+                    delay = retry_delay(spec, attempt)
+                    logger.warning(f"Task {name} failed (attempt {attempt + 1}), retrying in {delay:.1f}s: {str(e)}")
+                    timer = threading.Timer(delay, self._dispatch, args=(name, args, kwargs, attempt + 1))
+                    timer.daemon = True
+                    timer.start()
+                    return
+                record_dead_letter(spec, args, kwargs, e, attempt + 1)
+        with self._idle:
+            self._pending -= 1
+            self._idle.notify_all()
+
+    def join(self, timeout=None):
+        """Wait until every queued task (including pending retries) has finished."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+class CeleryQueue:
+    """Hands tasks to Celery workers; one generic Celery task runs any registered task."""
+
+    def __init__(self, app, broker_url):
+        try:
+            from celery import Celery
+        except ImportError:
+            raise RuntimeError("TASK_QUEUE_BACKEND=celery requires the celery package")
+        self.app = app
+        self.celery = Celery(app.import_name, broker=broker_url)
+        # Redeliver tasks whose worker died mid-run instead of dropping them
+        self.celery.conf.update(task_acks_late=True, task_reject_on_worker_lost=True)
+
+        @self.celery.task(bind=True, name='task_queue.run', max_retries=None)
+        def run(celery_task, name, args, kwargs):
+            spec = _registry[name]
+            attempt = celery_task.request.retries
+            with app.app_context():
+                try:
+                    spec.func(*args, **kwargs)
+                except Exception as e:
+                    if attempt < spec.max_retries:
+                        raise celery_task.retry(exc=e, countdown=retry_delay(spec, attempt))
+                    record_dead_letter(spec, args, kwargs, e, attempt + 1)
+
+        self._run = run
+
+    def submit(self, name, args, kwargs):
+        self._run.apply_async(args=(name, list(args), dict(kwargs)))
+
+    def join(self, timeout=None):
+        return True
+
+    def close(self):
+        pass
+
+
+_queue = None
+
+
+def get_queue():
+    if _queue is None:
+        raise RuntimeError("Task queue is not initialised; call init_task_queue(app)")
+    return _queue
+
+
+def enqueue(name, *args, **kwargs):
+    if name not in _registry:
+        raise KeyError(f"Unknown task {name}")
+    get_queue().submit(name, args, kwargs)
+
+
+def init_task_queue(app):
+    global _queue
+    backend = app.config.get('TASK_QUEUE_BACKEND', 'local')
+    if backend == 'celery':
+        queue = CeleryQueue(app, app.config['TASK_QUEUE_BROKER_URL'])
+    elif backend == 'local':
+        queue = LocalQueue(app, app.config.get('TASK_QUEUE_WORKERS', 4))
+    else:
+        raise ValueError(f"Unknown TASK_QUEUE_BACKEND {backend!r}; use 'local' or 'celery'")
+    if _queue is not None:
+        _queue.close()
+    _queue = queue
+    app.extensions['task_queue'] = queue
+    return queue
@@ -22,7 +22,11 @@ setup(
         "celery==5.3.6",
         "pandas==2.2.3",
     ],
-    python_requires=">=3.8",
+    extras_require={
+        # Parquet export (/api/export/...?format=parquet); without it that format returns 501
+        "parquet": ["pyarrow==15.0.2"],
+    },
+    python_requires=">=3.9",
     setup_requires=[
         "wheel==0.42.0",
         "setuptools==69.0.3",
@@ -1,116 +1,86 @@
 from flask import current_app
 from extensions import db
-from models.budget import Budget
-from models.notification import Notification
-from models.transaction import Transaction
 from datetime import datetime, timedelta
 import logging
-from sqlalchemy import func
+import time
 
 logger = logging.getLogger(__name__)
 
+ANOMALY_LOOKBACK = timedelta(hours=26)
+
 def check_budget_alerts():
     """Check all active budgets for alerts"""
     try:
         with current_app.app_context():
-            # Get all active budgets
-            today = datetime.utcnow().date()
-            active_budgets = Budget.query.filter(
-                Budget.start_date <= today,
-                Budget.end_date >= today,
-                Budget.alert_enabled == True
-            ).all()
-            
-            for budget in active_budgets:
-                # Calculate current spending
-                current_spending = db.session.query(
-                    func.sum(Transaction.amount)
-                ).filter(
-                    Transaction.user_id == budget.user_id,
-                    Transaction.category_id == budget.category_id,
-                    Transaction.type == 'expense',
-                    Transaction.date >= budget.start_date,
-                    Transaction.date <= today
-                ).scalar() or 0
-                
-                # Check for alert
-                alert_data = budget.check_alert(current_spending)
-                if alert_data:
-                    # Add category name to alert data
-                    alert_data['category_name'] = budget.category.name
-                    
-                    # Create notification
-                    notification = Notification.create_budget_alert(
-                        budget.user_id,
-                        alert_data
-                    )
-                    db.session.add(notification)
-            
+            from services.budget_alerts import evaluate_budget_alerts
+
+            started = time.perf_counter()
+            evaluated, sent = evaluate_budget_alerts()
             db.session.commit()
-            logger.info("Budget alerts checked successfully")
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"Budget alerts checked successfully ({evaluated} budgets, {sent} alerts sent "
+                f"in {elapsed:.2f}s, {evaluated / elapsed if elapsed else 0:.0f} rows/s)"
+            )
             
     except Exception as e:
         logger.error(f"Error checking budget alerts: {str(e)}")
         db.session.rollback()
 
+def detect_transaction_anomalies():
+    """Flag unusually large expenses recorded since the previous run"""
+    try:
+        with current_app.app_context():
+            from services.anomalies import detect_anomalies
+
+            started = time.perf_counter()
+            # A little over the 24h interval; already-flagged transactions are skipped
+            flagged = detect_anomalies(datetime.utcnow() - ANOMALY_LOOKBACK)
+            db.session.commit()
+            logger.info(f"Transaction anomalies checked successfully ({flagged} flagged in {time.perf_counter() - started:.2f}s)")
+
+    except Exception as e:
+        logger.error(f"Error detecting transaction anomalies: {str(e)}")
+        db.session.rollback()
+
 def generate_daily_reports():
     """Generate daily reports for all users"""
     try:
         with current_app.app_context():
+            from services.daily_reports import generate_daily_reports as generate
+
+            started = time.perf_counter()
             # Get yesterday's date
             yesterday = datetime.utcnow().date() - timedelta(days=1)
-            
-            # Get all users with transactions
-            users_with_transactions = db.session.query(
-                Transaction.user_id
-            ).filter(
-                func.date(Transaction.date) == yesterday
-            ).distinct().all()
-            
-            for user_id, in users_with_transactions:
-                # Get daily summary
-                daily_summary = db.session.query(
-                    func.sum(Transaction.amount).filter(Transaction.type == 'income').label('total_income'),
-                    func.sum(Transaction.amount).filter(Transaction.type == 'expense').label('total_expense')
-                ).filter(
-                    Transaction.user_id == user_id,
-                    func.date(Transaction.date) == yesterday
-                ).first()
-                
-                if daily_summary:
-                    # Create daily report notification
-                    notification = Notification.create_system_notification(
-                        user_id=user_id,
-                        title='Daily Summary',
-                        message=f'Yesterday\'s Summary:\nIncome: {daily_summary.total_income or 0}\nExpenses: {daily_summary.total_expense or 0}',
-                        metadata={
-                            'date': yesterday.isoformat(),
-                            'total_income': daily_summary.total_income or 0,
-                            'total_expense': daily_summary.total_expense or 0
-                        }
-                    )
-                    db.session.add(notification)
-            
-            db.session.commit()
-            logger.info("Daily reports generated successfully")
+            notified = generate(yesterday)
+            logger.info(f"Daily reports generated successfully ({notified} users in {time.perf_counter() - started:.2f}s)")
             
     except Exception as e:
         logger.error(f"Error generating daily reports: {str(e)}")
         db.session.rollback()
 
-def cleanup_old_notifications():
-    """Remove notifications older than 30 days"""
+def apply_retention_policies():
+    """Purge expired notifications and verification codes in small batches"""
     try:
         with current_app.app_context():
-            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            
-            Notification.query.filter(
-                Notification.created_at < thirty_days_ago
-            ).delete()
-            
-            db.session.commit()
-            logger.info("Old notifications cleaned up successfully")
-            
+            from services.retention import run_retention
+
+            reclaimed = run_retention()
+            logger.info(f"Retention applied successfully ({', '.join(f'{name}: {rows}' for name, rows in reclaimed.items())})")
+
     except Exception as e:
-        logger.error(f"Error cleaning up old notifications: {str(e)}")
-        db.session.rollback() 
\ No newline at end of file
+        logger.error(f"Error applying retention policies: {str(e)}")
+        db.session.rollback()
+
+def reconcile_budget_spend():
+    """Repair Budget.spent values that drifted from the ledger"""
+    try:
+        with current_app.app_context():
+            from services.budget_spend import reconcile_budget_spend as reconcile
+
+            repaired = reconcile()
+            logger.info(f"Budget spend reconciled successfully ({repaired} budgets repaired)")
+
+    except Exception as e:
+        logger.error(f"Error reconciling budget spend: {str(e)}")
+        db.session.rollback()
@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# main builds the app at import time, so point it at a throwaway database first
+_db_fd, _db_path = tempfile.mkstemp(suffix='.db')
+os.close(_db_fd)
+os.environ['DATABASE_URL'] = f'sqlite:///{_db_path}'
+os.environ.setdefault('SCHEDULER_ENABLED', 'false')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+
+@event.listens_for(Engine, 'connect')
+def _enforce_foreign_keys(dbapi_connection, connection_record):
+    # SQLite leaves foreign keys unchecked unless asked, unlike PostgreSQL
+    if type(dbapi_connection).__module__.startswith('sqlite3'):
+        dbapi_connection.execute('PRAGMA foreign_keys=ON')
+
+
+from main import app as flask_app  # noqa: E402
+from extensions import db  # noqa: E402
+from models import User, Category  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def app():
+    flask_app.config['TESTING'] = True
+    yield flask_app
+    os.remove(_db_path)
+
+
+@pytest.fixture
+def user(app):
+    """A fresh verified user with Food and Salary categories; yields (user_id, {name: category_id})."""
+    with app.app_context():
+        user = User(name='Test', email=f'{uuid.uuid4().hex}@example.com',
+                    password_hash='x', is_email_verified=True)
+        db.session.add(user)
+        db.session.commit()
+        categories = [Category(user_id=user.id, name=name, color='#ffffff', icon='tag')
+                      for name in ('Food', 'Salary')]
+        db.session.add_all(categories)
+        db.session.commit()
+        return user.id, {category.name: category.id for category in categories}
+
+
+@pytest.fixture
+def client(app, user):
+    """Test client whose requests carry the `user` fixture's access token."""
+    with app.app_context():
+        token = create_access_token(identity=str(user[0]))
+    client = app.test_client()
+    client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    return client
@@ -0,0 +1,21 @@
+import pytest
+
+from extensions import db
+from models import User
+
+ADMIN_ENDPOINTS = ['/api/cache/stats', '/api/scheduler/jobs']
+
+
+@pytest.mark.parametrize('path', ADMIN_ENDPOINTS)
+def test_regular_users_are_refused(client, path):
+    response = client.get(path)
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize('path', ADMIN_ENDPOINTS)
+def test_admins_can_read(app, client, user, monkeypatch, path):
+    with app.app_context():
+        email = db.session.get(User, user[0]).email
+    monkeypatch.setitem(app.config, 'ADMIN_EMAILS', {email})
+    response = client.get(path)
+    assert response.status_code == 200
@@ -0,0 +1,122 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from extensions import db
+from models import Transaction
+from models.settings import Settings
+from services import bucketing
+from services.bucketing import (
+    bucket_key, bucket_key_expr, bucket_start, buckets_between, date_range, densify, shift, window
+)
+from tests.test_etags import FrozenDatetime
+
+# Dates around ISO-week, month, quarter and year edges (2026-01-01 is a Thursday)
+BOUNDARY_DATES = [
+    date(2025, 12, 28), date(2025, 12, 29), date(2025, 12, 31), date(2026, 1, 1), date(2026, 1, 4),
+    date(2026, 1, 5), date(2026, 3, 31), date(2026, 4, 1), date(2026, 6, 30), date(2026, 7, 1),
+    date(2024, 2, 29), date(2026, 12, 31),
+]
+
+
+@pytest.mark.parametrize('value, unit, start', [
+    (date(2026, 1, 1), 'week', date(2025, 12, 29)),
+    (date(2026, 1, 4), 'week', date(2025, 12, 29)),
+    (date(2026, 1, 5), 'week', date(2026, 1, 5)),
+    (date(2026, 3, 31), 'quarter', date(2026, 1, 1)),
+    (date(2026, 4, 1), 'quarter', date(2026, 4, 1)),
+    (date(2026, 12, 31), 'quarter', date(2026, 10, 1)),
+    (date(2026, 12, 31), 'year', date(2026, 1, 1)),
+    (date(2024, 2, 29), 'month', date(2024, 2, 1)),
+])
+def test_bucket_start_at_boundaries(value, unit, start):
+    assert bucket_start(value, unit) == start
+
+
+@pytest.mark.parametrize('value, unit, key', [
+    (date(2026, 1, 1), 'week', '2025-12-29'),
+    (date(2026, 3, 31), 'quarter', '2026-Q1'),
+    (date(2026, 4, 1), 'quarter', '2026-Q2'),
+    (date(2025, 12, 31), 'year', '2025'),
+    (date(2026, 1, 1), 'month', '2026-01'),
+])
+def test_bucket_key_at_boundaries(value, unit, key):
+    assert bucket_key(value, unit) == key
+
+
+def test_shift_and_window_cross_year_end():
+    assert shift(date(2026, 10, 1), 'quarter') == date(2027, 1, 1)
+    assert shift(date(2026, 1, 1), 'month', -1) == date(2025, 12, 1)
+    assert window('quarter', 2, date(2026, 2, 10)) == (date(2025, 10, 1), date(2026, 3, 31))
+    assert buckets_between(date(2025, 12, 31), date(2026, 1, 5), 'week') == [date(2025, 12, 29), date(2026, 1, 5)]
+
+
+def test_unknown_unit_is_rejected():
+    with pytest.raises(ValueError):
+        bucket_start(date(2026, 1, 1), 'fortnight')
+
+
+def test_date_range_includes_both_ends(app, user):
+    user_id, categories = user
+    with app.app_context():
+        db.session.add_all([
+            Transaction(user_id=user_id, category_id=categories['Food'], amount=1.0, type='expense', date=day)
+            for day in (date(2026, 1, 31), date(2026, 2, 1), date(2026, 2, 28), date(2026, 3, 1))
+        ])
+        db.session.commit()
+        dates = db.session.execute(
+            select(Transaction.date).where(
+                Transaction.user_id == user_id, *date_range(Transaction.date, date(2026, 2, 1), date(2026, 2, 28))
+            ).order_by(Transaction.date)
+        ).scalars().all()
+    assert dates == [date(2026, 2, 1), date(2026, 2, 28)]
+
+
+def test_densify_fills_missing_buckets():
+    starts = buckets_between(date(2026, 1, 1), date(2026, 3, 31), 'month')
+    totals = {'2026-02': {'income': 0.0, 'expense': 5.0}}
+    assert densify(totals, starts, 'month', lambda: {'income': 0.0, 'expense': 0.0}) == [
+        (date(2026, 1, 1), {'income': 0.0, 'expense': 0.0}),
+        (date(2026, 2, 1), {'income': 0.0, 'expense': 5.0}),
+        (date(2026, 3, 1), {'income': 0.0, 'expense': 0.0}),
+    ]
+
+
+@pytest.mark.parametrize('unit', bucketing.UNITS)
+def test_sql_bucket_keys_match_python(app, user, unit):
+    user_id, categories = user
+    with app.app_context():
+        db.session.add_all([
+            Transaction(user_id=user_id, category_id=categories['Food'], amount=1.0, type='expense', date=day)
+            for day in BOUNDARY_DATES
+        ])
+        db.session.commit()
+        rows = db.session.execute(
+            select(Transaction.date, bucket_key_expr(Transaction.date, unit)).where(Transaction.user_id == user_id)
+        ).all()
+    assert len(rows) == len(BOUNDARY_DATES)
+    assert {day: key for day, key in rows} == {day: bucket_key(day, unit) for day in BOUNDARY_DATES}
+
+
+def test_user_today_follows_the_users_midnight(app, user, monkeypatch):
+    user_id, _ = user
+    with app.app_context():
+        db.session.add(Settings(user_id=user_id, timezone='America/Los_Angeles'))
+        db.session.commit()
+    monkeypatch.setattr(bucketing, 'datetime', FrozenDatetime)
+
+    with app.test_request_context():
+        # 23:30 on Dec 31st in Los Angeles, already New Year's Day in UTC
+        FrozenDatetime.utc_now = datetime(2026, 1, 1, 7, 30, tzinfo=timezone.utc)
+        assert bucketing.user_today(user_id) == date(2025, 12, 31)
+        FrozenDatetime.utc_now = datetime(2026, 1, 1, 8, 30, tzinfo=timezone.utc)
+        assert bucketing.user_today(user_id) == date(2026, 1, 1)
+
+
+def test_user_today_falls_back_to_utc(app, user, monkeypatch):
+    user_id, _ = user
+    monkeypatch.setattr(bucketing, 'datetime', FrozenDatetime)
+    FrozenDatetime.utc_now = datetime(2026, 1, 1, 7, 30, tzinfo=timezone.utc)
+    with app.test_request_context():
+        assert bucketing.user_today(user_id) == date(2026, 1, 1)
@@ -0,0 +1,29 @@
+from sqlalchemy import update
+
+from extensions import db
+from models import Budget
+from services.budget_spend import reconcile_budget_spend
+
+
+def test_reconcile_invalidates_cached_budget_views(app, client, user):
+    user_id, categories = user
+    assert client.post('/api/budgets', json={
+        'category_id': categories['Food'], 'amount': 100,
+        'start_date': '2026-01-01', 'end_date': '2026-12-31'
+    }).status_code == 201
+    assert client.post('/api/transactions', json={
+        'amount': 40, 'category_id': categories['Food'], 'type': 'expense', 'date': '2026-02-01'
+    }).status_code == 201
+
+    first = client.get('/api/dashboard')
+    assert first.get_json()['budgetStatus'][0]['spent'] == 40
+    etag = first.headers['ETag']
+
+    with app.app_context():
+        # Drift that bypasses the ORM, as a lost delta would
+        db.session.execute(update(Budget).where(Budget.user_id == user_id).values(spent=5.0))
+        db.session.commit()
+        assert reconcile_budget_spend() == 1
+
+    assert client.get('/api/dashboard', headers={'If-None-Match': etag}).status_code == 200
+    assert client.get('/api/dashboard').get_json()['budgetStatus'][0]['spent'] == 40
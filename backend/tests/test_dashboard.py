@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import event
+
+from extensions import db
+
+
+@pytest.fixture
+def statements(app):
+    """SQL statements executed while the test runs."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
+
+
+def seed(client, categories, count, budget=False):
+    for i in range(count):
+        category = 'Food' if i % 2 else 'Salary'
+        response = client.post('/api/transactions', json={
+            'amount': 10.0 + i, 'category_id': categories[category],
+            'type': 'expense' if category == 'Food' else 'income',
+            'date': f'2026-{1 + i % 6:02d}-{1 + i % 27:02d}', 'description': f'seed {i}'
+        })
+        assert response.status_code == 201
+    if not budget:
+        return
+    response = client.post('/api/budgets', json={
+        'category_id': categories['Food'], 'amount': 500,
+        'start_date': '2026-01-01', 'end_date': '2026-12-31'
+    })
+    assert response.status_code == 201
+
+
+@pytest.mark.parametrize('query', ['', '?timeframe=custom&start_date=2026-01-03&end_date=2026-05-20'])
+def test_dashboard_query_count_is_fixed(client, user, statements, query):
+    seed(client, user[1], 3, budget=True)
+    statements.clear()
+    small = client.get(f'/api/dashboard{query}')
+    assert small.status_code == 200
+    small_count = len(statements)
+
+    seed(client, user[1], 40)
+    statements.clear()
+    large = client.get(f'/api/dashboard{query}')
+    assert large.status_code == 200
+    assert large.headers['X-Cache'] == 'MISS'
+
+    # Time zone, one aggregate pass, recent transactions and budget status
+    assert len(statements) == small_count <= 4
+    payload = large.get_json()
+    assert len(payload['recentTransactions']) == 5
+    assert payload['budgetStatus'][0]['category'] == 'Food'
@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from extensions import db
+from models.settings import Settings
+from services import bucketing
+
+
+class FrozenDatetime(datetime):
+    utc_now = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.utc_now.astimezone(tz)
+
+
+def test_etag_rolls_over_at_the_users_midnight(app, client, user, monkeypatch):
+    with app.app_context():
+        db.session.add(Settings(user_id=user[0], timezone='Asia/Tokyo'))
+        db.session.commit()
+    monkeypatch.setattr(bucketing, 'datetime', FrozenDatetime)
+
+    # 23:59 in Tokyo
+    FrozenDatetime.utc_now = datetime(2026, 3, 31, 14, 59, tzinfo=timezone.utc)
+    first = client.get('/api/reports/summary')
+    assert first.get_json()['month'] == 3
+    etag = first.headers['ETag']
+    assert client.get('/api/reports/summary', headers={'If-None-Match': etag}).status_code == 304
+
+    # 00:01 on April 1st in Tokyo, still March 31st in UTC
+    FrozenDatetime.utc_now = datetime(2026, 3, 31, 15, 1, tzinfo=timezone.utc)
+    second = client.get('/api/reports/summary', headers={'If-None-Match': etag})
+    assert second.status_code == 200
+    assert second.get_json()['month'] == 4
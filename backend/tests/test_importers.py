@@ -0,0 +1,101 @@
+import io
+
+from models import Budget
+from services.importers import parse_ofx, parse_qif
+from tests.test_rollups import rollup_rows
+
+SGML_OFX = """OFXHEADER:100
+DATA:OFXSGML
+
+<OFX>
+<BANKMSGSRSV1><STMTTRNRS><STMTRS>
+<BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20260105120000
+<TRNAMT>-12.50
+<NAME>Grocer
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20260107
+<TRNAMT>-7.50
+<MEMO>Bakery
+</BANKTRANLIST>
+</STMTRS></STMTTRNRS></BANKMSGSRSV1>
+</OFX>
+"""
+
+ONE_LINE_OFX = (
+    '<?xml version="1.0"?><OFX><BANKTRANLIST>'
+    '<STMTTRN><TRNTYPE>DEBIT</TRNTYPE><DTPOSTED>20260105</DTPOSTED><TRNAMT>-12.50</TRNAMT><NAME>Grocer</NAME></STMTTRN>'
+    '<STMTTRN><TRNTYPE>DEBIT</TRNTYPE><DTPOSTED>20260107</DTPOSTED><TRNAMT>-7.50</TRNAMT><NAME>Bakery</NAME></STMTTRN>'
+    '<STMTTRN><TRNTYPE>CREDIT</TRNTYPE><DTPOSTED>20260120</DTPOSTED><TRNAMT>100.00</TRNAMT><NAME>Refund</NAME></STMTTRN>'
+    '</BANKTRANLIST></OFX>'
+)
+
+QIF = """!Type:Bank
+D01/05/2026
+T-12.50
+PGrocer
+LFood
+^
+D01/07/2026
+T-7.50
+MBakery
+^
+"""
+
+
+def parsed(parser, text):
+    return [(line, row['date'], row['amount'], row['description']) for line, row in parser(io.StringIO(text))]
+
+
+def test_sgml_ofx_closes_blocks_on_next_transaction():
+    assert parsed(parse_ofx, SGML_OFX) == [
+        (7, '20260105', '-12.50', 'Grocer'),
+        (12, '20260107', '-7.50', 'Bakery'),
+    ]
+
+
+def test_one_line_ofx_yields_every_transaction():
+    assert parsed(parse_ofx, ONE_LINE_OFX) == [
+        (1, '20260105', '-12.50', 'Grocer'),
+        (1, '20260107', '-7.50', 'Bakery'),
+        (1, '20260120', '100.00', 'Refund'),
+    ]
+
+
+def test_multi_line_xml_ofx_matches_one_line():
+    multi_line = ONE_LINE_OFX.replace('><', '>\n<')
+    assert [row[1:] for row in parsed(parse_ofx, multi_line)] == [row[1:] for row in parsed(parse_ofx, ONE_LINE_OFX)]
+
+
+def test_qif_records():
+    rows = list(parse_qif(io.StringIO(QIF)))
+    assert [(line, row['date'], row['amount'], row['description'], row['category']) for line, row in rows] == [
+        (2, '01/05/2026', '-12.50', 'Grocer', 'Food'),
+        (7, '01/07/2026', '-7.50', 'Bakery', None),
+    ]
+
+
+def test_import_updates_rollups_and_budget_spend(app, client, user):
+    user_id, categories = user
+    food = categories['Food']
+    assert client.post('/api/budgets', json={
+        'category_id': food, 'amount': 100, 'start_date': '2026-01-01', 'end_date': '2026-01-31'
+    }).status_code == 201
+
+    response = client.post('/api/transactions/import', data={
+        'file': (io.BytesIO(ONE_LINE_OFX.encode()), 'statement.ofx'),
+        'default_category_id': str(food),
+        'batch_size': '2',
+    }, content_type='multipart/form-data')
+    assert response.status_code == 201
+    assert response.get_json()['imported'] == 3
+
+    assert rollup_rows(app, user_id) == {
+        (food, 'expense', '2026-01'): (20.0, 2),
+        (food, 'income', '2026-01'): (100.0, 1),
+    }
+    with app.app_context():
+        assert Budget.query.filter_by(user_id=user_id).one().spent == 20.0
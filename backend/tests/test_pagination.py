@@ -0,0 +1,69 @@
+from datetime import date
+
+import pytest
+
+from services.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor, page_size_arg
+
+
+def add(client, category_id, amount, day, txn_type='expense'):
+    response = client.post('/api/transactions', json={
+        'amount': amount, 'category_id': category_id, 'type': txn_type, 'date': day
+    })
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def pages(client, query):
+    """Every row reachable by following next_cursor, as a list of pages of ids."""
+    result, cursor = [], None
+    while True:
+        url = f'/api/transactions?{query}' + (f'&cursor={cursor}' if cursor else '')
+        response = client.get(url)
+        assert response.status_code == 200
+        body = response.get_json()
+        result.append([row['id'] for row in body['transactions']])
+        cursor = body['next_cursor']
+        if cursor is None:
+            return result
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(date(2026, 1, 31), 1234)) == (date(2026, 1, 31), 1234)
+
+
+def test_page_size_arg():
+    assert page_size_arg(None) == 50
+    assert page_size_arg(10) == 10
+    assert page_size_arg(MAX_PAGE_SIZE + 1) == MAX_PAGE_SIZE
+    for value in (0, -3):
+        with pytest.raises(ValueError):
+            page_size_arg(value)
+
+
+def test_pages_cover_every_row_once_newest_first(client, user):
+    food = user[1]['Food']
+    # Two rows share a date so the id tie-break is exercised across a page edge
+    ids = [add(client, food, 1.0, day) for day in ('2026-01-01', '2026-01-02', '2026-01-02', '2026-01-03', '2026-01-04')]
+    assert pages(client, 'page_size=2') == [[ids[4], ids[3]], [ids[2], ids[1]], [ids[0]]]
+
+
+def test_filters_apply_to_every_page(client, user):
+    _, categories = user
+    expenses = [add(client, categories['Food'], 1.0, f'2026-02-0{day}') for day in range(1, 6)]
+    add(client, categories['Salary'], 100.0, '2026-02-03', 'income')
+    add(client, categories['Food'], 1.0, '2026-03-01')
+
+    query = 'page_size=2&type=expense&start_date=2026-02-01&end_date=2026-02-28'
+    assert pages(client, query) == [[expenses[4], expenses[3]], [expenses[2], expenses[1]], [expenses[0]]]
+
+
+@pytest.mark.parametrize('query', ['cursor=not-a-cursor', 'page_size=0', 'page_size=-1'])
+def test_bad_pagination_arguments_are_rejected(client, user, query):
+    response = client.get(f'/api/transactions?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_calendar_rejects_an_empty_page(client, user):
+    response = client.get('/api/calendar/transactions?year=2026&month=1&page_size=0')
+    assert response.status_code == 400
@@ -0,0 +1,22 @@
+import pytest
+
+from services.query_plans import check_query_plans, hot_queries, uses_index
+
+
+def test_hot_queries_stay_on_an_index(app):
+    with app.app_context():
+        results = check_query_plans()
+        assert set(results) == set(hot_queries())
+    scans = {name: plan for name, (ok, plan) in results.items() if not ok}
+    assert scans == {}
+
+
+@pytest.mark.parametrize('plan, ok', [
+    (['SEARCH transaction USING INDEX ix_transaction_user_date_id (user_id=?)'], True),
+    (['SCAN transaction USING COVERING INDEX ix_transaction_date_user'], True),
+    (['SCAN transaction'], False),
+    (['SCAN monthly_rollup'], False),
+    (['SCAN category'], True),
+])
+def test_uses_index_flags_full_scans(plan, ok):
+    assert uses_index(plan, 'sqlite') is ok
@@ -0,0 +1,51 @@
+from extensions import db
+from models import MonthlyRollup
+
+
+def rollup_rows(app, user_id):
+    with app.app_context():
+        return {
+            (row.category_id, row.type, row.year_month): (row.total, row.count)
+            for row in MonthlyRollup.query.filter_by(user_id=user_id)
+        }
+
+
+def add_transaction(client, category_id, amount, day='2026-01-15'):
+    response = client.post('/api/transactions', json={
+        'amount': amount, 'category_id': category_id, 'type': 'expense', 'date': day
+    })
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def test_rollup_row_is_removed_with_last_transaction(app, client, user):
+    user_id, categories = user
+    first = add_transaction(client, categories['Food'], 10.0)
+    second = add_transaction(client, categories['Food'], 5.0)
+    assert rollup_rows(app, user_id) == {(categories['Food'], 'expense', '2026-01'): (15.0, 2)}
+
+    assert client.delete(f'/api/transactions/{first}').status_code == 200
+    assert rollup_rows(app, user_id) == {(categories['Food'], 'expense', '2026-01'): (5.0, 1)}
+
+    assert client.delete(f'/api/transactions/{second}').status_code == 200
+    assert rollup_rows(app, user_id) == {}
+
+
+def test_moving_a_transaction_empties_the_old_month(app, client, user):
+    user_id, categories = user
+    transaction_id = add_transaction(client, categories['Food'], 10.0)
+    response = client.put(f'/api/transactions/{transaction_id}', json={'date': '2026-02-03'})
+    assert response.status_code == 200
+    assert rollup_rows(app, user_id) == {(categories['Food'], 'expense', '2026-02'): (10.0, 1)}
+
+
+def test_category_can_be_deleted_after_its_last_transaction(app, client, user):
+    user_id, categories = user
+    transaction_id = add_transaction(client, categories['Food'], 10.0)
+    assert client.delete(f"/api/categories/{categories['Food']}").status_code == 409
+
+    assert client.delete(f'/api/transactions/{transaction_id}').status_code == 200
+    response = client.delete(f"/api/categories/{categories['Food']}")
+    assert response.status_code == 200
+    with app.app_context():
+        assert db.session.query(MonthlyRollup).filter_by(category_id=categories['Food']).count() == 0
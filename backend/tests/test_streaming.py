@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+NDJSON = 'application/x-ndjson'
+
+
+@pytest.fixture
+def ledger(client, user):
+    for i in range(3):
+        response = client.post('/api/transactions', json={
+            'amount': 10 + i, 'category_id': user[1]['Food'], 'type': 'expense', 'date': f'2026-01-0{i + 1}'
+        })
+        assert response.status_code == 201
+
+
+def get(client, path, accept):
+    """(status, mimetype, body) with the body read and a streamed response closed."""
+    headers = {'Accept': accept} if accept is not None else {}
+    response = client.get(path, headers=headers)
+    try:
+        return response.status_code, response.mimetype, response.get_data(as_text=True)
+    finally:
+        response.close()
+
+
+@pytest.mark.parametrize('path', ['/api/transactions', '/api/transactions?stream=1',
+                                  '/api/calendar/transactions?year=2026&month=1',
+                                  '/api/calendar/transactions?year=2026&month=1&stream=1'])
+@pytest.mark.parametrize('accept', [None, '*/*', 'application/json',
+                                    f'application/json, {NDJSON}', f'{NDJSON};q=0.5, */*'])
+def test_json_array_unless_ndjson_is_preferred(client, ledger, path, accept):
+    status, mimetype, body = get(client, path, accept)
+    assert status == 200
+    assert mimetype == 'application/json'
+    assert len(json.loads(body)) == 3
+
+
+@pytest.mark.parametrize('path', ['/api/transactions', '/api/transactions?stream=1',
+                                  '/api/calendar/transactions?year=2026&month=1&stream=1'])
+@pytest.mark.parametrize('accept', [NDJSON, f'{NDJSON}, application/json;q=0.9', f'{NDJSON}, */*;q=0.1'])
+def test_ndjson_when_explicitly_preferred(client, ledger, path, accept):
+    status, mimetype, body = get(client, path, accept)
+    assert status == 200
+    assert mimetype == NDJSON
+    lines = body.splitlines()
+    assert sorted(json.loads(line)['amount'] for line in lines) == [10, 11, 12]
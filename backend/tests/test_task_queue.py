@@ -0,0 +1,49 @@
+import threading
+import uuid
+
+from models import DeadLetterTask
+from services.task_queue import get_queue, task
+
+attempts = []
+
+
+@task('tests.always_fails', max_retries=2, backoff=0.01, max_backoff=0.05)
+def always_fails(label):
+    attempts.append(label)
+    raise ConnectionError('backend down')
+
+
+def test_exhausted_task_is_dead_lettered(app):
+    label = uuid.uuid4().hex
+    always_fails.delay(label)
+    assert get_queue().join(timeout=5)
+
+    assert attempts.count(label) == 3
+    with app.app_context():
+        dead = DeadLetterTask.query.filter_by(task_name='tests.always_fails').all()
+        dead = [row for row in dead if row.args == [label]]
+    assert len(dead) == 1
+    assert dead[0].attempts == 3
+    assert dead[0].error == 'ConnectionError: backend down'
+
+
+def test_register_does_not_wait_for_the_mail_backend(app, monkeypatch):
+    release = threading.Event()
+    sent = []
+
+    def blocking_send(message):
+        release.wait(5)
+        sent.append(message.recipients)
+
+    monkeypatch.setattr(app.extensions['email_service'].mail, 'send', blocking_send)
+    email = f'{uuid.uuid4().hex}@example.com'
+    try:
+        response = app.test_client().post('/api/auth/register', json={
+            'name': 'New', 'email': email, 'password': 'secret-password'
+        })
+        assert response.status_code == 201
+        assert sent == []
+    finally:
+        release.set()
+    assert get_queue().join(timeout=5)
+    assert sent == [[email]]
@@ -0,0 +1,57 @@
+import pytest
+
+from extensions import db
+from models import Transaction
+
+
+@pytest.fixture
+def ledger(app, client, user):
+    """Three transactions created through the API; returns the user id."""
+    user_id, categories = user
+    for amount, category, txn_type in ((12.5, 'Food', 'expense'), (30.0, 'Food', 'expense'),
+                                       (1000.0, 'Salary', 'income')):
+        response = client.post('/api/transactions', json={
+            'amount': amount, 'category_id': categories[category], 'type': txn_type,
+            'date': '2026-01-15', 'description': 'seed'
+        })
+        assert response.status_code == 201
+    return user_id
+
+
+def transaction_count(app, user_id):
+    with app.app_context():
+        return db.session.query(Transaction).filter_by(user_id=user_id).count()
+
+
+@pytest.mark.parametrize('method', ['put', 'delete'])
+@pytest.mark.parametrize('criteria', [{}, {'category_id': None, 'type': ''}])
+def test_empty_filter_is_rejected(app, client, ledger, method, criteria):
+    response = getattr(client, method)('/api/transactions/batch', json={
+        'filter': criteria, 'changes': {'description': 'changed'}
+    })
+    assert response.status_code == 400
+    assert 'at least one' in response.get_json()['msg']
+    assert transaction_count(app, ledger) == 3
+
+
+@pytest.mark.parametrize('method', ['put', 'delete'])
+def test_unknown_filter_keys_are_rejected(app, client, ledger, method):
+    response = getattr(client, method)('/api/transactions/batch', json={
+        'filter': {'type': 'expense', 'amount_over': 20}, 'changes': {'description': 'changed'}
+    })
+    assert response.status_code == 400
+    assert 'amount_over' in response.get_json()['msg']
+    assert transaction_count(app, ledger) == 3
+
+
+def test_invalid_filter_type_is_rejected(app, client, ledger):
+    response = client.delete('/api/transactions/batch', json={'filter': {'type': 'transfer'}})
+    assert response.status_code == 400
+    assert transaction_count(app, ledger) == 3
+
+
+def test_filter_deletes_only_matching_rows(app, client, ledger):
+    response = client.delete('/api/transactions/batch', json={'filter': {'type': 'expense'}})
+    assert response.status_code == 200
+    assert response.get_json() == {'deleted': 2}
+    assert transaction_count(app, ledger) == 1
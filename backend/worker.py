@@ -0,0 +1,8 @@
+"""Celery worker entry point (TASK_QUEUE_BACKEND=celery):
+
+    celery -A worker.celery worker
+"""
+from main import app
+from services.task_queue import get_queue
+
+celery = get_queue().celery